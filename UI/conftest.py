@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Tests import the dashboard modules as ``utils.*`` (this directory is put on sys.path
+# for them) and keep any thumbnails they cause out of the dashboard's static folder
+os.environ.setdefault("WATCHTOWER_MEDIA_DIR", tempfile.mkdtemp(prefix="watchtower-media-"))
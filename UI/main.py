@@ -1,10 +1,12 @@
 import streamlit as st
-from streamlit_folium import st_folium
-import folium
 import time
-import random
-import requests
 from datetime import datetime
+from utils.actions import get_action_queue
+from utils.analytics import get_stats
+from utils.common import get_client
+from utils.dispatch_map import dispatch_map
+from utils.hub import get_hub
+from utils.telemetry import SectionTimer, section
 
 st.set_page_config(
     page_title="WatchTowerX | Dashboard",
@@ -61,6 +63,11 @@ st.markdown("""
 st.markdown("<h1 class='main-title'>🛡️ WatchTowerX AI Surveillance Dashboard</h1>", unsafe_allow_html=True)
 st.caption("Last synced: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
+timer = SectionTimer("dashboard")
+timer.start("metrics")
+
+# Headline metrics come from the rolling incident aggregates, not from the event list
+stats = get_stats()
 metric_col1, metric_col2, metric_col3 = st.columns(3)
 with metric_col1:
     st.markdown("<div class='metric-card'><div class='card-title'>Active Cameras</div>", unsafe_allow_html=True)
@@ -68,15 +75,27 @@ with metric_col1:
     st.markdown("</div>", unsafe_allow_html=True)
 with metric_col2:
     st.markdown("<div class='metric-card'><div class='card-title'>Incidents Detected</div>", unsafe_allow_html=True)
-    st.metric("", f"{random.randint(15, 30)} Today")
+    st.metric("", f"{stats.count_today()} Today")
     st.markdown("</div>", unsafe_allow_html=True)
 with metric_col3:
     st.markdown("<div class='metric-card'><div class='card-title'>Response Time Avg</div>", unsafe_allow_html=True)
-    st.metric("", f"{round(random.uniform(4.5, 9.0), 1)} min")
+    response_mean = stats.response_mean()
+    st.metric("", f"{round(response_mean / 60, 1)} min" if response_mean is not None else "—")
     st.markdown("</div>", unsafe_allow_html=True)
 
+# Time window filter -> seconds back from now (None = everything buffered)
+TIME_WINDOWS = {"All time": None, "Last 15 minutes": 15 * 60, "Last hour": 60 * 60, "Last 24 hours": 24 * 60 * 60}
+# Window starts are rounded down to this step, so the filters (and the cached cards) change once a minute
+TIME_WINDOW_STEP_SECONDS = 60
+
+# How often the alert cards check the hub for a new snapshot (no API call involved)
+STREAM_REFRESH_SECONDS = 1.0
+# How long a page waits for the hub's first fetch after the server starts
+HUB_COLD_START_SECONDS = 3.0
+
 col1, col2 = st.columns([2, 1])
 
+timer.start("feed")
 with col1:
     st.subheader("🔴 Live Video Feed")
     st.markdown("<div class='video-placeholder'>[LIVE STREAM PLACEHOLDER]</div>", unsafe_allow_html=True)
@@ -84,87 +103,60 @@ with col1:
 
 with col2:
     st.subheader("🚨 Critical Alerts (Live API Feed)")
-    # Allow filtering by event type
-    event_type = st.selectbox("Filter by type", ["all", "fire", "theft", "accident"], index=0)
-    # --- DUMMY DATA FOR TESTING ---
-    all_events = [
-        {
-            "eventId": "evt_10023",
-            "eventType": "fire",
-            "timestamp": "2025-06-25T22:30:00Z",
-            "location": "Warehouse Sector 3",
-            "severity": "high",
-            "snapshotUrl": "https://via.placeholder.com/400x250/ffdddd/990000?text=Fire+Detected+Frame",
-            "status": "dispatched",
-            "notes": "Detected by Camera 3"
-        },
-        {
-            "eventId": "evt_10024",
-            "eventType": "theft",
-            "timestamp": "2025-06-25T21:10:00Z",
-            "location": "Main Entrance Gate 3",
-            "severity": "medium",
-            "snapshotUrl": "https://via.placeholder.com/400x250/ded3f9/5e3b8c?text=Motion+Trigger",
-            "status": "pending",
-            "notes": "Suspect seen carrying unknown object"
-        },
-        {
-            "eventId": "evt_10025",
-            "eventType": "accident",
-            "timestamp": "2025-06-25T20:05:00Z",
-            "location": "Zone B, Vehicle Docking Area",
-            "severity": "moderate",
-            "snapshotUrl": None,
-            "status": "resolved",
-            "notes": "Security staff tripped over loose cargo strap"
-        }
-    ]
-    # --- END DUMMY DATA ---
-
-    # Filter events by type if not 'all'
-    if event_type == "all":
-        events = all_events
+    # One process-wide hub polls the API and drains pushed alerts for every
+    # session; this session only reads its immutable, versioned snapshots
+    hub = get_hub()
+    snapshot = hub.snapshot(wait=HUB_COLD_START_SECONDS)
+    if not snapshot.info["api_ok"]:
+        st.caption("Events API unreachable, showing demo alerts.")
+    if "feed_arrived" in st.session_state:
+        new_events = snapshot.newer_than(st.session_state.feed_arrived)
+        if new_events:
+            st.caption(f"{len(new_events)} new alert(s) since last refresh")
+    st.session_state.feed_arrived = snapshot.arrived
+
+    # Filters resolve against the snapshot's event index, not by rescanning the buffer
+    f1, f2 = st.columns(2)
+    event_type = f1.selectbox("Filter by type", ["all"] + snapshot.values("eventType"), index=0)
+    severity = f2.selectbox("Severity", ["all"] + snapshot.values("severity"), index=0)
+    status = f1.selectbox("Status", ["all"] + snapshot.values("status"), index=0)
+    location = f2.selectbox("Location", ["all"] + snapshot.values("location"), index=0)
+    window = st.selectbox("Time window", list(TIME_WINDOWS), index=0)
+
+    # Only this fragment reruns to pick up new snapshots, and it rebuilds the
+    # cards only when the hub's version (or the time window) has moved on
+    def render_alert_cards():
+        with section("dashboard", "alert_cards"):
+            latest = hub.snapshot()
+            since = None
+            if TIME_WINDOWS[window]:
+                since = int(time.time() - TIME_WINDOWS[window]) // TIME_WINDOW_STEP_SECONDS * TIME_WINDOW_STEP_SECONDS
+            filters = {"eventType": event_type, "severity": severity, "status": status,
+                       "location": location, "since": since}
+            key = (latest.version, tuple(filters.items()))
+            view = st.session_state.get("feed_view")
+            if view is None or view[0] != key:
+                view = st.session_state.feed_view = (key, latest.cards_html(**filters))
+            st.caption("🟢 Live push connected" if latest.info["connected"] else "⚪ Live push offline, polling")
+            st.markdown(view[1], unsafe_allow_html=True)
+
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=STREAM_REFRESH_SECONDS)(render_alert_cards)()
     else:
-        events = [e for e in all_events if e["eventType"] == event_type]
-
-    for evt in events:
-        color_class = {
-            "fire": "fire",
-            "theft": "theft",
-            "accident": "accident"
-        }.get(evt.get("eventType", "fire"), "fire")
-
-        page_map = {
-            "fire": "Fire_Alert",
-            "theft": "Theft_Alert",
-            "accident": "Accident_Alert"
-        }
-
-        url = evt.get("snapshotUrl") or "https://via.placeholder.com/400x250?text=No+Snapshot+Available"
-        label = f"{evt.get('eventType', '').upper()} | {evt.get('location', 'Unknown')} | {evt.get('timestamp', '')[:19].replace('T', ' ')}"
-        severity = evt.get('severity', '').capitalize()
-        status = evt.get('status', '').capitalize()
-        notes = evt.get('notes', '')
-        page = page_map.get(evt.get("eventType", "fire"), "Fire_Alert")
-        event_id = evt.get("eventId", "")
-        alert_url = f"/pages/{page}?eventId={event_id}"
-
-        st.markdown(f"""
-        <a href='{alert_url}' style='text-decoration:none;'>
-            <div class='alert-card {color_class}'>
-                <div><b>{label}</b></div>
-                <div>Severity: {severity} | Status: {status}</div>
-                <div style='font-size:0.9em; color:#f5f6fa;'>{notes}</div>
-                <img src='{url}' style='width:100%; max-width:320px; border-radius:8px; margin-top:0.5em;'/>
-            </div>
-        </a>
-        """, unsafe_allow_html=True)
+        render_alert_cards()
 
+timer.start("map")
 st.subheader("🗺️ Smart Dispatch Map")
-incident_location = (-1.2921, 36.8219)
-map_ = folium.Map(location=incident_location, zoom_start=14)
-folium.Marker(incident_location, tooltip="Active Incident", icon=folium.Icon(color="red")).add_to(map_)
-st_folium(map_, width=1400, height=400)
+dispatch_map(snapshot.events())
+timer.stop()
+
+cache_stats = get_client().stats()
+st.sidebar.caption(f"Event cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['size']} cached)")
+st.sidebar.caption(f"Feed hub: version {hub.version}, {hub.fetches} backend fetches for all sessions")
+action_stats = get_action_queue().stats()
+if action_stats["persist_p95"] is not None:
+    st.sidebar.caption(f"Operator actions: {action_stats['pending']} pending, {action_stats['conflicts']} conflicts, "
+                       f"saved in p50 {action_stats['persist_p50'] * 1000:.0f} ms / p95 {action_stats['persist_p95'] * 1000:.0f} ms")
 
 st.markdown("---")
 st.caption("© 2025 WatchTowerX AI Response System")
\ No newline at end of file
@@ -0,0 +1,202 @@
+import heapq
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+import requests
+
+from utils.common import get_client, lazy_import
+from utils.telemetry import instrument
+
+# How long clicks collect before they are written in one request
+FLUSH_INTERVAL = 0.5
+MAX_FLUSH_BATCH = 200
+MAX_ATTEMPTS = 5
+# Outcomes kept for sessions to pick up on their next rerun
+RESULT_HISTORY = 4096
+
+# Same forward-only rules as api/store.py, for the optimistic view
+ACTION_STATUS = {"acknowledge": "acknowledged", "escalate": "escalated", "resolve": "resolved"}
+STATUS_RANK = {"acknowledged": 1, "escalated": 2, "resolved": 3}
+
+PERSIST_SECONDS = instrument.histogram("watchtower_action_persist_seconds",
+                                       "Operator click to confirmed write", ("action", "result"))
+
+
+def apply_local(evt, action):
+    """Copy of ``evt`` as it will look once ``action`` is saved."""
+    evt = dict(evt)
+    if action["action"] == "note":
+        evt["notes"] = action.get("note") or ""
+        entry = "Note updated"
+    else:
+        target = ACTION_STATUS[action["action"]]
+        if STATUS_RANK.get(evt.get("status"), 0) >= STATUS_RANK[target]:
+            return evt
+        evt["status"] = target
+        evt[f"{target}At"] = action["at"]
+        entry = target.capitalize()
+    timeline = evt.get("timeline") or [{"time": evt.get("timestamp", ""), "event": "Alert created"}]
+    evt["timeline"] = [*timeline, {"time": action["at"], "event": f"{entry} (saving…)", "pending": True}]
+    return evt
+
+
+class ActionQueue:
+    """Write-behind queue for operator actions.
+
+    ``submit`` returns at once; a background thread writes everything
+    submitted during the last ``FLUSH_INTERVAL`` in one
+    ``POST /api/events/actions``. The saved documents go straight into the
+    EventClient cache and are kept for the FeedHub to pick up with
+    ``saved_since``, so cards and filters show the new status. A failed write
+    is scheduled for another try after a backoff while later clicks keep
+    flushing. Pages keep their own unconfirmed actions and overlay them with
+    ``apply_local`` until ``result`` reports an outcome.
+    """
+
+    def __init__(self, client=None, flush_interval=FLUSH_INTERVAL):
+        self.client = client or get_client()
+        self.flush_interval = flush_interval
+        self._pending = deque()
+        self._retries = []  # heap of (retry_at, actionId, action) waiting out a backoff
+        self._results = OrderedDict()  # actionId -> result dict
+        self._saved = deque(maxlen=RESULT_HISTORY)  # (seq, saved event)
+        self._saved_seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.latencies = deque(maxlen=1024)  # submit -> persisted, seconds
+        self.flushes = 0
+        self.applied = 0
+        self.conflicts = 0
+        self.failures = 0
+        threading.Thread(target=self._run, name="action-queue", daemon=True).start()
+
+    def submit(self, event_id, action, operator=None, note=None):
+        """Queue one action and return it (its ``actionId`` identifies the outcome)."""
+        entry = {
+            "actionId": uuid.uuid4().hex,
+            "eventId": event_id,
+            "action": action,
+            "note": note,
+            "operator": operator,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "_submitted": time.monotonic(),
+            "_attempts": 0,
+        }
+        with self._lock:
+            self._pending.append(entry)
+        return entry
+
+    def result(self, action_id):
+        """Outcome for ``action_id`` once written ("applied", "conflict", "not_found" or "failed")."""
+        with self._lock:
+            return self._results.get(action_id)
+
+    def saved_since(self, seq):
+        """Return ``(latest_seq, events)`` saved by writes after ``seq``, oldest first."""
+        with self._lock:
+            return self._saved_seq, [evt for s, evt in self._saved if s > seq]
+
+    def flush(self):
+        """Write pending actions now instead of at the next interval."""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = []
+                while self._retries and self._retries[0][0] <= now:
+                    due.append(heapq.heappop(self._retries)[2])
+                # Retried actions were submitted first, so they go out first
+                self._pending.extendleft(reversed(sorted(due, key=lambda a: a["_submitted"])))
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), MAX_FLUSH_BATCH))]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            results = self.client.post_actions([{k: v for k, v in a.items() if not k.startswith("_")} for a in batch])
+        except (requests.RequestException, ValueError, KeyError):
+            self.failures += 1
+            now = time.monotonic()
+            for action in batch:
+                action["_attempts"] += 1
+                if action["_attempts"] < MAX_ATTEMPTS:
+                    retry_at = now + min(5.0, self.flush_interval * 2 ** action["_attempts"])
+                    with self._lock:
+                        heapq.heappush(self._retries, (retry_at, action["actionId"], action))
+                else:
+                    self._finish(action, {"result": "failed"})
+            return
+        self.flushes += 1
+        for action, result in zip(batch, results):
+            evt = result.get("event")
+            if evt:
+                with self._lock:
+                    self._saved_seq += 1
+                    self._saved.append((self._saved_seq, evt))
+            if result["result"] == "applied" and action["action"] in ACTION_STATUS \
+                    and STATUS_RANK.get(result.get("previousStatus"), 0) == 0:
+                self._record_response(evt)
+            self._finish(action, result)
+
+    def _record_response(self, evt):
+        analytics = lazy_import("utils.analytics")
+        seconds = analytics.response_seconds(evt)
+        if seconds is not None:
+            analytics.get_stats().record_response(seconds)
+
+    def _finish(self, action, result):
+        latency = time.monotonic() - action["_submitted"]
+        self.latencies.append(latency)
+        PERSIST_SECONDS.observe(latency, action=action["action"], result=result["result"])
+        with self._lock:
+            if result["result"] == "applied":
+                self.applied += 1
+            elif result["result"] == "conflict":
+                self.conflicts += 1
+            self._results[action["actionId"]] = result
+            while len(self._results) > RESULT_HISTORY:
+                self._results.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            ordered = sorted(self.latencies)
+            pending = len(self._pending) + len(self._retries)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None  # noqa: E731
+        return {
+            "pending": pending,
+            "flushes": self.flushes,
+            "applied": self.applied,
+            "conflicts": self.conflicts,
+            "failures": self.failures,
+            "persist_p50": pick(0.5),
+            "persist_p95": pick(0.95),
+        }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_action_queue():
+    """Process-wide ActionQueue shared by every Streamlit session."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ActionQueue()
+    return _queue
+
+
+def settle(queue, pending):
+    """Drop actions with a known outcome from ``pending``; returns them as ``(action, result)`` pairs."""
+    done = [(a, r) for a in pending if (r := queue.result(a["actionId"])) is not None]
+    finished = {a["actionId"] for a, _ in done}
+    pending[:] = [a for a in pending if a["actionId"] not in finished]
+    return done
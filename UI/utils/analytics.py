@@ -0,0 +1,168 @@
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+
+from utils.event_index import parse_timestamp
+
+# One week of hourly buckets per event type
+HISTORY_HOURS = 7 * 24
+
+# Response-time histogram: log-spaced bucket edges from 1 s to ~2 days, 4 per doubling
+RESPONSE_BUCKETS_PER_DOUBLING = 4
+RESPONSE_BUCKETS = 72
+
+# eventIds remembered so an event that comes back (e.g. evicted, then updated) is not counted twice
+COUNTED_IDS = 65536
+
+
+def _response_bucket(seconds):
+    if seconds <= 1.0:
+        return 0
+    b = int(math.log2(seconds) * RESPONSE_BUCKETS_PER_DOUBLING) + 1
+    return min(b, RESPONSE_BUCKETS - 1)
+
+
+def _bucket_upper_edge(b):
+    return 2 ** (b / RESPONSE_BUCKETS_PER_DOUBLING)
+
+
+def response_seconds(evt):
+    """Seconds from alert creation to first operator response, if the event records one."""
+    responded = evt.get("respondedAt") or evt.get("acknowledgedAt") or evt.get("resolvedAt")
+    if not responded:
+        return None
+    delta = parse_timestamp(responded) - parse_timestamp(evt.get("timestamp"))
+    return delta if delta >= 0 else None
+
+
+class IncidentStats:
+    """Rolling incident aggregates, updated once per event as it arrives.
+
+    Counts live in fixed ``array`` ring buffers, one slot per hour for the last
+    week and one ring per event type, so memory does not grow with history.
+    Response times go into a log-spaced histogram, so percentiles are read from
+    a fixed number of buckets instead of a list of samples. Charts and
+    dashboard metrics read these summaries and never rescan events.
+
+    Events are counted once per eventId, in whatever order they arrive, so a
+    late alert still lands in its own hour; the last ``COUNTED_IDS`` eventIds
+    are remembered to skip repeats.
+    """
+
+    def __init__(self, hours=HISTORY_HOURS):
+        self.hours = hours
+        self._slot_hour = array("q", [-1] * hours)  # epoch hour held by each slot
+        self._hourly = {}  # eventType -> array("I") ring of per-hour counts
+        self._totals = {}  # eventType -> count since start
+        self._response_hist = array("I", [0] * RESPONSE_BUCKETS)
+        self._response_sum = 0.0
+        self._response_count = 0
+        self._counted = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def add(self, evt):
+        """Count one event; returns False if it was already counted."""
+        event_id = evt.get("eventId")
+        with self._lock:
+            if event_id in self._counted:
+                return False
+            if event_id is not None:
+                self._counted[event_id] = True
+                if len(self._counted) > COUNTED_IDS:
+                    self._counted.popitem(last=False)
+            event_type = evt.get("eventType") or "unknown"
+            hour = int(parse_timestamp(evt.get("timestamp")) // 3600)
+            ring = self._hourly.get(event_type)
+            if ring is None:
+                ring = self._hourly[event_type] = array("I", [0] * self.hours)
+            slot = self._claim_slot(hour)
+            if slot is not None:
+                ring[slot] += 1
+            self._totals[event_type] = self._totals.get(event_type, 0) + 1
+            seconds = response_seconds(evt)
+            if seconds is not None:
+                self._record_response(seconds)
+            self.version += 1
+            return True
+
+    def record_response(self, seconds):
+        """Record an operator response time reported after the event was counted."""
+        with self._lock:
+            self._record_response(seconds)
+            self.version += 1
+
+    def _record_response(self, seconds):
+        self._response_hist[_response_bucket(seconds)] += 1
+        self._response_sum += seconds
+        self._response_count += 1
+
+    def _claim_slot(self, hour):
+        slot = hour % self.hours
+        held = self._slot_hour[slot]
+        if held == hour:
+            return slot
+        if held > hour:
+            return None  # older than the retained week
+        self._slot_hour[slot] = hour
+        for ring in self._hourly.values():
+            ring[slot] = 0
+        return slot
+
+    # --- Read side ---
+
+    def counts_by_type(self):
+        with self._lock:
+            return dict(self._totals)
+
+    def hourly_counts(self, hours=24, now=None):
+        """[(hour_start_epoch, count)] for the last ``hours`` hours, oldest first."""
+        current = int((time.time() if now is None else now) // 3600)
+        with self._lock:
+            series = []
+            for hour in range(current - hours + 1, current + 1):
+                slot = hour % self.hours
+                count = sum(r[slot] for r in self._hourly.values()) if self._slot_hour[slot] == hour else 0
+                series.append((hour * 3600, count))
+            return series
+
+    def count_since(self, since):
+        """Incidents in hourly buckets starting at or after ``since`` (epoch seconds)."""
+        start = int(since // 3600) * 3600
+        return sum(c for h, c in self.hourly_counts(self.hours) if h >= start)
+
+    def count_today(self):
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        return self.count_since(midnight)
+
+    def response_mean(self):
+        with self._lock:
+            return self._response_sum / self._response_count if self._response_count else None
+
+    def response_percentile(self, q):
+        """Approximate q-th percentile response time in seconds (bucket upper edge)."""
+        with self._lock:
+            if not self._response_count:
+                return None
+            target = q / 100.0 * self._response_count
+            running = 0
+            for b, count in enumerate(self._response_hist):
+                running += count
+                if running >= target:
+                    return _bucket_upper_edge(b)
+            return _bucket_upper_edge(RESPONSE_BUCKETS - 1)
+
+
+_stats = IncidentStats()
+
+
+def get_stats():
+    """Process-wide IncidentStats shared by the dashboard and alert pages."""
+    return _stats
+
+
+def hour_label(epoch):
+    return datetime.fromtimestamp(epoch).strftime("%H:00")
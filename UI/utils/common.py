@@ -0,0 +1,633 @@
+import importlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+from utils.telemetry import HTTP_SECONDS, SectionTimer
+
+# 🔧 Events API used by the dashboard and every alert page
+API_BASE_URL = os.environ.get("WATCHTOWER_API_URL", "http://localhost:8000")
+
+# Connect / read timeouts in seconds, so one slow backend can't stall a page
+CONNECT_TIMEOUT = 1.5
+READ_TIMEOUT = 3.0
+
+# How long a fetched event stays fresh, and how many we keep per process
+EVENT_TTL_SECONDS = 30.0
+EVENT_LIST_TTL_SECONDS = 5.0
+# Archive aggregates only change when the compaction job runs
+ANALYTICS_TTL_SECONDS = 300.0
+EVENT_CACHE_SIZE = 512
+
+PLACEHOLDER_SNAPSHOT = "https://via.placeholder.com/400x250?text=No+Snapshot+Available"
+
+# Map centre, and marker position for events that carry no coordinates
+DEFAULT_MAP_CENTER = (-1.2921, 36.8219)
+
+# --- Placeholder events, shown when the API is unreachable ---
+DEMO_EVENTS = {
+    "fire": {
+        "eventId": "evt_10023",
+        "eventType": "fire",
+        "timestamp": "2025-06-25T22:30:00Z",
+        "location": "Warehouse Sector 3",
+        "coordinates": [-1.2921, 36.8219],
+        "severity": "high",
+        "snapshotUrl": "https://via.placeholder.com/400x250/ffdddd/990000?text=Fire+Detected+Frame",
+        "status": "dispatched",
+        "notes": "Detected by Camera 3",
+        "timeline": [
+            {"time": "2025-06-25T22:30:00Z", "event": "Alert created"},
+            {"time": "2025-06-25T22:31:00Z", "event": "Smoke detected by Camera 3"},
+            {"time": "2025-06-25T22:32:00Z", "event": "System classified event as FIRE"},
+            {"time": "2025-06-25T22:33:00Z", "event": "Alert dispatched to Emergency Team"},
+            {"time": "2025-06-25T22:34:00Z", "event": "Surveillance confirmed flames"},
+            {"time": "2025-06-25T22:35:00Z", "event": "Response team ETA: 3 minutes"}
+        ],
+        "media": [
+            "https://via.placeholder.com/400x250/ffdddd/990000?text=Fire+Detected+Frame",
+            "https://via.placeholder.com/400x250/ffaaaa/660000?text=Flames+Confirmed"
+        ]
+    },
+    "theft": {
+        "eventId": "evt_10024",
+        "eventType": "theft",
+        "timestamp": "2025-06-25T21:10:00Z",
+        "location": "Main Entrance Gate 3",
+        "coordinates": [-1.2864, 36.8172],
+        "severity": "medium",
+        "snapshotUrl": "https://via.placeholder.com/400x250/ded3f9/5e3b8c?text=Motion+Trigger",
+        "status": "pending",
+        "notes": "Suspect seen carrying unknown object",
+        "timeline": [
+            {"time": "2025-06-25T21:10:00Z", "event": "Alert created"},
+            {"time": "2025-06-25T21:11:00Z", "event": "Motion detected in restricted zone"},
+            {"time": "2025-06-25T21:12:00Z", "event": "AI confirmed unauthorized entry"},
+            {"time": "2025-06-25T21:13:00Z", "event": "Suspect seen carrying unknown object"},
+            {"time": "2025-06-25T21:14:00Z", "event": "System dispatched alert"},
+            {"time": "2025-06-25T21:15:00Z", "event": "Nearest patrol notified"}
+        ],
+        "media": [
+            "https://via.placeholder.com/400x250/ded3f9/5e3b8c?text=Motion+Trigger",
+            "https://via.placeholder.com/400x250/c3b1e1/452773?text=Suspect+Identified"
+        ]
+    },
+    "accident": {
+        "eventId": "evt_10025",
+        "eventType": "accident",
+        "timestamp": "2025-06-25T20:05:00Z",
+        "location": "Zone B, Vehicle Docking Area",
+        "coordinates": [-1.2990, 36.8290],
+        "severity": "moderate",
+        "snapshotUrl": "https://via.placeholder.com/400x250/fff1db/f39c12?text=Initial+Incident",
+        "status": "resolved",
+        "notes": "Security staff tripped over loose cargo strap",
+        "timeline": [
+            {"time": "2025-06-25T20:05:00Z", "event": "Alert created"},
+            {"time": "2025-06-25T20:06:00Z", "event": "Person fell near loading dock"},
+            {"time": "2025-06-25T20:07:00Z", "event": "Nearby camera triggered assistance routine"},
+            {"time": "2025-06-25T20:08:00Z", "event": "First responder dispatched"},
+            {"time": "2025-06-25T20:09:00Z", "event": "Medical unit informed"}
+        ],
+        "media": [
+            "https://via.placeholder.com/400x250/fff1db/f39c12?text=Initial+Incident",
+            "https://via.placeholder.com/400x250/ffe3b0/e67e22?text=Responder+Arrival"
+        ]
+    }
+}
+
+
+def unknown_event(media=None):
+    """Placeholder used when an alert page could not load its event at all."""
+    now = datetime.now().isoformat()
+    return {
+        "location": "Unknown",
+        "timestamp": now,
+        "severity": "unknown",
+        "status": "unknown",
+        "notes": "No data available for this alert.",
+        "snapshotUrl": None,
+        "timeline": [{"time": now, "event": "Alert created"}],
+        "media": media or [],
+    }
+
+
+def event_location(evt):
+    """(lat, lng) of an event from ``coordinates`` or ``lat``/``lng``, else the map centre."""
+    coords = evt.get("coordinates")
+    if isinstance(coords, dict):
+        coords = (coords.get("lat"), coords.get("lng"))
+    elif coords is None:
+        coords = (evt.get("lat"), evt.get("lng"))
+    try:
+        return (float(coords[0]), float(coords[1]))
+    except (TypeError, ValueError, IndexError):
+        return DEFAULT_MAP_CENTER
+
+
+class EventNotFound(Exception):
+    """The events API answered, but not with the requested event."""
+
+    def __init__(self, event_id, status_code):
+        super().__init__(f"event {event_id!r} not found (status {status_code})")
+        self.event_id = event_id
+        self.status_code = status_code
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Streamlit runs every session in its own thread of the same process, so a
+    single instance is shared by all operators connected to this server.
+    """
+
+    def __init__(self, maxsize=EVENT_CACHE_SIZE, ttl=EVENT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class EventClient:
+    """Keep-alive HTTP client for the events API with a per-event TTL cache."""
+
+    def __init__(self, base_url=API_BASE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 cache=None, pool_size=16):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = cache or TTLCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+    def _request(self, method, route, path, **kwargs):
+        """One timed call to the API; ``route`` is the templated path used as the metric label."""
+        started, status = time.perf_counter(), "error"
+        try:
+            resp = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+            status = str(resp.status_code)
+            return resp
+        finally:
+            HTTP_SECONDS.observe(time.perf_counter() - started, method=method, route=route, status=status)
+
+    def get_event(self, event_id, refresh=False):
+        """Return the event document for ``event_id``.
+
+        Cached events are served without touching the network. Raises
+        ``EventNotFound`` for non-200 answers and ``requests.RequestException``
+        when the API is unreachable or too slow.
+        """
+        key = ("event", event_id)
+        if not refresh:
+            evt = self.cache.get(key, _MISSING)
+            if evt is not _MISSING:
+                return evt
+        resp = self._request("GET", "/api/events/{eventId}", f"/api/events/{event_id}")
+        if resp.status_code != 200:
+            raise EventNotFound(event_id, resp.status_code)
+        evt = resp.json()
+        self.cache.set(key, evt)
+        return evt
+
+    def get_events(self, event_ids, refresh=False):
+        """Return ``{eventId: event}`` for many ids in at most one request.
+
+        Cached events are served locally; the rest are fetched together with
+        ``POST /api/events/lookup`` (full documents, so timelines and media
+        lists come along). Unknown ids are simply absent from the result.
+        """
+        found, missing = {}, []
+        for event_id in dict.fromkeys(event_ids):
+            evt = _MISSING if refresh else self.cache.get(("event", event_id), _MISSING)
+            if evt is _MISSING:
+                missing.append(event_id)
+            else:
+                found[event_id] = evt
+        if missing:
+            resp = self._request("POST", "/api/events/lookup", "/api/events/lookup", json={"ids": missing})
+            resp.raise_for_status()
+            for evt in resp.json():
+                self.cache.set(("event", evt["eventId"]), evt)
+                found[evt["eventId"]] = evt
+        return found
+
+    def list_events(self, refresh=False, **params):
+        """Return ``GET /api/events`` and warm the per-event cache with it."""
+        key = ("list", tuple(sorted(params.items())))
+        if not refresh:
+            events = self.cache.get(key, _MISSING)
+            if events is not _MISSING:
+                return events
+        resp = self._request("GET", "/api/events", "/api/events", params=params or None)
+        resp.raise_for_status()
+        events = resp.json()
+        self.cache.set(key, events, ttl=EVENT_LIST_TTL_SECONDS)
+        for evt in events:
+            if evt.get("eventId"):
+                self.cache.set(("event", evt["eventId"]), evt)
+        return events
+
+    def events_since(self, cursor=None, limit=200):
+        """Return events stored or updated after a ``seq`` cursor, in store order.
+
+        The store numbers every write, so this also returns alerts with an
+        older timestamp that arrived late, and events an operator changed.
+        Without a cursor this is the newest ``limit`` writes (fetched newest
+        first, then reversed), so a fresh feed starts from what is happening
+        now rather than from the oldest stored alerts. Used by the incremental
+        live feed; always goes to the API but still warms the per-event cache
+        for the detail pages.
+        """
+        params = {"limit": limit, "orderBy": "seq", "sort": "asc" if cursor is not None else "desc"}
+        if cursor is not None:
+            params["afterSeq"] = cursor
+        resp = self._request("GET", "/api/events", "/api/events", params=params)
+        resp.raise_for_status()
+        events = resp.json()
+        if cursor is None:
+            events.reverse()
+        for evt in events:
+            if evt.get("eventId"):
+                self.cache.set(("event", evt["eventId"]), evt)
+        return events
+
+    def post_actions(self, actions):
+        """Apply operator actions with ``POST /api/events/actions``; one result per action.
+
+        Saved documents go into the per-event cache. Raises
+        ``requests.RequestException`` when the write fails or the API is
+        unreachable.
+        """
+        resp = self._request("POST", "/api/events/actions", "/api/events/actions", json={"actions": actions})
+        resp.raise_for_status()
+        results = resp.json()["results"]
+        for result in results:
+            evt = result.get("event")
+            if evt:
+                self.cache.set(("event", evt["eventId"]), evt)
+        return results
+
+    def analytics(self, **params):
+        """Rows of ``GET /api/analytics`` (aggregates over archived events), cached briefly."""
+        key = ("analytics", tuple(sorted(params.items())))
+        rows = self.cache.get(key, _MISSING)
+        if rows is _MISSING:
+            resp = self._request("GET", "/api/analytics", "/api/analytics", params=params)
+            resp.raise_for_status()
+            rows = resp.json()["rows"]
+            self.cache.set(key, rows, ttl=ANALYTICS_TTL_SECONDS)
+        return rows
+
+    def stats(self):
+        return self.cache.stats()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide EventClient shared by every Streamlit session."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = EventClient()
+    return _client
+
+
+def load_event(event_id, event_type):
+    """Fetch an alert page's event, falling back to placeholder data.
+
+    Returns ``(evt, warning)``; ``warning`` is a message for the page to show
+    when placeholder data is used, otherwise ``None``.
+    """
+    fallback = DEMO_EVENTS[event_type]
+    try:
+        return get_client().get_event(event_id), None
+    except EventNotFound as e:
+        return fallback, f"No alert found for this eventId. (Status {e.status_code}) Showing placeholder data."
+    except (requests.RequestException, ValueError) as e:
+        return unknown_event(fallback["media"][:1]), f"Failed to load alert details: {e}. Showing placeholder data."
+
+
+# --- Alert detail pages ---
+# Per-type settings for the shared detail page; each page just picks its entry
+ALERT_PAGE_CONFIGS = {
+    "fire": {
+        "event_type": "fire",
+        "icon": "🔥",
+        "label": "Fire Alert",
+        "marker_color": "red",
+        "suggestion": "Dispatch fire response team and notify local authorities. Monitor live feed for escalation.",
+        # The fire page doubles as a demo and shows placeholder data without an eventId
+        "require_event_id": False,
+    },
+    "theft": {
+        "event_type": "theft",
+        "icon": "🕵️",
+        "label": "Theft Alert",
+        "marker_color": "purple",
+        "suggestion": "Notify law enforcement and review camera logs. Monitor for further unauthorized activity.",
+        "require_event_id": True,
+    },
+    "accident": {
+        "event_type": "accident",
+        "icon": "🚑",
+        "label": "Accident Alert",
+        "marker_color": "orange",
+        "suggestion": "Dispatch medical unit and secure the area. Monitor for further incidents.",
+        "require_event_id": True,
+    },
+}
+
+LIVE_FEED_URL = "https://www.w3schools.com/html/mov_bbb.mp4"
+
+# Rendered artifacts kept per eventId, per process
+ARTIFACT_CACHE_SIZE = 256
+
+
+def lazy_import(name):
+    """Import a heavy module the first time a section that needs it is shown."""
+    return importlib.import_module(name)
+
+
+def embed_html(html, width, height):
+    """Show pre-rendered HTML (e.g. a folium map) in an iframe."""
+    if hasattr(st, "iframe"):
+        st.iframe(html, width=width, height=height)
+    else:
+        lazy_import("streamlit.components.v1").html(html, width=width, height=height)
+
+
+@st.cache_data(max_entries=ARTIFACT_CACHE_SIZE, show_spinner=False)
+def incident_map_html(event_id, location, color):
+    folium = lazy_import("folium")
+    map_ = folium.Map(location=location, zoom_start=14)
+    folium.Marker(location, tooltip="Active Incident", icon=folium.Icon(color=color)).add_to(map_)
+    return map_.get_root().render()
+
+
+@st.cache_resource(max_entries=ARTIFACT_CACHE_SIZE, show_spinner=False)
+def analytics_figures(version):
+    """Charts from the rolling aggregates; rebuilt only when ``version`` changes."""
+    px = lazy_import("plotly.express")
+    analytics = lazy_import("utils.analytics")
+    stats = analytics.get_stats()
+    by_type = stats.counts_by_type()
+    hourly = stats.hourly_counts(24)
+    return (
+        px.bar(x=[t.capitalize() for t in by_type], y=list(by_type.values()), labels={'x':'Type','y':'Count'}, title="Incidents by Type"),
+        px.line(x=[analytics.hour_label(h) for h, _ in hourly], y=[c for _, c in hourly], labels={'x':'Hour','y':'Incidents'}, title="Incidents Over Time"),
+    )
+
+
+def render_alert_page(config):
+    """Render a full alert-detail page for one event type."""
+    event_type = config["event_type"]
+    st.set_page_config(page_title=f"{config['icon']} {config['label']} Details", layout="wide",
+                       page_icon=config["icon"])
+
+    timer = SectionTimer(f"{event_type}_alert")
+    timer.start("load")
+
+    # Simulate user role (for demo)
+    user_role = st.sidebar.selectbox("User Role", ["Operator", "Admin", "Viewer"], index=0)
+    st.sidebar.info(f"Current Role: {user_role}")
+
+    # Parse eventId from query params
+    event_id = st.query_params.get("eventId")
+
+    # Operator actions are saved behind the page: this session's unsaved ones
+    # are overlaid on the event until the action queue reports their outcome
+    actions = lazy_import("utils.actions")
+    queue = actions.get_action_queue()
+    pending = st.session_state.setdefault("pending_actions", [])
+    settled = actions.settle(queue, pending)
+
+    if event_id:
+        evt, warning = load_event(event_id, event_type)
+        if warning:
+            st.warning(warning)
+    elif not config["require_event_id"]:
+        evt = DEMO_EVENTS[event_type]
+    else:
+        st.error("No eventId provided.")
+        st.stop()
+    cache_key = evt.get("eventId") or f"unknown:{event_type}"
+    # Placeholder events are not in the store, so their actions stay local
+    persisted = bool(event_id) and not warning
+    for action in pending:
+        if action["eventId"] == event_id:
+            evt = actions.apply_local(evt, action)
+
+    st.title(f"{config['icon']} {config['label']} - {evt.get('location', 'Unknown')}")
+    st.caption("Alert Triggered: " + evt.get("timestamp", "")[:19].replace("T", " "))
+
+    # --- 1. Timeline ---
+    timer.start("timeline")
+    st.subheader("🕒 Incident Timeline")
+    entries = evt.get("timeline") or (
+        [{"time": evt.get("timestamp", ""), "event": "Alert created"}] + DEMO_EVENTS[event_type]["timeline"][1:]
+    )
+    # Saved entries go into the shared append-only store; unsaved ones are only shown
+    unsaved = [t for t in entries if t.get("pending")]
+    timeline = lazy_import("utils.timeline").get_timelines().get(cache_key)
+    timeline.sync([t for t in entries if not t.get("pending")])
+    seen_counts = st.session_state.setdefault("timeline_seen", {})
+    seen = seen_counts.get(cache_key)
+    if seen is not None and len(timeline) > seen:
+        st.caption(f"{len(timeline) - seen} new entries since you last looked")
+    pages = timeline.page_count()
+    page_counts = st.session_state.setdefault("timeline_pages", {})
+    page = pages - 1
+    if pages > 1:
+        page_key = f"timeline_page:{cache_key}"
+        # Follow the newest page as the timeline grows, unless the operator paged back
+        current = st.session_state.get(page_key)
+        if current is None or current == page_counts.get(cache_key) or current > pages:
+            st.session_state[page_key] = pages
+        page = st.number_input(f"Page (1-{pages}, newest last)", min_value=1, max_value=pages, key=page_key) - 1
+    page_counts[cache_key] = pages
+    lines = timeline.page_markdown(page, seen=seen)
+    if page == pages - 1 and unsaved:
+        lines += "".join(f"\n- **{t['time'][11:19]}** - {t['event']}" for t in unsaved)
+    st.markdown(lines)
+    seen_counts[cache_key] = len(timeline)
+
+    # --- 2. Acknowledge/Resolve/Escalate ---
+    timer.start("actions")
+    st.subheader("🛠️ Operator Actions")
+    notes_key = f"notes:{cache_key}"
+
+    def submit(kind):
+        if persisted:
+            note = st.session_state.get(notes_key) if kind == "note" else None
+            pending.append(queue.submit(event_id, kind, operator=user_role, note=note))
+
+    for action, result in settled:
+        if action["eventId"] != event_id:
+            continue
+        if result["result"] == "conflict":
+            saved = result["event"]
+            if action["action"] == "note":
+                st.warning("Another operator saved a newer note; it is shown below.")
+            else:
+                st.warning(f"Another operator already marked this alert {saved.get('status')}; "
+                           f"your {action['action']} was not applied.")
+        elif result["result"] == "not_found":
+            st.warning("This alert no longer exists; your action was not saved.")
+        elif result["result"] == "failed":
+            st.error(f"Could not save your {action['action']}; the events API is unreachable. Please retry.")
+
+    if user_role in ["Operator", "Admin"]:
+        colA, colB, colC = st.columns(3)
+        with colA:
+            if st.button("Acknowledge Alert", on_click=submit, args=("acknowledge",)):
+                st.success("Alert acknowledged!")
+        with colB:
+            if st.button("Mark as Resolved", on_click=submit, args=("resolve",)):
+                st.success("Alert marked as resolved!")
+        with colC:
+            if st.button("Escalate Alert", on_click=submit, args=("escalate",)):
+                st.warning("Alert escalated!")
+    else:
+        st.info("Operator actions available to Operator/Admin only.")
+
+    if any(a["eventId"] == event_id for a in pending):
+        # Rerun the whole page once the queue has an outcome for this session
+        def sync_status():
+            if any(queue.result(a["actionId"]) is not None for a in pending):
+                st.rerun()
+            st.caption(f"💾 Saving {len(pending)} action(s)…")
+
+        if hasattr(st, "fragment"):
+            st.fragment(run_every=actions.FLUSH_INTERVAL)(sync_status)()
+        else:
+            sync_status()
+
+    # --- 3. Live Camera Feed (Simulated) ---
+    timer.start("video")
+    st.subheader("🔴 Live Camera Feed")
+    st.video(LIVE_FEED_URL)
+
+    # --- 4. Map with Incident Location ---
+    timer.start("map")
+    st.subheader("🗺️ Incident Location Map")
+    if st.toggle("Show map", value=True, key="show_map"):
+        embed_html(incident_map_html(cache_key, event_location(evt), config["marker_color"]),
+                   width=700, height=300)
+
+    # --- 5. Operator Notes ---
+    timer.start("notes")
+    st.subheader("📝 Operator Notes")
+    st.text_area("Add/View Notes", evt.get("notes", ""), height=100, key=notes_key)
+    if st.button("Save Note", on_click=submit, args=("note",)):
+        st.success("Note saved" if persisted else "Note saved (demo only)")
+
+    # --- 6. Automated Response Suggestion ---
+    timer.start("suggestion")
+    st.subheader("🤖 Suggested Response")
+    st.info(config["suggestion"])
+
+    # --- 7. Analytics (Demo) ---
+    timer.start("analytics")
+    st.subheader("📊 Incident Analytics")
+    if st.toggle("Show analytics", value=False, key="show_analytics"):
+        stats = lazy_import("utils.analytics").get_stats()
+        by_type, over_time = analytics_figures(stats.version)
+        st.plotly_chart(by_type)
+        st.plotly_chart(over_time)
+        p50, p95 = stats.response_percentile(50), stats.response_percentile(95)
+        if p50 is not None:
+            st.caption(f"Response time p50 ≈ {p50 / 60:.1f} min, p95 ≈ {p95 / 60:.1f} min")
+        # Long-range history comes from the columnar archive of closed events
+        try:
+            archived = get_client().analytics(groupBy="eventType", agg="p95", value="resolveSeconds")
+        except (requests.RequestException, ValueError, KeyError):
+            archived = []
+        if archived:
+            px = lazy_import("plotly.express")
+            st.plotly_chart(px.bar(x=[r["eventType"].capitalize() for r in archived],
+                                   y=[round(r["value"] / 60, 1) for r in archived],
+                                   labels={'x': 'Type', 'y': 'Minutes'}, title="Time to Resolved, p95 (Archive)"))
+
+    # --- 9. User Management UI (Demo) ---
+    timer.start("sidebar")
+    st.sidebar.markdown("---")
+    st.sidebar.header("User Management (Demo)")
+    st.sidebar.write("- Admin: Full access\n- Operator: Can acknowledge/resolve\n- Viewer: Read-only")
+
+    # --- 10. Media Gallery ---
+    timer.start("gallery")
+    st.subheader("🖼️ Media Gallery")
+    media = evt.get("media") or [evt.get("snapshotUrl")]
+    if media:
+        # Downscaled copies from the local media cache once ready, originals until then
+        media_cache = lazy_import("utils.media_cache").get_media_cache()
+        for img in media:
+            img = img or PLACEHOLDER_SNAPSHOT
+            st.image(str(media_cache.thumbnail_path(img, "gallery") or img), width=350)
+    else:
+        st.info("No media available.")
+
+    timer.stop()
+
+    st.markdown("---")
+    st.caption("WatchTowerX | Incident Response Logbook")
@@ -0,0 +1,48 @@
+import folium
+import streamlit as st
+from folium.plugins import MarkerCluster
+from streamlit_folium import st_folium
+
+from utils.common import ALERT_PAGE_CONFIGS, DEFAULT_MAP_CENTER, event_location
+
+# Above this many active incidents, markers are grouped into clusters
+CLUSTER_THRESHOLD = 100
+
+
+def _base_map(center, zoom):
+    return folium.Map(location=center, zoom_start=zoom)
+
+
+def _layer_signature(events):
+    return tuple((e.get("eventId"), event_location(e), e.get("eventType"), e.get("status")) for e in events)
+
+
+def incident_layer(events):
+    """FeatureGroup with one marker per event, clustered when there are many."""
+    layer = folium.FeatureGroup(name="Active Incidents")
+    target = MarkerCluster().add_to(layer) if len(events) > CLUSTER_THRESHOLD else layer
+    for evt in events:
+        config = ALERT_PAGE_CONFIGS.get(evt.get("eventType"), {})
+        tooltip = f"{evt.get('eventType', '').upper()} | {evt.get('location', 'Unknown')} | {evt.get('status', '')}"
+        folium.Marker(event_location(evt), tooltip=tooltip,
+                      icon=folium.Icon(color=config.get("marker_color", "red"))).add_to(target)
+    return layer
+
+
+def dispatch_map(events, key="dispatch_map", center=DEFAULT_MAP_CENTER, zoom=14, width=1400, height=400):
+    """Render the dispatch map, rebuilding only the incident layer when events change.
+
+    The base map is created once per session and kept in ``st.session_state``
+    under ``f"{key}_cache"`` (``st_folium`` writes its own value to ``key``);
+    ``st_folium`` keeps it mounted under a stable key and receives the marker
+    layer through ``feature_group_to_add``, so the browser only swaps markers.
+    """
+    state = st.session_state.setdefault(f"{key}_cache", {})
+    if "base" not in state:
+        state["base"] = _base_map(center, zoom)
+    signature = _layer_signature(events)
+    if state.get("signature") != signature:
+        state["layer"] = incident_layer(events)
+        state["signature"] = signature
+    return st_folium(state["base"], key=key, feature_group_to_add=state["layer"],
+                     width=width, height=height, returned_objects=[])
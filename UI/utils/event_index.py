@@ -0,0 +1,116 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timezone
+
+# Fields operators can filter the live feed by
+FACETS = ("eventType", "severity", "status", "location")
+
+
+def parse_timestamp(value):
+    """ISO-8601 string (``Z`` suffix allowed, naive means UTC) to epoch seconds; 0.0 if unparseable."""
+    if not value:
+        return 0.0
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class EventIndex:
+    """In-memory index over the events a dashboard session holds.
+
+    Each facet keeps a bucket (set of eventIds) per value, and a sorted list of
+    (epoch, eventId) answers time-range queries by bisection. A filter resolves
+    by intersecting the matching buckets, smallest first, instead of scanning
+    every event. The index is updated one event at a time as alerts arrive.
+    """
+
+    def __init__(self, facets=FACETS):
+        self.facets = facets
+        self._events = {}
+        self._epochs = {}
+        self._buckets = {facet: defaultdict(set) for facet in facets}
+        self._by_time = []  # sorted (epoch, eventId)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __contains__(self, event_id):
+        return event_id in self._events
+
+    def get(self, event_id):
+        return self._events.get(event_id)
+
+    def add(self, evt):
+        """Index a new event, or re-index it if its eventId is already known."""
+        event_id = evt.get("eventId")
+        if event_id is None:
+            return
+        if event_id in self._events:
+            self.remove(event_id)
+        self._events[event_id] = evt
+        for facet in self.facets:
+            self._buckets[facet][evt.get(facet)].add(event_id)
+        epoch = parse_timestamp(evt.get("timestamp"))
+        self._epochs[event_id] = epoch
+        insort(self._by_time, (epoch, event_id))
+
+    def remove(self, event_id):
+        evt = self._events.pop(event_id, None)
+        if evt is None:
+            return
+        for facet in self.facets:
+            bucket = self._buckets[facet].get(evt.get(facet))
+            if bucket is not None:
+                bucket.discard(event_id)
+                if not bucket:
+                    del self._buckets[facet][evt.get(facet)]
+        key = (self._epochs.pop(event_id), event_id)
+        pos = bisect_left(self._by_time, key)
+        if pos < len(self._by_time) and self._by_time[pos] == key:
+            del self._by_time[pos]
+
+    def copy(self):
+        """Independent index over the same events (the event dicts are shared)."""
+        clone = EventIndex(self.facets)
+        clone._events = dict(self._events)
+        clone._epochs = dict(self._epochs)
+        clone._buckets = {facet: defaultdict(set, {v: set(ids) for v, ids in buckets.items()})
+                          for facet, buckets in self._buckets.items()}
+        clone._by_time = list(self._by_time)
+        return clone
+
+    def values(self, facet):
+        """Distinct values currently present for a facet, for filter widgets."""
+        return sorted(v for v in self._buckets[facet] if v is not None)
+
+    def time_range(self, start=None, end=None):
+        """eventIds with start <= epoch <= end, oldest first."""
+        lo = 0 if start is None else bisect_left(self._by_time, (start, ""))
+        hi = len(self._by_time) if end is None else bisect_right(self._by_time, (end, "￿"))
+        return [event_id for _, event_id in self._by_time[lo:hi]]
+
+    def query(self, since=None, until=None, **filters):
+        """eventIds matching every given facet value, newest first.
+
+        Facets set to ``None`` or ``"all"`` are ignored, e.g.
+        ``query(eventType="fire", severity="high", since=time.time() - 900)``.
+        """
+        sets = []
+        for facet, value in filters.items():
+            if value is None or value == "all":
+                continue
+            bucket = self._buckets[facet].get(value)
+            if not bucket:
+                return []
+            sets.append(bucket)
+        if since is not None or until is not None:
+            sets.append(set(self.time_range(since, until)))
+        if not sets:
+            return [event_id for _, event_id in reversed(self._by_time)]
+        sets.sort(key=len)
+        matched = set.intersection(*sets)
+        return sorted(matched, key=lambda i: (self._epochs[i], i), reverse=True)
@@ -0,0 +1,229 @@
+from collections import deque
+
+from utils.analytics import get_stats
+from utils.common import PLACEHOLDER_SNAPSHOT
+from utils.event_index import EventIndex
+from utils.media_cache import get_media_cache
+
+# How many recent alerts the dashboard keeps around
+FEED_CAPACITY = 300
+
+CARD_CLASSES = {
+    "fire": "fire",
+    "theft": "theft",
+    "accident": "accident"
+}
+
+ALERT_PAGES = {
+    "fire": "Fire_Alert",
+    "theft": "Theft_Alert",
+    "accident": "Accident_Alert"
+}
+
+
+def event_version(evt):
+    """How far an event has been edited: (version, updatedAt), both bumped by each saved action."""
+    return (evt.get("version") or 0, evt.get("updatedAt") or "")
+
+
+def render_card(evt):
+    """Build the HTML for one alert card. Called once per event."""
+    event_type = evt.get("eventType", "fire")
+    color_class = CARD_CLASSES.get(event_type, "fire")
+    page = ALERT_PAGES.get(event_type, "Fire_Alert")
+    url = get_media_cache().thumbnail_url(evt.get("snapshotUrl") or PLACEHOLDER_SNAPSHOT, "card")
+    label = f"{event_type.upper()} | {evt.get('location', 'Unknown')} | {evt.get('timestamp', '')[:19].replace('T', ' ')}"
+    severity = evt.get('severity', '').capitalize()
+    status = evt.get('status', '').capitalize()
+    notes = evt.get('notes', '')
+    alert_url = f"/pages/{page}?eventId={evt.get('eventId', '')}"
+    return f"""
+        <a href='{alert_url}' style='text-decoration:none;'>
+            <div class='alert-card {color_class}'>
+                <div><b>{label}</b></div>
+                <div>Severity: {severity} | Status: {status}</div>
+                <div style='font-size:0.9em; color:#f5f6fa;'>{notes}</div>
+                <img src='{url}' style='width:100%; max-width:320px; border-radius:8px; margin-top:0.5em;'/>
+            </div>
+        </a>
+        """
+
+
+class LiveFeed:
+    """Ring buffer of recent alerts and their rendered cards (owned by the FeedHub).
+
+    The feed remembers the highest store ``seq`` it has polled and only asks
+    the API for writes after that cursor, so a refresh costs as much as the
+    number of new alerts rather than the whole event history. The cursor
+    follows the order events were stored, not their timestamps, so an alert
+    that arrives late or out of order is still picked up; eventIds keep each
+    event in the buffer once. Pushed alerts carry no ``seq`` and leave the
+    cursor alone. Cards are
+    rendered to HTML once, when their event enters the buffer, and buffered
+    events are kept in an ``EventIndex`` so filters never rescan the buffer.
+    A buffered event that comes back with a higher ``event_version`` (an
+    operator acknowledged, escalated or resolved it) replaces the old copy.
+    """
+
+    def __init__(self, capacity=FEED_CAPACITY):
+        self.capacity = capacity
+        self._order = deque()  # eventIds, oldest first
+        self._cards = {}
+        self._awaiting_thumbnail = set()  # cards still pointing at the full-size snapshot
+        self._evictions_seen = 0
+        self.index = EventIndex()
+        self.cursor = None  # highest store seq polled
+        self.stream_seq = 0
+        self.arrived = 0  # events ever added; numbers them for FeedSnapshot.newer_than
+        self._arrival = {}  # eventId -> arrival number
+
+    def __len__(self):
+        return len(self._order)
+
+    def extend(self, events):
+        """Append events not yet buffered and update buffered ones; returns what changed."""
+        events = list(events)
+        updated = self.update([e for e in events if e.get("eventId") in self._cards])
+        fresh = list({e["eventId"]: e for e in events
+                      if e.get("eventId") and e["eventId"] not in self._cards}.values())
+        stats = get_stats()
+        for evt in fresh:
+            stats.add(evt)
+            if len(self._order) == self.capacity:
+                evicted = self._order.popleft()
+                del self._cards[evicted]
+                del self._arrival[evicted]
+                self._awaiting_thumbnail.discard(evicted)
+                self.index.remove(evicted)
+            event_id = evt.get("eventId")
+            self.arrived += 1
+            self._arrival[event_id] = self.arrived
+            self._order.append(event_id)
+            self._cards[event_id] = render_card(evt)
+            if not get_media_cache().ready(evt.get("snapshotUrl") or PLACEHOLDER_SNAPSHOT):
+                self._awaiting_thumbnail.add(event_id)
+            self.index.add(evt)
+        return updated + fresh
+
+    def update(self, events):
+        """Replace buffered events with newer versions of themselves; returns the ones replaced."""
+        updated = []
+        for evt in events:
+            event_id = evt.get("eventId")
+            current = self.index.get(event_id)
+            if current is None or event_version(evt) <= event_version(current):
+                continue
+            self.index.add(evt)
+            self._cards[event_id] = render_card(evt)
+            if not get_media_cache().ready(evt.get("snapshotUrl") or PLACEHOLDER_SNAPSHOT):
+                self._awaiting_thumbnail.add(event_id)
+            updated.append(evt)
+        return updated
+
+    def poll(self, client, limit=200):
+        """Fetch writes after the cursor from the API and apply them."""
+        events = client.events_since(self.cursor, limit=limit)
+        seqs = [e["seq"] for e in events if e.get("seq") is not None]
+        if seqs:
+            self.cursor = max(seqs) if self.cursor is None else max(self.cursor, *seqs)
+        return self.extend(events)
+
+    def drain(self, stream):
+        """Append alerts pushed to an ``AlertStream`` since the last drain."""
+        self.stream_seq, events = stream.since(self.stream_seq)
+        return self.extend(events)
+
+    def events(self, **filters):
+        """Buffered events matching ``EventIndex.query`` filters, newest first."""
+        return [self.index.get(event_id) for event_id in self.index.query(**filters)]
+
+    def refresh_thumbnails(self):
+        """Re-render cards whose cached thumbnail became ready or was evicted; returns how many were."""
+        cache = get_media_cache()
+        refreshed = 0
+        if cache.evictions != self._evictions_seen:
+            # Cards pointing at an evicted thumbnail go back to the source URL until it is cached again
+            self._evictions_seen = cache.evictions
+            for event_id in self._order:
+                evt = self.index.get(event_id)
+                if event_id not in self._awaiting_thumbnail \
+                        and not cache.ready(evt.get("snapshotUrl") or PLACEHOLDER_SNAPSHOT):
+                    self._cards[event_id] = render_card(evt)
+                    self._awaiting_thumbnail.add(event_id)
+                    refreshed += 1
+        if not self._awaiting_thumbnail:
+            return refreshed
+        for event_id in list(self._awaiting_thumbnail):
+            evt = self.index.get(event_id)
+            if cache.ready(evt.get("snapshotUrl") or PLACEHOLDER_SNAPSHOT):
+                self._cards[event_id] = render_card(evt)
+                self._awaiting_thumbnail.discard(event_id)
+                refreshed += 1
+        return refreshed
+
+    def cards_html(self, **filters):
+        """Pre-rendered cards matching the filters, joined for a single markdown call."""
+        self.refresh_thumbnails()
+        return "".join(self._cards[event_id] for event_id in self.index.query(**filters))
+
+    def freeze(self, version, **info):
+        """Read-only ``FeedSnapshot`` of the current buffer, tagged with ``version``."""
+        self.refresh_thumbnails()
+        return FeedSnapshot(version, self.index.copy(), dict(self._cards), self.arrived, dict(self._arrival), **info)
+
+
+def placeholder_snapshot(version, events, **info):
+    """``FeedSnapshot`` of placeholder events, built apart from any LiveFeed.
+
+    Shown while the events API is unreachable; the events never reach a feed's
+    buffer, cursor or incident stats, so the first successful poll still seeds
+    the feed with the newest stored events.
+    """
+    index = EventIndex()
+    for evt in events:
+        index.add(evt)
+    return FeedSnapshot(version, index, {e["eventId"]: render_card(e) for e in events}, 0, {}, **info)
+
+
+class FeedSnapshot:
+    """Immutable view of a LiveFeed at one version, shared by every session.
+
+    Nothing changes a snapshot once it is published; the hub builds a new one
+    for the next version. Filtered card HTML is memoized on the snapshot, so
+    sessions with the same filters render the same version once between them.
+    """
+
+    MEMO_SIZE = 64
+
+    def __init__(self, version, index, cards, arrived, arrival, **info):
+        self.version = version
+        self.index = index
+        self.arrived = arrived
+        self.info = info
+        self._arrival = arrival
+        self._cards = cards
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def values(self, facet):
+        return self.index.values(facet)
+
+    def events(self, **filters):
+        """Events matching ``EventIndex.query`` filters, newest first."""
+        return [self.index.get(event_id) for event_id in self.index.query(**filters)]
+
+    def newer_than(self, arrived):
+        """Events that reached the feed after an earlier snapshot's ``arrived``, newest first."""
+        return [e for e in self.events() if self._arrival.get(e["eventId"], 0) > arrived]
+
+    def cards_html(self, **filters):
+        """Pre-rendered cards matching the filters, joined for a single markdown call."""
+        key = tuple(sorted(filters.items()))
+        html = self._memo.get(key)
+        if html is None:
+            html = "".join(self._cards[event_id] for event_id in self.index.query(**filters))
+            if len(self._memo) < self.MEMO_SIZE:
+                self._memo[key] = html
+        return html
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import requests
+
+from utils.actions import get_action_queue
+from utils.common import DEMO_EVENTS, get_client
+from utils.feed import LiveFeed, placeholder_snapshot
+from utils.stream import get_stream
+from utils.telemetry import instrument
+
+# How often the hub drains pushed alerts and publishes a new snapshot if anything changed
+REFRESH_SECONDS = 1.0
+# How often it also asks the events API for anything the push channel missed
+POLL_SECONDS = 5.0
+# Polling stands in for push while the stream is down
+OFFLINE_POLL_SECONDS = REFRESH_SECONDS
+
+HUB_FETCHES = instrument.counter("watchtower_hub_fetches_total", "Events API fetches made by the shared feed hub",
+                                 ("kind", "outcome"))
+
+
+class FeedHub:
+    """One backend poller for every Streamlit session in the process.
+
+    A daemon thread owns the only LiveFeed: it drains the shared AlertStream
+    and polls the events API every ``POLL_SECONDS``. Pushed alerts are already
+    stored by the notify backend, so they need no lookup of their own.
+    Events saved by the ActionQueue replace their buffered copies, so status
+    changes reach the cards and the status filter. Each change is published as a new ``FeedSnapshot``
+    with a higher version. Sessions read ``snapshot()`` and skip rendering
+    while the version is the one they last showed, so backend calls and
+    buffered events stay the same however many operators are connected.
+    """
+
+    def __init__(self, client=None, stream=None, actions=None, refresh_seconds=REFRESH_SECONDS,
+                 poll_seconds=POLL_SECONDS):
+        self.client = client or get_client()
+        self.stream = stream or get_stream()
+        self.actions = actions or get_action_queue()
+        self.refresh_seconds = refresh_seconds
+        self.poll_seconds = poll_seconds
+        self.fetches = 0
+        self._feed = LiveFeed()
+        self._version = 0
+        self._api_ok = True
+        self._last_poll = 0.0
+        self._actions_seq = 0
+        self._snapshot = self._feed.freeze(0, api_ok=True, connected=False)
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="feed-hub", daemon=True)
+            self._thread.start()
+        return self
+
+    def snapshot(self, wait=None):
+        """Latest published snapshot; ``wait`` seconds for the first fetch on a cold start."""
+        if wait:
+            self._ready.wait(wait)
+        return self._snapshot
+
+    def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.refresh()
+            finally:
+                self._ready.set()
+            time.sleep(max(0.0, self.refresh_seconds - (time.monotonic() - started)))
+
+    def refresh(self):
+        """One hub tick; publishes a new snapshot if the feed changed."""
+        # Poll before draining so the first snapshot is seeded with the newest stored events
+        changed = False
+        interval = self.poll_seconds if self.stream.connected else OFFLINE_POLL_SECONDS
+        if time.monotonic() - self._last_poll >= interval:
+            self._last_poll = time.monotonic()
+            changed |= bool(self._poll())
+        changed |= bool(self._drain())
+        self._actions_seq, saved = self.actions.saved_since(self._actions_seq)
+        changed |= bool(self._feed.update(saved))
+        changed |= bool(self._feed.refresh_thumbnails())
+        info = self._snapshot.info
+        if changed or info["api_ok"] != self._api_ok or info["connected"] != self.stream.connected:
+            self._version += 1
+            self._snapshot = self._freeze()
+
+    def _freeze(self):
+        info = {"api_ok": self._api_ok, "connected": self.stream.connected}
+        if not self._api_ok and not len(self._feed):
+            # Nothing real to show yet: placeholder cards, kept out of the feed itself
+            return placeholder_snapshot(self._version, list(DEMO_EVENTS.values()), **info)
+        return self._feed.freeze(self._version, **info)
+
+    def _poll(self):
+        self.fetches += 1
+        try:
+            fresh = self._feed.poll(self.client)
+        except (requests.RequestException, ValueError):
+            HUB_FETCHES.inc(kind="poll", outcome="error")
+            self._api_ok = False
+            return []
+        HUB_FETCHES.inc(kind="poll", outcome="ok")
+        self._api_ok = True
+        return fresh
+
+    def _drain(self):
+        return self._feed.drain(self.stream)
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    """Process-wide FeedHub, started on first use."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = FeedHub().start()
+    return _hub
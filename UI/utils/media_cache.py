@@ -0,0 +1,206 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image
+
+from utils.common import CONNECT_TIMEOUT, READ_TIMEOUT
+
+# Thumbnails live in the dashboard's static folder, named by the SHA-256 of the source image
+MEDIA_DIR = Path(os.environ.get("WATCHTOWER_MEDIA_DIR", Path(__file__).resolve().parents[1] / "static" / "media"))
+# Where browsers fetch them from: by default the dashboard's own origin (Streamlit static
+# serving, see UI/.streamlit/config.toml), so it works wherever the browser runs
+MEDIA_BASE_URL = os.environ.get("WATCHTOWER_MEDIA_URL", "/app/static/media")
+
+# Longest side in pixels for each variant
+THUMBNAIL_VARIANTS = {"card": 320, "gallery": 350}
+THUMBNAIL_QUALITY = 80
+
+MEDIA_CACHE_MAX_BYTES = 256 * 1024 ** 2
+MAX_SOURCE_BYTES = 20 * 1024 ** 2
+MEDIA_WORKERS = 4
+# A URL that failed to download is not tried again for this long, doubling per failure
+FAILED_RETRY_SECONDS = 60.0
+FAILED_RETRY_MAX_SECONDS = 3600.0
+FAILED_URLS = 4096
+
+
+def _url_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class MediaCache:
+    """Content-addressed thumbnail cache with byte-size LRU eviction.
+
+    The first time a media URL is seen it is downloaded on a background worker,
+    hashed, and downscaled once into every variant. Pages get the original URL
+    until the thumbnails exist, then the cached ones. ``refs/<sha256(url)>``
+    records which content hash a URL resolved to, so the mapping survives
+    restarts, and identical images from different URLs share one set of files.
+    A URL that fails to download is remembered and not scheduled again until
+    its backoff has passed, so dead links cost one request per backoff period
+    rather than one per render.
+    """
+
+    def __init__(self, root=MEDIA_DIR, max_bytes=MEDIA_CACHE_MAX_BYTES,
+                 base_url=MEDIA_BASE_URL, workers=MEDIA_WORKERS):
+        self.root = Path(root)
+        self.refs = self.root / "refs"
+        self.refs.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.base_url = base_url.rstrip("/")
+        self._lock = threading.Lock()
+        self._urls = {}  # url -> content hash
+        self._entries = OrderedDict()  # content hash -> bytes on disk, least recently used first
+        self._bytes = 0
+        self._pending = set()
+        self._failed = OrderedDict()  # url -> (retry_at, failures)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-cache")
+        self._session = requests.Session()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        files = sorted((p for p in self.root.glob("*.jpg")), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            content_hash = path.stem.split("_", 1)[0]
+            size = path.stat().st_size
+            self._entries[content_hash] = self._entries.get(content_hash, 0) + size
+            self._bytes += size
+        self._evict()
+
+    def _variant_path(self, content_hash, variant):
+        return self.root / f"{content_hash}_{variant}.jpg"
+
+    def _resolve(self, url):
+        """Content hash for ``url`` if its thumbnails are cached; schedules them otherwise."""
+        with self._lock:
+            content_hash = self._urls.get(url)
+            if content_hash is None:
+                ref = self.refs / _url_key(url)
+                if ref.exists():
+                    content_hash = ref.read_text().strip()
+                    self._urls[url] = content_hash
+            if content_hash is not None and content_hash in self._entries:
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return content_hash
+            self.misses += 1
+            failed = self._failed.get(url)
+            if url not in self._pending and (failed is None or time.monotonic() >= failed[0]):
+                self._pending.add(url)
+                self._pool.submit(self._fetch, url)
+            return None
+
+    def thumbnail_url(self, url, variant="card"):
+        """Browser URL of the cached thumbnail, or ``url`` itself until it is ready."""
+        if not url:
+            return url
+        content_hash = self._resolve(url)
+        if content_hash is None:
+            return url
+        return f"{self.base_url}/{content_hash}_{variant}.jpg"
+
+    def thumbnail_path(self, url, variant="gallery"):
+        """Local path of the cached thumbnail, or None until it is ready."""
+        if not url:
+            return None
+        content_hash = self._resolve(url)
+        return self._variant_path(content_hash, variant) if content_hash else None
+
+    def ready(self, url):
+        with self._lock:
+            content_hash = self._urls.get(url)
+            return content_hash is not None and content_hash in self._entries
+
+    def _fetch(self, url):
+        stored = False
+        try:
+            resp = self._session.get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True)
+            resp.raise_for_status()
+            data = resp.raw.read(MAX_SOURCE_BYTES + 1, decode_content=True)
+            if len(data) > MAX_SOURCE_BYTES:
+                return
+            content_hash = hashlib.sha256(data).hexdigest()
+            size = 0
+            if content_hash not in self._entries:
+                size = self._write_variants(content_hash, data)
+            (self.refs / _url_key(url)).write_text(content_hash)
+            with self._lock:
+                self._urls[url] = content_hash
+                if content_hash not in self._entries:
+                    self._entries[content_hash] = size
+                    self._bytes += size
+                self._entries.move_to_end(content_hash)
+                self._evict()
+            stored = True
+        except (requests.RequestException, OSError, Image.DecompressionBombError):
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+                if stored:
+                    self._failed.pop(url, None)
+                else:
+                    failures = self._failed.pop(url, (0, 0))[1] + 1
+                    delay = min(FAILED_RETRY_MAX_SECONDS, FAILED_RETRY_SECONDS * 2 ** (failures - 1))
+                    self._failed[url] = (time.monotonic() + delay, failures)
+                    if len(self._failed) > FAILED_URLS:
+                        self._failed.popitem(last=False)
+
+    def _write_variants(self, content_hash, data):
+        size = 0
+        with Image.open(io.BytesIO(data)) as source:
+            image = source.convert("RGB")
+        for variant, longest in THUMBNAIL_VARIANTS.items():
+            thumb = image.copy()
+            thumb.thumbnail((longest, longest))
+            path = self._variant_path(content_hash, variant)
+            tmp = path.with_suffix(".tmp")
+            thumb.save(tmp, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+            tmp.replace(path)
+            size += path.stat().st_size
+        return size
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            content_hash, size = self._entries.popitem(last=False)
+            for variant in THUMBNAIL_VARIANTS:
+                self._variant_path(content_hash, variant).unlink(missing_ok=True)
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "pending": len(self._pending),
+                "failed": len(self._failed),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_media_cache():
+    """Process-wide MediaCache shared by every Streamlit session."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = MediaCache()
+    return _cache
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+
+import aiohttp
+
+from utils.common import CONNECT_TIMEOUT
+
+# Server-Sent Events channel published by the notify backend (routes/stream.js)
+STREAM_URL = os.environ.get("WATCHTOWER_STREAM_URL", "http://localhost:5000/stream")
+
+# Pushed alerts kept for sessions that have not drained them yet
+STREAM_BACKLOG = 500
+RECONNECT_MIN_SECONDS = 0.5
+RECONNECT_MAX_SECONDS = 15.0
+
+
+class AlertStream:
+    """Background SSE consumer shared by every dashboard session in the process.
+
+    A daemon thread runs an asyncio loop that keeps one connection open to the
+    stream and appends each pushed alert to a bounded backlog with a sequence
+    number. Sessions call ``since(seq)`` to pick up what arrived after their
+    last look, so showing a pushed alert never needs a poll of the events API.
+    """
+
+    def __init__(self, url=STREAM_URL, backlog=STREAM_BACKLOG):
+        self.url = url
+        self.connected = False
+        self.received = 0
+        self._backlog = deque(maxlen=backlog)  # (seq, evt)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=asyncio.run, args=(self._run(),),
+                                            name="alert-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def publish(self, evt):
+        with self._lock:
+            self._seq += 1
+            self._backlog.append((self._seq, evt))
+            self.received += 1
+
+    def since(self, seq):
+        """Return ``(latest_seq, events)`` pushed after ``seq``, oldest first."""
+        with self._lock:
+            events = [evt for s, evt in self._backlog if s > seq]
+            return self._seq, events
+
+    async def _run(self):
+        delay = RECONNECT_MIN_SECONDS
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            while True:
+                try:
+                    async with session.get(self.url, headers={"Accept": "text/event-stream"}) as resp:
+                        resp.raise_for_status()
+                        self.connected = True
+                        delay = RECONNECT_MIN_SECONDS
+                        await self._consume(resp)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                self.connected = False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _consume(self, resp):
+        data = []
+        async for raw in resp.content:
+            line = raw.decode("utf-8").rstrip("\r\n")
+            if line.startswith("data:"):
+                data.append(line[5:].lstrip())
+            elif not line and data:
+                try:
+                    evt = json.loads("\n".join(data))
+                except ValueError:
+                    evt = None
+                data = []
+                if isinstance(evt, dict):
+                    self.publish(evt)
+
+
+_stream = None
+_stream_lock = threading.Lock()
+
+
+def get_stream():
+    """Process-wide AlertStream, started on first use."""
+    global _stream
+    if _stream is None:
+        with _stream_lock:
+            if _stream is None:
+                _stream = AlertStream().start()
+    return _stream
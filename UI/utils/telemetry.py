@@ -0,0 +1,46 @@
+import sys
+import time
+from pathlib import Path
+
+# The metrics core is shared with the alert pipeline so both processes export the same format
+_SHARED_DIR = Path(__file__).resolve().parents[2] / "shared"
+if str(_SHARED_DIR) not in sys.path:
+    sys.path.append(str(_SHARED_DIR))
+
+import instrument  # noqa: E402
+
+# Scrape the dashboard here; the alert publisher defaults to 9465
+METRICS_PORT = 9464
+
+RENDER_SECONDS = instrument.histogram("watchtower_render_seconds", "Streamlit page section render time",
+                                      ("page", "section"))
+HTTP_SECONDS = instrument.histogram("watchtower_http_client_seconds", "Events API request latency",
+                                    ("method", "route", "status"))
+
+
+def section(page, name):
+    """Time one block of a page: ``with section("dashboard", "alert_cards"): ...``"""
+    return RENDER_SECONDS.time(page=page, section=name)
+
+
+class SectionTimer:
+    """Times consecutive page sections; each ``start`` closes the previous section."""
+
+    def __init__(self, page):
+        self.page = page
+        self._name = None
+        self._started = 0.0
+
+    def start(self, name):
+        if not instrument.ENABLED:
+            return
+        now = time.perf_counter()
+        if self._name is not None:
+            RENDER_SECONDS.observe(now - self._started, page=self.page, section=self._name)
+        self._name, self._started = name, now
+
+    def stop(self):
+        self.start(None)
+
+
+instrument.serve_from_env(METRICS_PORT)
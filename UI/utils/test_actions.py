@@ -0,0 +1,57 @@
+import time
+
+import requests
+
+from utils.actions import ActionQueue, apply_local
+
+
+class FlakyClient:
+    """Applies every action, after failing the first ``failures`` writes."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.writes = []
+
+    def post_actions(self, actions):
+        self.writes.append([a["action"] for a in actions])
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("events API unreachable")
+        return [{"actionId": a["actionId"], "eventId": a["eventId"], "result": "applied",
+                 "previousStatus": "acknowledged"} for a in actions]
+
+
+def wait_for(queue, action, timeout=5):
+    deadline = time.monotonic() + timeout
+    while queue.result(action["actionId"]) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return queue.result(action["actionId"])
+
+
+def test_failed_write_is_retried_without_holding_up_later_actions():
+    client = FlakyClient(failures=1)
+    queue = ActionQueue(client=client, flush_interval=0.05)
+    first = queue.submit("a", "acknowledge")
+    queue.flush()
+    time.sleep(0.02)
+    second = queue.submit("b", "resolve")
+    assert wait_for(queue, second)["result"] == "applied"
+    assert queue.result(first["actionId"]) is None  # still waiting out its backoff
+    assert wait_for(queue, first)["result"] == "applied"
+    assert client.writes == [["acknowledge"], ["resolve"], ["acknowledge"]]
+    assert queue.stats()["failures"] == 1
+
+
+def test_action_fails_after_its_attempts_run_out():
+    queue = ActionQueue(client=FlakyClient(failures=100), flush_interval=0.01)
+    action = queue.submit("a", "note", note="hi")
+    assert wait_for(queue, action, timeout=10)["result"] == "failed"
+    assert queue.stats()["pending"] == 0
+
+
+def test_local_view_follows_the_forward_only_rules():
+    evt = {"eventId": "a", "status": "resolved", "timestamp": "2026-10-18T10:00:00Z"}
+    assert apply_local(evt, {"action": "acknowledge", "at": "2026-10-18T10:01:00Z"}) == evt
+    noted = apply_local(evt, {"action": "note", "note": "hi", "at": "2026-10-18T10:01:00Z"})
+    assert noted["notes"] == "hi"
+    assert noted["timeline"][-1]["pending"]
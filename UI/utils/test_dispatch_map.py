@@ -0,0 +1,29 @@
+from streamlit.testing.v1 import AppTest
+
+
+def script():
+    import streamlit as st
+
+    from utils.dispatch_map import dispatch_map
+
+    events = [{"eventId": f"evt_{i}", "eventType": "fire", "status": "pending", "coordinates": [-1.29, 36.82]}
+              for i in range(st.session_state.get("incidents", 1))]
+    dispatch_map(events)
+
+
+def test_base_map_is_kept_and_layer_rebuilt_only_when_events_change():
+    at = AppTest.from_function(script, default_timeout=30).run()
+    assert not at.exception
+    cache = at.session_state["dispatch_map_cache"]
+    base, layer = cache["base"], cache["layer"]
+
+    at.run()
+    assert not at.exception
+    assert at.session_state["dispatch_map_cache"]["layer"] is layer
+
+    at.session_state["incidents"] = 2
+    at.run()
+    assert not at.exception
+    cache = at.session_state["dispatch_map_cache"]
+    assert cache["base"] is base
+    assert cache["layer"] is not layer
@@ -0,0 +1,101 @@
+import pytest
+
+from utils import feed
+from utils.feed import LiveFeed
+
+
+class FakeMediaCache:
+    evictions = 0
+
+    def thumbnail_url(self, url, variant="card"):
+        return url
+
+    def ready(self, url):
+        return True
+
+
+class FakeClient:
+    """Serves ``events_since`` from a list of pages and records the cursors asked for."""
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.cursors = []
+
+    def events_since(self, cursor=None, limit=200):
+        self.cursors.append(cursor)
+        return self.pages.pop(0) if self.pages else []
+
+
+class FakeStream:
+    def __init__(self, events):
+        self.events = events
+
+    def since(self, seq):
+        return len(self.events), self.events[seq:]
+
+
+@pytest.fixture(autouse=True)
+def media_cache(monkeypatch):
+    monkeypatch.setattr(feed, "get_media_cache", FakeMediaCache)
+
+
+def event(event_id, seq=None, timestamp="2026-10-18T10:00:00Z", **fields):
+    evt = {"eventId": event_id, "eventType": "fire", "timestamp": timestamp, "status": "pending", **fields}
+    if seq is not None:
+        evt["seq"] = seq
+    return evt
+
+
+def test_poll_follows_the_store_sequence():
+    client = FakeClient([event("a", 1), event("b", 2)], [event("c", 3)], [])
+    live = LiveFeed()
+    live.poll(client)
+    live.poll(client)
+    live.poll(client)
+    assert client.cursors == [None, 2, 3]
+    assert live.cursor == 3
+
+
+def test_poll_picks_up_a_late_alert_with_an_older_timestamp():
+    client = FakeClient([event("new", 1, timestamp="2026-10-18T12:00:00Z")],
+                        [event("late", 2, timestamp="2026-10-18T09:00:00Z")])
+    live = LiveFeed()
+    live.poll(client)
+    added = live.poll(client)
+    assert [e["eventId"] for e in added] == ["late"]
+    assert [e["eventId"] for e in live.events()] == ["new", "late"]
+
+
+def test_pushed_and_polled_copies_are_buffered_once():
+    live = LiveFeed()
+    live.drain(FakeStream([event("a"), event("a")]))
+    assert live.poll(FakeClient([event("a", 1)])) == []
+    assert len(live) == 1
+    assert live.cursor == 1  # the cursor still moves past the duplicate
+
+
+def test_newer_version_replaces_the_buffered_event():
+    live = LiveFeed()
+    live.extend([event("a", version=2, status="acknowledged")])
+    assert live.extend([event("a", version=1, status="pending")]) == []
+    assert live.index.get("a")["status"] == "acknowledged"
+    live.extend([event("a", version=3, status="resolved")])
+    assert live.index.get("a")["status"] == "resolved"
+    assert len(live) == 1
+
+
+def test_capacity_evicts_the_oldest_event():
+    live = LiveFeed(capacity=2)
+    live.extend([event("a"), event("b"), event("c")])
+    assert "a" not in live.index
+    assert len(live) == 2
+
+
+def test_snapshot_reports_events_that_arrived_since_an_earlier_one():
+    live = LiveFeed()
+    live.extend([event("a")])
+    before = live.freeze(1)
+    live.extend([event("b", timestamp="2026-10-18T08:00:00Z")])
+    after = live.freeze(2)
+    assert [e["eventId"] for e in after.newer_than(before.arrived)] == ["b"]
+    assert after.newer_than(after.arrived) == []
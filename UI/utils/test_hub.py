@@ -0,0 +1,67 @@
+import pytest
+import requests
+
+from utils import feed, hub
+from utils.common import DEMO_EVENTS
+from utils.hub import FeedHub
+
+
+class FakeMediaCache:
+    evictions = 0
+
+    def thumbnail_url(self, url, variant="card"):
+        return url
+
+    def ready(self, url):
+        return True
+
+
+class FlakyClient:
+    """Events API that is down until ``up`` is set."""
+
+    def __init__(self):
+        self.up = False
+        self.cursors = []
+
+    def events_since(self, cursor=None, limit=200):
+        if not self.up:
+            raise requests.ConnectionError("events API unreachable")
+        self.cursors.append(cursor)
+        return [{"eventId": "evt_real", "eventType": "theft", "timestamp": "2026-10-18T10:00:00Z",
+                 "status": "pending", "seq": 7}]
+
+
+class QuietStream:
+    connected = False
+
+    def since(self, seq):
+        return seq, []
+
+
+class NoActions:
+    def saved_since(self, seq):
+        return seq, []
+
+
+@pytest.fixture(autouse=True)
+def media_cache(monkeypatch):
+    monkeypatch.setattr(feed, "get_media_cache", FakeMediaCache)
+    monkeypatch.setattr(hub, "OFFLINE_POLL_SECONDS", 0.0)
+
+
+def test_demo_events_are_shown_but_kept_out_of_the_feed():
+    client = FlakyClient()
+    feed_hub = FeedHub(client=client, stream=QuietStream(), actions=NoActions())
+    feed_hub.refresh()
+    snapshot = feed_hub.snapshot()
+    assert not snapshot.info["api_ok"]
+    assert {e["eventId"] for e in snapshot.events()} == {e["eventId"] for e in DEMO_EVENTS.values()}
+    assert len(feed_hub._feed) == 0
+
+    client.up = True
+    feed_hub.refresh()
+    snapshot = feed_hub.snapshot()
+    assert snapshot.info["api_ok"]
+    assert [e["eventId"] for e in snapshot.events()] == ["evt_real"]
+    assert client.cursors == [None]  # seeded with the newest stored events
+    assert feed_hub._feed.cursor == 7
@@ -0,0 +1,99 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from utils import media_cache
+from utils.media_cache import MediaCache
+
+
+def jpeg(color, size=(640, 480)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+IMAGES = {"/red.jpg": jpeg("red"), "/blue.jpg": jpeg("blue"), "/red-copy.jpg": jpeg("red")}
+
+
+@pytest.fixture
+def origin():
+    """Local image host; returns (base URL, request count per path)."""
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            body = IMAGES.get(self.path)
+            self.send_response(200 if body else 404)
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+
+
+def settle(cache):
+    deadline = time.monotonic() + 5
+    while cache.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_thumbnails_are_served_from_the_dashboard_origin(tmp_path, origin):
+    base, _ = origin
+    cache = MediaCache(tmp_path)
+    url = f"{base}/red.jpg"
+    assert cache.thumbnail_url(url) == url  # the original until the thumbnail exists
+    settle(cache)
+    thumbnail = cache.thumbnail_url(url)
+    assert thumbnail.startswith("/app/static/media/") and thumbnail.endswith("_card.jpg")
+    with Image.open(cache.thumbnail_path(url)) as image:
+        assert max(image.size) == media_cache.THUMBNAIL_VARIANTS["gallery"]
+
+
+def test_identical_images_share_one_set_of_files(tmp_path, origin):
+    base, _ = origin
+    cache = MediaCache(tmp_path)
+    for name in ("red", "red-copy"):
+        cache.thumbnail_url(f"{base}/{name}.jpg")
+        settle(cache)
+    assert cache.thumbnail_url(f"{base}/red.jpg") == cache.thumbnail_url(f"{base}/red-copy.jpg")
+    assert cache.stats()["entries"] == 1
+
+
+def test_failed_download_backs_off(tmp_path, origin, monkeypatch):
+    monkeypatch.setattr(media_cache, "FAILED_RETRY_SECONDS", 0.2)
+    base, hits = origin
+    cache = MediaCache(tmp_path)
+    url = f"{base}/missing.jpg"
+    for _ in range(20):
+        assert cache.thumbnail_url(url) == url
+        settle(cache)
+    assert hits["/missing.jpg"] == 1
+    assert cache.stats()["failed"] == 1
+    time.sleep(0.25)
+    cache.thumbnail_url(url)
+    settle(cache)
+    assert hits["/missing.jpg"] == 2
+    retry_at, failures = cache._failed[url]
+    assert failures == 2 and retry_at - time.monotonic() > 0.2  # the backoff doubled
+
+
+def test_eviction_drops_the_least_recently_used_thumbnails(tmp_path, origin):
+    base, _ = origin
+    cache = MediaCache(tmp_path, max_bytes=1)
+    for name in ("red", "blue"):
+        cache.thumbnail_url(f"{base}/{name}.jpg")
+        settle(cache)
+    assert cache.evictions == 1
+    assert not cache.ready(f"{base}/red.jpg")
+    assert cache.ready(f"{base}/blue.jpg")
+    assert len(list(tmp_path.glob("*.jpg"))) == len(media_cache.THUMBNAIL_VARIANTS)
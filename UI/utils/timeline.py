@@ -0,0 +1,160 @@
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from utils.event_index import parse_timestamp
+
+# Timeline entries shown per page
+TIMELINE_PAGE_SIZE = 50
+# Event timelines kept per process
+TIMELINE_CACHE_SIZE = 256
+# Rendered pages kept per timeline
+PAGE_MEMO_SIZE = 16
+
+
+class TextTable:
+    """Interned timeline texts: each distinct text is stored once per process.
+
+    Timeline entries repeat a handful of phrases ("Alert created",
+    "Acknowledged by Operator", ...), so entries hold a small id instead of
+    their own copy of the string.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._texts = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def intern(self, text):
+        text_id = self._ids.get(text)
+        if text_id is None:
+            with self._lock:
+                text_id = self._ids.get(text)
+                if text_id is None:
+                    text_id = self._ids[text] = len(self._texts)
+                    self._texts.append(text)
+        return text_id
+
+    def text(self, text_id):
+        return self._texts[text_id]
+
+
+class Timeline:
+    """Append-only timeline of one incident, stored as two parallel arrays.
+
+    Times are parsed once, on append, into an ``array("d")`` of epoch seconds
+    and texts are interned ids in an ``array("I")``, so a multi-hour incident
+    with thousands of entries costs 12 bytes per entry. The page still gets
+    the whole timeline with the event document, but ``sync`` appends only the
+    entries past the ones already held, so each refresh parses and interns
+    what is new rather than the whole timeline. Pages are rendered to one markdown string
+    each; every page but the last is full and can never change again, so
+    those renders are memoized for as long as the timeline is kept.
+    """
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.epochs = array("d")
+        self.text_ids = array("I")
+        self._pages = OrderedDict()  # (page, size, seen) -> markdown
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def append(self, time_value, text):
+        self.epochs.append(parse_timestamp(time_value))
+        self.text_ids.append(self.texts.intern(text))
+
+    def sync(self, entries):
+        """Append ``{"time", "event"}`` entries past the ones already held; returns how many were new.
+
+        A list that is shorter than what is held, or disagrees with its last
+        held entry, means the source was replaced (e.g. placeholder data gave
+        way to the real event), so it is reloaded.
+        """
+        with self._lock:
+            if len(entries) < len(self) or (len(self) and not self._matches(len(self) - 1, entries[len(self) - 1])):
+                self.epochs, self.text_ids = array("d"), array("I")
+                self._pages.clear()
+            fresh = entries[len(self):]
+            for entry in fresh:
+                self.append(entry.get("time"), entry.get("event", ""))
+            return len(fresh)
+
+    def _matches(self, i, entry):
+        return (self.epochs[i] == parse_timestamp(entry.get("time"))
+                and self.texts.text(self.text_ids[i]) == entry.get("event", ""))
+
+    def page_count(self, size=TIMELINE_PAGE_SIZE):
+        return max(1, -(-len(self) // size))
+
+    def page_markdown(self, page, size=TIMELINE_PAGE_SIZE, seen=None):
+        """Markdown list for one page (0 = oldest), entries from index ``seen`` on flagged as new."""
+        with self._lock:
+            start = page * size
+            end = min(start + size, len(self))
+            full = end - start == size
+            # Pages before the last never change; the seen marker is clamped to the page, so a page
+            # wholly newer than it is keyed (and flagged) as all new and one wholly older as not
+            seen = max(seen, start) if seen is not None and seen < end else None
+            key = (page, size, seen)
+            if full and key in self._pages:
+                self._pages.move_to_end(key)
+                return self._pages[key]
+            lines = []
+            for i in range(start, end):
+                clock = datetime.fromtimestamp(self.epochs[i], timezone.utc).strftime("%H:%M:%S")
+                marker = " 🆕" if seen is not None and i >= seen else ""
+                lines.append(f"- **{clock}** - {self.texts.text(self.text_ids[i])}{marker}")
+            markdown = "\n".join(lines)
+            if full:
+                self._pages[key] = markdown
+                if len(self._pages) > PAGE_MEMO_SIZE:
+                    self._pages.popitem(last=False)
+            return markdown
+
+
+class TimelineStore:
+    """Process-wide timelines by eventId, least recently used evicted first."""
+
+    def __init__(self, capacity=TIMELINE_CACHE_SIZE):
+        self.capacity = capacity
+        self.texts = TextTable()
+        self._timelines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, event_id):
+        """Timeline for ``event_id``, created empty on first use."""
+        with self._lock:
+            timeline = self._timelines.get(event_id)
+            if timeline is None:
+                timeline = self._timelines[event_id] = Timeline(self.texts)
+                if len(self._timelines) > self.capacity:
+                    self._timelines.popitem(last=False)
+            else:
+                self._timelines.move_to_end(event_id)
+            return timeline
+
+    def stats(self):
+        with self._lock:
+            timelines = list(self._timelines.values())
+        return {"timelines": len(timelines), "entries": sum(len(t) for t in timelines), "texts": len(self.texts)}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_timelines():
+    """Process-wide TimelineStore shared by every Streamlit session."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimelineStore()
+    return _store
@@ -0,0 +1,538 @@
+"""Columnar archive of closed events, for month-scale analytics.
+
+The compaction job moves closed events out of the live SQLite store into
+memory-mappable column files under ``data/archive/``, one directory per UTC
+day and eventType:
+
+    data/archive/manifest.json
+    data/archive/day=2026-10-18/type=fire/seg-000042.col
+
+Each (day, eventType) partition is one segment file; a compaction run that
+adds rows to a partition rewrites it as a single merged segment. A
+segment file holds its columns back to back (64-byte aligned, offsets derived
+from the row count), so opening it is one ``mmap`` and every column is a
+zero-copy NumPy view. Rows in a segment are sorted by timestamp, and strings
+(location, severity) are dictionary-encoded to small integer codes shared
+through the manifest.
+
+``Archive.aggregate`` pushes predicates down in three steps:
+
+1. eventType and time range prune whole segments using the manifest.
+2. The time range narrows each segment to a row slice by binary search.
+3. Location and severity become integer comparisons on the mapped columns.
+
+Groups are folded into one dense integer key and aggregated with
+``np.bincount``. Percentiles come from log-spaced histograms, the same
+approach as ``UI/utils/analytics.py``, so they are accurate to about 2%.
+
+    python api/archive.py compact --older-than-hours 24 [--every 3600]
+    python api/archive.py query --group-by eventType --agg p95 --value resolveSeconds
+    python api/archive.py bench --events 10000000 --root /tmp/archive
+"""
+import argparse
+import json
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from store import DB_PATH, EventStore, to_epoch
+
+ARCHIVE_DIR = DB_PATH.parent / "archive"
+MANIFEST = "manifest.json"
+
+# Statuses after which an event no longer changes
+CLOSED_STATUSES = ("resolved",)
+COMPACT_OLDER_THAN_HOURS = 24.0
+COMPACT_BATCH = 5000
+
+# Column -> dtype, in file order; eventType is the partition, not a column
+COLUMNS = {
+    "ts": "<f8",
+    "location": "<i4",
+    "severity": "u1",
+    "confidence": "<f4",
+    "ackSeconds": "<f4",
+    "resolveSeconds": "<f4",
+}
+DICTIONARY_COLUMNS = ("location", "severity")
+DURATION_COLUMNS = ("ackSeconds", "resolveSeconds")
+VALUE_COLUMNS = ("confidence", *DURATION_COLUMNS)
+GROUP_COLUMNS = ("eventType", "location", "severity")
+
+# Bucket -> (width in seconds, origin); weeks start on Monday (1970-01-05)
+BUCKETS = {
+    "hour": (3600, 0),
+    "day": (86400, 0),
+    "week": (7 * 86400, 4 * 86400),
+}
+
+# Duration histogram for percentiles: 1 s .. 2**20 s (12 days), 32 buckets per doubling
+PERCENTILE_BUCKETS_PER_DOUBLING = 32
+PERCENTILE_BUCKETS = 20 * PERCENTILE_BUCKETS_PER_DOUBLING + 1
+# Largest dense group space aggregate() will allocate (counts, and histograms for percentiles)
+MAX_DENSE_CELLS = 1 << 24
+# Segment files kept mapped between queries; each map holds one file descriptor
+MAPPED_SEGMENTS = 256
+
+
+def _layout(rows, id_width):
+    """Column -> (offset, dtype) inside a segment file, and the file size."""
+    offset, layout = 0, {}
+    for name, dtype in [*COLUMNS.items(), ("eventId", f"S{id_width}")]:
+        layout[name] = (offset, np.dtype(dtype))
+        offset = -(-(offset + rows * np.dtype(dtype).itemsize) // 64) * 64
+    return layout, offset
+
+
+def _day(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _seconds_between(evt, key):
+    try:
+        return to_epoch(evt[key]) - to_epoch(evt["timestamp"]) if evt.get(key) else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _as_list(value):
+    if value is None or value == "all":
+        return None
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+class Archive:
+    """Reader and writer for the partitioned archive.
+
+    Readers reload the manifest when it changes on disk and keep the most
+    recently used ``MAPPED_SEGMENTS`` segment files mapped between queries,
+    so hot segments are opened once without holding a descriptor for every
+    segment in the archive. There should be one writer at a time, the
+    compaction job.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR, mapped_segments=MAPPED_SEGMENTS):
+        self.root = Path(root)
+        self.mapped_segments = mapped_segments
+        self._manifest = None
+        self._manifest_mtime = None
+        self._mapped = OrderedDict()  # segment path -> (mmap, {column: read-only view})
+        self._lock = threading.Lock()
+
+    # --- Manifest ---
+
+    def manifest(self):
+        path = self.root / MANIFEST
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {"segments": [], "dictionaries": {c: [""] for c in DICTIONARY_COLUMNS},
+                    "eventTypes": [], "nextSegment": 1, "pending": []}
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                self._manifest = json.loads(path.read_text())
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def _save_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self.root / MANIFEST)
+
+    def stats(self):
+        manifest = self.manifest()
+        segments = manifest["segments"]
+        return {
+            "segments": len(segments),
+            "rows": sum(s["rows"] for s in segments),
+            "eventTypes": manifest["eventTypes"],
+            "from": _iso(min(s["tsMin"] for s in segments)) if segments else None,
+            "to": _iso(max(s["tsMax"] for s in segments)) if segments else None,
+        }
+
+    # --- Writes ---
+
+    def append(self, events):
+        """Write closed events into their partitions and return the segment paths written.
+
+        A partition that already has segments is rewritten as one merged
+        segment, so the number of files stays at one per (day, eventType)
+        however often compaction runs. The paths are recorded as ``pending``
+        in the manifest until ``commit`` confirms the events were removed
+        from the live store, so a crash in between never leaves events in
+        both places.
+        """
+        manifest = json.loads(json.dumps(self.manifest()))  # private copy to edit
+        dictionaries = manifest["dictionaries"]
+        codes = {c: {v: i for i, v in enumerate(dictionaries[c])} for c in DICTIONARY_COLUMNS}
+
+        def encode(column, value):
+            value = value or ""
+            code = codes[column].get(value)
+            if code is None:
+                code = codes[column][value] = len(dictionaries[column])
+                dictionaries[column].append(value)
+            return code
+
+        partitions = {}
+        for evt in events:
+            ts = to_epoch(evt["timestamp"])
+            partitions.setdefault((_day(ts), evt["eventType"]), []).append((ts, evt))
+        written, replaced = [], []
+        for (day, event_type), rows in sorted(partitions.items()):
+            rows.sort(key=lambda r: (r[0], r[1]["eventId"]))
+            docs = [evt for _, evt in rows]
+            columns = {
+                "ts": [ts for ts, _ in rows],
+                "location": [encode("location", e.get("location")) for e in docs],
+                "severity": [encode("severity", e.get("severity")) for e in docs],
+                "confidence": [e.get("confidence") if e.get("confidence") is not None else np.nan for e in docs],
+                "ackSeconds": [_seconds_between(e, "acknowledgedAt") for e in docs],
+                "resolveSeconds": [_seconds_between(e, "resolvedAt") for e in docs],
+            }
+            ids = np.array([e["eventId"] for e in docs], dtype=np.bytes_)
+            old = [s for s in manifest["segments"] if s["day"] == day and s["eventType"] == event_type]
+            if old:
+                columns, ids = self._merge(old, columns, ids)
+                manifest["segments"] = [s for s in manifest["segments"] if s not in old]
+                replaced.extend(s["path"] for s in old)
+            written.append(self._write_segment(manifest, day, event_type, columns, ids))
+        if written:
+            pending = [p for p in manifest.get("pending", []) if p not in replaced]
+            manifest["pending"] = [*pending, *[s["path"] for s in written]]
+            self._save_manifest(manifest)
+            self._remove(replaced)
+        return [s["path"] for s in written]
+
+    def _merge(self, segments, columns, ids):
+        """``columns``/``ids`` combined with the rows of ``segments``, re-sorted by (ts, eventId)."""
+        opened = [self._open(s) for s in segments]
+        ids = np.concatenate([*(o["eventId"] for o in opened), ids])
+        merged = {name: np.concatenate([*(o[name] for o in opened), np.asarray(columns[name], dtype=dtype)])
+                  for name, dtype in COLUMNS.items()}
+        order = np.lexsort((ids, merged["ts"]))
+        return {name: values[order] for name, values in merged.items()}, ids[order]
+
+    def _remove(self, paths):
+        """Delete replaced segment files (open maps stay valid until dropped)."""
+        with self._lock:
+            for rel in paths:
+                self._mapped.pop(rel, None)
+        for rel in paths:
+            (self.root / rel).unlink(missing_ok=True)
+
+    def _write_segment(self, manifest, day, event_type, columns, ids):
+        seq = manifest["nextSegment"]
+        manifest["nextSegment"] = seq + 1
+        rel = f"day={day}/type={event_type}/seg-{seq:06d}.col"
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ts = columns["ts"]
+        id_width = max(1, ids.dtype.itemsize)
+        layout, size = _layout(len(ts), id_width)
+        with open(path, "wb") as f:
+            for name, (offset, dtype) in layout.items():
+                f.seek(offset)
+                f.write(np.ascontiguousarray(ids if name == "eventId" else columns[name], dtype=dtype).tobytes())
+            f.truncate(size)
+        segment = {"path": rel, "day": day, "eventType": event_type, "rows": len(ts), "idWidth": id_width,
+                   "tsMin": float(ts[0]), "tsMax": float(ts[-1])}
+        manifest["segments"].append(segment)
+        if event_type not in manifest["eventTypes"]:
+            manifest["eventTypes"].append(event_type)
+        return segment
+
+    def pending_ids(self):
+        """eventIds of segments written but not yet confirmed removed from the live store."""
+        segments = {s["path"]: s for s in self.manifest()["segments"]}
+        return [i.decode() for rel in self.manifest().get("pending", [])
+                for i in self._open(segments[rel])["eventId"]]
+
+    def commit(self):
+        manifest = dict(self.manifest())
+        if manifest.get("pending"):
+            manifest["pending"] = []
+            self._save_manifest(manifest)
+
+    # --- Reads ---
+
+    def _open(self, segment):
+        rel = segment["path"]
+        with self._lock:
+            entry = self._mapped.get(rel)
+            if entry is not None:
+                self._mapped.move_to_end(rel)
+                return entry[1]
+        rows = segment["rows"]
+        layout, size = _layout(rows, segment["idWidth"])
+        with open(self.root / rel, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        columns = {name: np.frombuffer(buffer, dtype, rows, offset) for name, (offset, dtype) in layout.items()}
+        with self._lock:
+            self._mapped[rel] = (buffer, columns)
+            while len(self._mapped) > self.mapped_segments:
+                evicted = self._mapped.popitem(last=False)[1][0]  # drop our views before closing
+                try:
+                    evicted.close()
+                except BufferError:
+                    pass  # a running query still holds views; the map closes when they are dropped
+        return columns
+
+    def segments(self, event_types=None, since=None, until=None, manifest=None):
+        """Segments that can hold matching rows (partition pruning)."""
+        return [s for s in (manifest or self.manifest())["segments"]
+                if (event_types is None or s["eventType"] in event_types)
+                and (since is None or s["tsMax"] > since)
+                and (until is None or s["tsMin"] <= until)]
+
+    def _codes(self, manifest, column, values):
+        if values is None:
+            return None
+        lookup = {v: i for i, v in enumerate(manifest["dictionaries"][column])}
+        return np.array([lookup[v] for v in values if v in lookup], dtype=COLUMNS[column])
+
+    def scan(self, columns, eventType=None, location=None, severity=None, since=None, until=None, manifest=None):
+        """Yield ``(segment, {column: array})`` for rows matching the filters.
+
+        ``since`` is exclusive and ``until`` inclusive (epoch seconds), like
+        ``EventStore.query``; the other filters take one value or a list.
+        Pass ``manifest`` to read a fixed version while compaction runs.
+        """
+        manifest = manifest or self.manifest()
+        filters = {c: self._codes(manifest, c, _as_list(v))
+                   for c, v in (("location", location), ("severity", severity))}
+        for segment in self.segments(_as_list(eventType), since, until, manifest):
+            mapped = self._open(segment)
+            ts = mapped["ts"]
+            lo = 0 if since is None else int(np.searchsorted(ts, since, side="right"))
+            hi = len(ts) if until is None else int(np.searchsorted(ts, until, side="right"))
+            if lo >= hi:
+                continue
+            mask = None
+            for column, codes in filters.items():
+                if codes is None:
+                    continue
+                values = mapped[column][lo:hi]
+                hit = values == codes[0] if len(codes) == 1 else np.isin(values, codes)
+                mask = hit if mask is None else mask & hit
+            if mask is not None and not mask.any():
+                continue
+            data = {}
+            for column in columns:
+                values = mapped[column][lo:hi]
+                data[column] = values if mask is None else values[mask]
+            yield segment, data
+
+    def aggregate(self, group_by=("eventType",), bucket=None, agg="count", value=None, **filters):
+        """Grouped aggregate over the archive.
+
+        ``group_by`` takes columns from GROUP_COLUMNS and ``bucket`` is one of
+        BUCKETS or None. ``agg`` is "count", "mean" or a percentile such as
+        "p95" (percentiles only apply to DURATION_COLUMNS). Returns
+        ``(rows, scanned)``, with each row a dict of the group values, its
+        ``count`` and the ``value``. For example, weekly fires per zone:
+
+            archive.aggregate(["location"], bucket="week", eventType="fire")
+        """
+        group_by = list(group_by)
+        for column in group_by:
+            if column not in GROUP_COLUMNS:
+                raise ValueError(f"groupBy must be among {', '.join(GROUP_COLUMNS)}.")
+        if bucket is not None and bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}.")
+        percentile = float(agg[1:]) if agg.startswith("p") and agg[1:].replace(".", "", 1).isdigit() else None
+        if agg not in ("count", "mean") and percentile is None:
+            raise ValueError("agg must be count, mean or a percentile like p95.")
+        if agg != "count" and value not in VALUE_COLUMNS:
+            raise ValueError(f"value must be one of {', '.join(VALUE_COLUMNS)}.")
+        if percentile is not None and not 0 < percentile <= 100:
+            raise ValueError("Percentiles must be between p0 and p100.")
+        if percentile is not None and value not in DURATION_COLUMNS:
+            raise ValueError(f"Percentiles apply to {', '.join(DURATION_COLUMNS)} only.")
+
+        manifest = self.manifest()
+        event_types = manifest["eventTypes"]
+        cardinality = {"eventType": len(event_types)}
+        cardinality.update({c: len(manifest["dictionaries"][c]) for c in DICTIONARY_COLUMNS})
+        dims = [cardinality[c] for c in group_by]
+        segments = self.segments(_as_list(filters.get("eventType")), filters.get("since"), filters.get("until"),
+                                 manifest)
+        if bucket is not None:
+            width, origin = BUCKETS[bucket]
+            first = int((min((s["tsMin"] for s in segments), default=0) - origin) // width)
+            last = int((max((s["tsMax"] for s in segments), default=0) - origin) // width)
+            dims.append(last - first + 1)
+        cells = int(np.prod(dims)) if dims else 1
+        bins = PERCENTILE_BUCKETS if percentile is not None else 1
+        if cells * bins > MAX_DENSE_CELLS:
+            raise ValueError("Too many groups; narrow the time range or group by fewer columns.")
+
+        counts = np.zeros(cells, dtype=np.int64)
+        sums = np.zeros(cells) if agg == "mean" else None
+        hist = np.zeros(cells * bins, dtype=np.int64) if percentile is not None else None
+        # ts is always read: unfiltered it is only a view, and its length is the row count
+        columns = ["ts", *(c for c in group_by if c != "eventType"), *([value] if agg != "count" else [])]
+        scanned = 0
+        for segment, data in self.scan(columns, manifest=manifest, **filters):
+            rows = len(data["ts"])
+            scanned += rows
+            key = np.zeros(rows, dtype=np.int64)
+            for column, size in zip(group_by, dims):
+                if column == "eventType":
+                    key = key * size + event_types.index(segment["eventType"])
+                else:
+                    key = key * size + data[column]
+            if bucket is not None:
+                key = key * dims[-1] + ((data["ts"] - origin) // width).astype(np.int64) - first
+            if agg == "count":
+                counts += np.bincount(key, minlength=cells)
+                continue
+            values = np.asarray(data[value], dtype=np.float64)
+            valid = ~np.isnan(values)
+            key, values = key[valid], values[valid]
+            counts += np.bincount(key, minlength=cells)
+            if sums is not None:
+                sums += np.bincount(key, weights=values, minlength=cells)
+            else:
+                hist += np.bincount(key * bins + _duration_bucket(values), minlength=cells * bins)
+
+        present = np.flatnonzero(counts)
+        if sums is not None:
+            result = sums[present] / counts[present]
+        elif hist is not None:
+            result = _histogram_percentile(hist.reshape(cells, bins)[present], counts[present], percentile)
+        else:
+            result = counts[present]
+        labels = np.unravel_index(present, dims) if dims else []
+        rows = []
+        for i, cell in enumerate(present):
+            row = {}
+            for column, codes in zip(group_by, labels):
+                code = int(codes[i])
+                row[column] = event_types[code] if column == "eventType" else manifest["dictionaries"][column][code]
+            if bucket is not None:
+                row[bucket] = _iso(origin + (int(labels[-1][i]) + first) * width)
+            row["count"] = int(counts[cell])
+            row["value"] = float(result[i])
+            rows.append(row)
+        return rows, scanned
+
+
+def _duration_bucket(seconds):
+    scaled = np.log2(np.maximum(seconds, 1.0)) * PERCENTILE_BUCKETS_PER_DOUBLING
+    return np.minimum(scaled.astype(np.int64), PERCENTILE_BUCKETS - 1)
+
+
+def _histogram_percentile(hist, counts, q):
+    """Upper edge of the bucket holding the ``q``-th percentile, per histogram row."""
+    rank = np.maximum(1, np.ceil(q / 100.0 * counts)).astype(np.int64)
+    bucket = (np.cumsum(hist, axis=1) < rank[:, None]).sum(axis=1)
+    return 2.0 ** ((bucket + 1) / PERCENTILE_BUCKETS_PER_DOUBLING)
+
+
+# --- Compaction job ---
+
+def compact(store, archive, older_than_hours=COMPACT_OLDER_THAN_HOURS, batch=COMPACT_BATCH):
+    """Move closed events older than ``older_than_hours`` from ``store`` into ``archive``."""
+    # Finish a run that wrote its segments but died before deleting the rows
+    recovered = store.delete_many(archive.pending_ids())
+    archive.commit()
+    cutoff = time.time() - older_than_hours * 3600
+    moved = 0
+    while True:
+        events = store.closed_events(CLOSED_STATUSES, cutoff, limit=batch)
+        if not events:
+            break
+        archive.append(events)
+        store.delete_many([e["eventId"] for e in events])
+        archive.commit()
+        moved += len(events)
+    return {"moved": moved, "recovered": recovered, **archive.stats()}
+
+
+def write_synthetic(archive, events, days=365, seed=7):
+    """Fill ``archive`` with ``events`` generated closed events (for benchmarks)."""
+    rng = np.random.default_rng(seed)
+    types = ["fire", "theft", "accident", "fight", "fall", "weapon"]
+    zones = [""] + [f"Zone {i:02d}" for i in range(1, 41)]
+    severities = ["", "low", "medium", "high"]
+    manifest = archive.manifest()
+    manifest = {**manifest, "segments": list(manifest["segments"]), "eventTypes": list(types),
+                "dictionaries": {"location": zones, "severity": severities}}
+    start = time.time() - days * 86400
+    per_partition = max(1, events // (days * len(types)))
+    for day in range(days):
+        day_start = start - start % 86400 + day * 86400
+        for event_type in types:
+            ts = np.sort(day_start + rng.random(per_partition) * 86400)
+            columns = {
+                "ts": ts,
+                "location": rng.integers(1, len(zones), per_partition),
+                "severity": rng.integers(1, len(severities), per_partition),
+                "confidence": rng.uniform(0.5, 1.0, per_partition),
+                "ackSeconds": rng.lognormal(4.0, 1.0, per_partition),
+                "resolveSeconds": rng.lognormal(7.0, 1.0, per_partition),
+            }
+            ids = np.char.add(f"evt_{event_type}_{day}_".encode(), np.arange(per_partition).astype("S8"))
+            archive._write_segment(manifest, _day(day_start), event_type, columns, ids)
+    archive._save_manifest(manifest)
+    return per_partition * days * len(types)
+
+
+def _timed(archive, label, **query):
+    started = time.perf_counter()
+    rows, scanned = archive.aggregate(**query)
+    print(f"{label:<38} {(time.perf_counter() - started) * 1000:8.1f} ms  {scanned:>10} rows  {len(rows):>6} groups")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["compact", "query", "bench"])
+    parser.add_argument("--root", default=str(ARCHIVE_DIR), help="archive directory")
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite database path (compact)")
+    parser.add_argument("--older-than-hours", type=float, default=COMPACT_OLDER_THAN_HOURS)
+    parser.add_argument("--every", type=float, default=0, help="repeat compaction every N seconds")
+    parser.add_argument("--group-by", default="eventType")
+    parser.add_argument("--bucket", choices=list(BUCKETS))
+    parser.add_argument("--agg", default="count")
+    parser.add_argument("--value")
+    parser.add_argument("--event-type")
+    parser.add_argument("--events", type=int, default=10_000_000, help="synthetic events (bench)")
+    args = parser.parse_args()
+    archive = Archive(args.root)
+
+    if args.command == "compact":
+        store = EventStore(args.db)
+        while True:
+            print(f"🗜️ {compact(store, archive, args.older_than_hours)}")
+            if not args.every:
+                break
+            time.sleep(args.every)
+    elif args.command == "query":
+        group_by = [c for c in args.group_by.split(",") if c]
+        for row in _timed(archive, "query", group_by=group_by, bucket=args.bucket, agg=args.agg,
+                          value=args.value, eventType=args.event_type):
+            print(row)
+    else:
+        if not archive.manifest()["segments"]:
+            print(f"Writing {write_synthetic(archive, args.events)} synthetic events to {args.root}")
+        month = time.time() - 30 * 86400
+        _timed(archive, "count by type", group_by=["eventType"])
+        _timed(archive, "count by type (warm)", group_by=["eventType"])
+        _timed(archive, "fires per zone per week", group_by=["location"], bucket="week", eventType="fire")
+        _timed(archive, "p95 time to resolved by type", group_by=["eventType"], agg="p95", value="resolveSeconds")
+        _timed(archive, "mean ack by zone, high severity", group_by=["location"], agg="mean", value="ackSeconds",
+               severity="high")
+        _timed(archive, "last 30 days, per type per day", group_by=["eventType"], bucket="day", since=month)
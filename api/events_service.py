@@ -0,0 +1,180 @@
+"""Local async events API backed by the embedded SQLite store.
+
+Serves the endpoints the dashboard and alert pages use, from ``data/events.db``:
+
+    GET  /api/events             list/paginate (limit, offset, sort, since, afterId,
+                                 until, eventType, status, severity, location;
+                                 orderBy=seq with afterSeq follows writes in order)
+    GET  /api/events?ids=a,b,c   batched lookup (optional fields=timeline,media)
+    POST /api/events/lookup      batched lookup: {"ids": [...], "fields": [...]}
+    GET  /api/events/{eventId}   one event
+    POST /api/events             store one event (also POST /api/event)
+    POST /api/events/bulk        store many: {"events": [...]}
+    POST /api/events/actions     operator actions: {"actions": [{"actionId", "eventId",
+                                 "action": acknowledge|escalate|resolve|note, "note", "at", "operator"}]}
+    GET  /api/analytics          aggregates over archived (closed) events, see archive.py:
+                                 groupBy=eventType,location,severity bucket=hour|day|week
+                                 agg=count|mean|p95 value=ackSeconds|resolveSeconds|confidence
+                                 eventType, location, severity, since, until
+    GET  /media/{file}           cached thumbnails written by UI/utils/media_cache.py, for
+                                 deployments that point WATCHTOWER_MEDIA_URL here
+
+    python api/events_service.py --port 8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from archive import Archive
+from store import DB_PATH, DEFAULT_LIMIT, FILTER_COLUMNS, EventStore, to_epoch
+
+MEDIA_DIR = Path(os.environ.get("WATCHTOWER_MEDIA_DIR", Path(__file__).resolve().parents[1] / "UI" / "static" / "media"))
+
+# Most ids accepted by one batched lookup
+MAX_LOOKUP_IDS = 5000
+
+
+def _bad_request(message):
+    return web.json_response({"error": message}, status=400)
+
+
+async def _json_object(request):
+    """Request body as a JSON object, or None if it is malformed or not an object."""
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+class EventsService:
+    def __init__(self, store, archive):
+        self.store = store
+        self.archive = archive
+
+    async def list_events(self, request):
+        q = request.query
+        if "ids" in q:
+            ids = [i for i in q["ids"].split(",") if i]
+            fields = [f for f in q.get("fields", "").split(",") if f]
+            return await self._lookup(ids, fields)
+        filters = {key: q.get(key) for key in FILTER_COLUMNS}
+        try:
+            events = await asyncio.to_thread(
+                self.store.query, limit=int(q.get("limit", DEFAULT_LIMIT)),
+                offset=int(q.get("offset", 0)), sort=q.get("sort", "desc"),
+                since=q.get("since"), after_id=q.get("afterId"), until=q.get("until"),
+                order_by=q.get("orderBy", "timestamp"), after_seq=q.get("afterSeq"), **filters)
+        except ValueError as e:
+            return _bad_request(str(e))
+        return web.json_response(events)
+
+    async def lookup_events(self, request):
+        body = await _json_object(request) or {}
+        ids, fields = body.get("ids"), body.get("fields")
+        if not isinstance(ids, list):
+            return _bad_request("An array of ids is required.")
+        return await self._lookup(ids, fields)
+
+    async def _lookup(self, ids, fields=None):
+        if len(ids) > MAX_LOOKUP_IDS:
+            return _bad_request(f"At most {MAX_LOOKUP_IDS} ids per lookup.")
+        events = await asyncio.to_thread(self.store.get_many, ids, fields)
+        return web.json_response(events)
+
+    async def get_event(self, request):
+        evt = await asyncio.to_thread(self.store.get, request.match_info["event_id"])
+        if evt is None:
+            return web.json_response({"error": "Event not found"}, status=404)
+        return web.json_response(evt)
+
+    async def create_event(self, request):
+        evt = await _json_object(request)
+        if evt is None:
+            return _bad_request("Event must be a JSON object.")
+        try:
+            stored = await asyncio.to_thread(self.store.put, evt)
+        except ValueError as e:
+            return _bad_request(str(e))
+        return web.json_response(stored, status=201)
+
+    async def create_events_bulk(self, request):
+        events = (await _json_object(request) or {}).get("events")
+        if not isinstance(events, list):
+            return _bad_request("An array of events is required.")
+        try:
+            stored = await asyncio.to_thread(self.store.put_many, events)
+        except ValueError as e:
+            return _bad_request(str(e))
+        return web.json_response({"stored": len(stored), "eventIds": [e["eventId"] for e in stored]},
+                                 status=201)
+
+    async def apply_actions(self, request):
+        actions = (await _json_object(request) or {}).get("actions")
+        if not isinstance(actions, list):
+            return _bad_request("An array of actions is required.")
+        try:
+            results = await asyncio.to_thread(self.store.apply_actions, actions)
+        except ValueError as e:
+            return _bad_request(str(e))
+        return web.json_response({"results": results})
+
+    async def analytics(self, request):
+        q = request.query
+        query = {
+            "group_by": [c for c in q.get("groupBy", "eventType").split(",") if c],
+            "bucket": q.get("bucket"),
+            "agg": q.get("agg", "count"),
+            "value": q.get("value"),
+            **{key: q.get(key) for key in ("eventType", "location", "severity")},
+        }
+        started = time.perf_counter()
+        try:
+            for key in ("since", "until"):
+                query[key] = to_epoch(q[key]) if q.get(key) else None
+            rows, scanned = await asyncio.to_thread(self.archive.aggregate, **query)
+        except ValueError as e:
+            return _bad_request(str(e))
+        except OSError as e:
+            return web.json_response({"error": f"Archive unavailable: {e}"}, status=503)
+        return web.json_response({"rows": rows, "scanned": scanned,
+                                  "elapsedMs": round((time.perf_counter() - started) * 1000, 1)})
+
+
+async def _cache_media(request, response):
+    if request.path.startswith("/media/") and response.status == 200:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+
+
+def make_app(db_path=DB_PATH, archive_dir=None):
+    service = EventsService(EventStore(db_path), Archive(archive_dir or Path(db_path).parent / "archive"))
+    app = web.Application(client_max_size=32 * 1024 ** 2)
+    app.router.add_get("/api/events", service.list_events)
+    app.router.add_post("/api/events", service.create_event)
+    app.router.add_post("/api/event", service.create_event)
+    app.router.add_post("/api/events/bulk", service.create_events_bulk)
+    app.router.add_post("/api/events/lookup", service.lookup_events)
+    app.router.add_post("/api/events/actions", service.apply_actions)
+    app.router.add_get("/api/events/{event_id}", service.get_event)
+    app.router.add_get("/api/analytics", service.analytics)
+    # Thumbnails are content-addressed, so browsers can cache them indefinitely
+    MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+    app.router.add_static("/media", MEDIA_DIR, append_version=False)
+    app.on_response_prepare.append(_cache_media)
+    app["service"] = service
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite database path")
+    parser.add_argument("--archive", help="archive directory (default: archive/ next to the database)")
+    args = parser.parse_args()
+    print(f"🗄️ Events API at http://localhost:{args.port}/api/events ({args.db})")
+    web.run_app(make_app(args.db, args.archive), port=args.port)
@@ -0,0 +1,324 @@
+"""Embedded SQLite (WAL) storage for alert events.
+
+Each event is stored as its JSON document plus the columns we filter and
+sort on, which are indexed: eventId (primary key), eventType, timestamp and
+status. WAL mode lets the dashboard read while the detectors write.
+
+Every write (a new event or a saved operator action) also gives the event the
+next value of a store-wide sequence, returned as ``seq``. Readers that page
+by ``seq`` see events in the order they were stored, so an alert with an old
+timestamp that arrives late is not skipped, and they also see status changes.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+DB_PATH = Path(__file__).resolve().parents[1] / "data" / "events.db"
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+# Ids per batched lookup statement, under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id   TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    ts         TEXT NOT NULL,
+    ts_epoch   REAL NOT NULL,
+    status     TEXT,
+    severity   TEXT,
+    location   TEXT,
+    doc        TEXT NOT NULL,
+    seq        INTEGER
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts_epoch, event_id);
+CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events (event_type, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_status_ts ON events (status, ts_epoch);
+"""
+
+# Operator action -> the status it moves an event to
+ACTION_STATUS = {"acknowledge": "acknowledged", "escalate": "escalated", "resolve": "resolved"}
+ACTIONS = (*ACTION_STATUS, "note")
+# Statuses only move forward; anything unlisted (pending, dispatched, ...) ranks 0
+STATUS_RANK = {"acknowledged": 1, "escalated": 2, "resolved": 3}
+# Action ids remembered per event so retried flushes are not applied twice
+ACTION_ID_HISTORY = 32
+# Fields operator actions own; re-posting an event (a publisher retry) keeps the stored ones
+OPERATOR_FIELDS = ("status", "notes", "notesUpdatedAt", "timeline", "actionIds", "version", "updatedAt",
+                   *(f"{status}At" for status in STATUS_RANK))
+
+# Column list of one stored row, see _row
+INSERT_EVENTS = ("INSERT OR REPLACE INTO events (event_id, event_type, ts, ts_epoch, status, severity, "
+                 "location, doc, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+# Orders GET /api/events can page in
+ORDER_COLUMNS = {"timestamp": "ts_epoch {0}, event_id {0}", "seq": "seq {0}"}
+
+# Query parameter -> indexed column
+FILTER_COLUMNS = {
+    "eventType": "event_type",
+    "status": "status",
+    "severity": "severity",
+    "location": "location",
+}
+
+
+def to_epoch(value):
+    """ISO-8601 timestamp (``Z`` allowed, naive means UTC) to epoch seconds."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def normalize_event(evt):
+    """Fill in the fields every stored event must have."""
+    evt = dict(evt)
+    evt.pop("seq", None)  # assigned by the store
+    evt.setdefault("eventId", f"evt_{uuid.uuid4().hex[:12]}")
+    evt.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+    evt.setdefault("status", "pending")
+    if not evt.get("eventType"):
+        evt["eventType"] = evt.get("type") or "unknown"
+    return evt
+
+
+def _apply_action(evt, action, now):
+    """Apply one operator action to ``evt`` in place; returns "applied" or "conflict".
+
+    Concurrent operators are reconciled without locks: a status change only
+    applies if it moves the event forward (so "resolve" beats a late
+    "acknowledge"), and a note only applies if it is newer than the saved one.
+    """
+    action_id = action.get("actionId")
+    seen = evt.get("actionIds", [])
+    if action_id and action_id in seen:
+        return "applied"  # a retry of a flush that already landed
+    kind, at = action["action"], action.get("at") or now
+    if kind == "note":
+        if (evt.get("notesUpdatedAt") or "") > at:
+            return "conflict"
+        evt["notes"] = action.get("note") or ""
+        evt["notesUpdatedAt"] = at
+        entry = "Note updated"
+    else:
+        target = ACTION_STATUS[kind]
+        if STATUS_RANK.get(evt.get("status"), 0) >= STATUS_RANK[target]:
+            return "conflict"
+        evt["status"] = target
+        evt[f"{target}At"] = at
+        entry = target.capitalize()
+    timeline = evt.get("timeline") or [{"time": evt["timestamp"], "event": "Alert created"}]
+    operator = action.get("operator")
+    evt["timeline"] = [*timeline, {"time": at, "event": f"{entry} by {operator}" if operator else entry}]
+    if action_id:
+        evt["actionIds"] = [*seen, action_id][-ACTION_ID_HISTORY:]
+    evt["version"] = evt.get("version", 0) + 1
+    evt["updatedAt"] = now
+    return "applied"
+
+
+def _row(evt, seq):
+    doc = {k: v for k, v in evt.items() if k != "seq"}
+    return (evt["eventId"], evt["eventType"], evt["timestamp"], to_epoch(evt["timestamp"]),
+            evt.get("status"), evt.get("severity"), evt.get("location"), json.dumps(doc), seq)
+
+
+def _doc(seq, doc):
+    evt = json.loads(doc)
+    evt["seq"] = seq
+    return evt
+
+
+class EventStore:
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        conn.commit()
+
+    def _migrate(self, conn):
+        # Databases created before events carried a sequence get one in rowid order
+        if "seq" not in {row[1] for row in conn.execute("PRAGMA table_info(events)")}:
+            conn.execute("ALTER TABLE events ADD COLUMN seq INTEGER")
+            conn.execute("UPDATE events SET seq = rowid")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_seq ON events (seq)")
+        conn.execute("INSERT OR IGNORE INTO counters VALUES ('events', (SELECT COALESCE(MAX(seq), 0) FROM events))")
+
+    def _conn(self):
+        # One connection per thread; the service runs queries in a thread pool
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- Writes ---
+
+    def _write(self, conn, events):
+        """Store ``events`` inside the caller's transaction, each under the next sequence value."""
+        last = conn.execute("UPDATE counters SET value = value + ? WHERE name = 'events' RETURNING value",
+                            (len(events),)).fetchone()[0]
+        first = last - len(events) + 1
+        conn.executemany(INSERT_EVENTS, [_row(e, first + i) for i, e in enumerate(events)])
+
+    def put(self, evt):
+        return self.put_many([evt])[0]
+
+    def put_many(self, events):
+        """Insert or update events in one transaction; returns the stored documents.
+
+        An eventId that is already stored keeps its operator fields (status,
+        notes, timeline, ...), so a re-posted alert never undoes an operator's
+        actions; one that changes nothing is not written again.
+        """
+        events = list({e["eventId"]: e for e in map(normalize_event, events)}.values())
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                stored = {e["eventId"]: e for e in self.get_many([e["eventId"] for e in events])}
+                changed = []
+                for i, evt in enumerate(events):
+                    old = stored.get(evt["eventId"])
+                    if old is None:
+                        changed.append(evt)
+                        continue
+                    evt = events[i] = {**evt, **{k: old[k] for k in OPERATOR_FIELDS if k in old}}
+                    if evt != {k: v for k, v in old.items() if k != "seq"}:
+                        changed.append(evt)
+                if changed:
+                    self._write(conn, changed)
+        return events
+
+    def apply_actions(self, actions):
+        """Apply operator actions in order, in one transaction.
+
+        Returns one ``{actionId, eventId, result, previousStatus, event}`` per
+        action, where result is "applied", "conflict" (``event`` then shows
+        what the other operator saved) or "not_found".
+        """
+        for action in actions:
+            if action.get("action") not in ACTIONS or not action.get("eventId"):
+                raise ValueError(f"Each action needs an eventId and one of {', '.join(ACTIONS)}.")
+        now = datetime.now(timezone.utc).isoformat()
+        results, changed = [], {}
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                docs = {e["eventId"]: e for e in self.get_many([a["eventId"] for a in actions])}
+                for action in actions:
+                    evt = docs.get(action["eventId"])
+                    result = {"actionId": action.get("actionId"), "eventId": action["eventId"]}
+                    if evt is None:
+                        results.append({**result, "result": "not_found"})
+                        continue
+                    previous = evt.get("status")
+                    outcome = _apply_action(evt, action, now)
+                    if outcome == "applied":
+                        changed[evt["eventId"]] = evt
+                    results.append({**result, "result": outcome, "previousStatus": previous, "event": evt})
+                if changed:
+                    self._write(conn, list(changed.values()))
+        return results
+
+    # --- Reads ---
+
+    def get(self, event_id):
+        row = self._conn().execute("SELECT seq, doc FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        return _doc(*row) if row else None
+
+    def get_many(self, ids, fields=None):
+        """Events for ``ids`` in request order, skipping unknown ids.
+
+        ``fields`` optionally projects each document to those keys (eventId is
+        always kept), e.g. ``["timeline", "media"]`` to hydrate detail views.
+        """
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        conn = self._conn()
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[start:start + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for event_id, seq, doc in conn.execute(
+                    f"SELECT event_id, seq, doc FROM events WHERE event_id IN ({placeholders})", chunk):
+                found[event_id] = _doc(seq, doc)
+        events = [found[i] for i in ids if i in found]
+        if fields:
+            keep = set(fields) | {"eventId"}
+            events = [{k: v for k, v in e.items() if k in keep} for e in events]
+        return events
+
+    def query(self, limit=DEFAULT_LIMIT, offset=0, sort="desc", since=None, after_id=None,
+              until=None, order_by="timestamp", after_seq=None, **filters):
+        """Page through events in (timestamp, eventId) or ``seq`` order.
+
+        ``since``/``after_id`` form an exclusive cursor: pass the timestamp and
+        eventId of the last event seen to get the events after it (with
+        ``sort="asc"``) without re-reading anything older. ``after_seq`` with
+        ``order_by="seq"`` is the cursor to follow the store as it is written:
+        it returns new events whatever their timestamp, and updated ones again.
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"orderBy must be one of {', '.join(ORDER_COLUMNS)}.")
+        where, params = [], []
+        for key, value in filters.items():
+            if value is not None and value != "all":
+                where.append(f"{FILTER_COLUMNS[key]} = ?")
+                params.append(value)
+        if since is not None:
+            since_epoch = to_epoch(since)
+            if after_id:
+                where.append("(ts_epoch > ? OR (ts_epoch = ? AND event_id > ?))")
+                params.extend([since_epoch, since_epoch, after_id])
+            else:
+                where.append("ts_epoch > ?")
+                params.append(since_epoch)
+        if until is not None:
+            where.append("ts_epoch <= ?")
+            params.append(to_epoch(until))
+        if after_seq is not None:
+            where.append("seq > ?")
+            params.append(int(after_seq))
+        direction = "ASC" if sort == "asc" else "DESC"
+        sql = "SELECT seq, doc FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {ORDER_COLUMNS[order_by].format(direction)} LIMIT ? OFFSET ?"
+        params.extend([max(1, min(int(limit), MAX_LIMIT)), max(0, int(offset))])
+        return [_doc(seq, doc) for seq, doc in self._conn().execute(sql, params)]
+
+    def closed_events(self, statuses, until_epoch, limit=MAX_LIMIT):
+        """Oldest events in one of ``statuses`` with a timestamp at or before ``until_epoch``."""
+        placeholders = ",".join("?" * len(statuses))
+        sql = (f"SELECT doc FROM events WHERE status IN ({placeholders}) AND ts_epoch <= ? "
+               "ORDER BY ts_epoch, event_id LIMIT ?")
+        return [json.loads(doc) for (doc,) in self._conn().execute(sql, [*statuses, until_epoch, limit])]
+
+    def delete_many(self, ids):
+        """Remove events by id in one transaction; returns how many were removed."""
+        ids = list(dict.fromkeys(ids))
+        removed = 0
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                for start in range(0, len(ids), LOOKUP_CHUNK):
+                    chunk = ids[start:start + LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    removed += conn.execute(f"DELETE FROM events WHERE event_id IN ({placeholders})", chunk).rowcount
+        return removed
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM events").fetchone()[0]
@@ -0,0 +1,80 @@
+import pytest
+
+from archive import Archive, compact
+from store import EventStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EventStore(tmp_path / "events.db")
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return Archive(tmp_path / "archive")
+
+
+def closed(event_id, timestamp, event_type="fire", resolve_after="10:30", **fields):
+    day = timestamp[:10]
+    return {"eventId": event_id, "eventType": event_type, "timestamp": timestamp, "status": "resolved",
+            "resolvedAt": f"{day}T{resolve_after}:00Z", **fields}
+
+
+def segment_files(archive):
+    return sorted(p.relative_to(archive.root).as_posix() for p in archive.root.rglob("*.col"))
+
+
+def test_compaction_moves_only_old_closed_events(store, archive):
+    store.put_many([
+        closed("old", "2024-01-02T10:00:00Z"),
+        {"eventId": "open", "eventType": "fire", "timestamp": "2024-01-02T11:00:00Z", "status": "acknowledged"},
+        closed("recent", "2099-01-01T10:00:00Z"),
+    ])
+    result = compact(store, archive, older_than_hours=24)
+    assert (result["moved"], result["rows"]) == (1, 1)
+    assert store.get("old") is None
+    assert store.get("open") and store.get("recent")
+
+
+def test_later_runs_merge_into_one_segment_per_partition(store, archive):
+    store.put_many([closed("b", "2024-01-02T12:00:00Z"), closed("t", "2024-01-02T09:00:00Z", "theft")])
+    compact(store, archive)
+    store.put_many([closed("a", "2024-01-02T08:00:00Z"), closed("c", "2024-01-03T08:00:00Z")])
+    compact(store, archive)
+    assert [f.split("/seg-")[0] for f in segment_files(archive)] == [
+        "day=2024-01-02/type=fire", "day=2024-01-02/type=theft", "day=2024-01-03/type=fire"]
+    [(_, data)] = archive.scan(["eventId", "ts"], eventType="fire", until=1704240000)  # up to 2024-01-03
+    assert [i.decode() for i in data["eventId"]] == ["a", "b"]
+    assert list(data["ts"]) == sorted(data["ts"])
+    assert archive.stats()["rows"] == 4
+    assert archive.manifest()["pending"] == []
+
+
+def test_interrupted_run_is_finished_without_double_counting(store, archive):
+    events = [closed("x", "2024-01-02T10:00:00Z"), closed("y", "2024-01-02T11:00:00Z")]
+    store.put_many(events)
+    archive.append(store.closed_events(("resolved",), 2e9))  # then the job died before deleting
+    result = compact(store, archive)
+    assert (result["recovered"], result["moved"], result["rows"]) == (2, 0, 2)
+    assert store.count() == 0
+
+
+def test_aggregate_groups_filters_and_percentiles(store, archive):
+    store.put_many([
+        closed("f1", "2024-01-02T10:00:00Z", location="Gate", severity="high", resolve_after="10:10"),
+        closed("f2", "2024-01-02T11:00:00Z", location="Dock", severity="low", resolve_after="11:20"),
+        closed("t1", "2024-01-09T10:00:00Z", "theft", location="Gate", resolve_after="11:00"),
+    ])
+    compact(store, archive)
+    rows, scanned = archive.aggregate(["eventType"])
+    assert {r["eventType"]: r["count"] for r in rows} == {"fire": 2, "theft": 1}
+    assert scanned == 3
+    rows, _ = archive.aggregate(["location"], eventType="fire", location=["Gate"])
+    assert [(r["location"], r["count"]) for r in rows] == [("Gate", 1)]
+    rows, scanned = archive.aggregate([], bucket="week", since=1704672000)  # after 2024-01-08
+    assert [(r["week"][:10], r["count"]) for r in rows] == [("2024-01-08", 1)]
+    assert scanned == 1
+    [row] = archive.aggregate(["eventType"], agg="p95", value="resolveSeconds", eventType="fire")[0]
+    assert row["value"] == pytest.approx(1200, rel=0.03)
+    with pytest.raises(ValueError):
+        archive.aggregate(["status"])
@@ -0,0 +1,103 @@
+import pytest
+
+from store import EventStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EventStore(tmp_path / "events.db")
+
+
+def event(event_id, timestamp="2026-10-18T10:00:00Z", **fields):
+    return {"eventId": event_id, "eventType": "fire", "timestamp": timestamp, **fields}
+
+
+def ids(events):
+    return [e["eventId"] for e in events]
+
+
+def test_seq_follows_write_order_not_timestamps(store):
+    store.put(event("new", "2026-10-18T12:00:00Z"))
+    store.put(event("late", "2026-10-18T09:00:00Z"))
+    assert ids(store.query(order_by="seq", sort="asc")) == ["new", "late"]
+    assert ids(store.query()) == ["new", "late"]  # timestamp order, newest first
+    first = store.get("new")["seq"]
+    assert ids(store.query(order_by="seq", sort="asc", after_seq=first)) == ["late"]
+
+
+def test_saved_action_moves_the_event_past_the_cursor(store):
+    store.put_many([event("a"), event("b")])
+    cursor = max(e["seq"] for e in store.query(order_by="seq"))
+    store.apply_actions([{"eventId": "a", "action": "acknowledge"}])
+    changed = store.query(order_by="seq", sort="asc", after_seq=cursor)
+    assert ids(changed) == ["a"]
+    assert changed[0]["status"] == "acknowledged"
+
+
+def test_unknown_order_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.query(order_by="severity")
+
+
+def test_reposted_alert_keeps_operator_fields(store):
+    store.put(event("a", severity="high"))
+    store.apply_actions([{"eventId": "a", "action": "acknowledge", "operator": "Operator"}])
+    store.apply_actions([{"eventId": "a", "action": "note", "note": "crew on site"}])
+    store.put(event("a", severity="medium", status="pending", notes="from detector"))
+    saved = store.get("a")
+    assert saved["severity"] == "medium"
+    assert (saved["status"], saved["notes"], saved["version"]) == ("acknowledged", "crew on site", 2)
+    assert saved["acknowledgedAt"]
+    assert [t["event"] for t in saved["timeline"]] == ["Alert created", "Acknowledged by Operator", "Note updated"]
+
+
+def test_unchanged_repost_is_not_written_again(store):
+    store.put(event("a"))
+    seq = store.get("a")["seq"]
+    store.put(event("a"))
+    assert store.get("a")["seq"] == seq
+    store.put(event("a", location="Gate"))
+    assert store.get("a")["seq"] > seq
+
+
+def test_duplicate_ids_in_one_batch_are_stored_once(store):
+    stored = store.put_many([event("a", severity="low"), event("a", severity="high")])
+    assert [e["severity"] for e in stored] == ["high"]
+    assert store.count() == 1
+
+
+def act(event_id, action, **fields):
+    return {"eventId": event_id, "action": action, **fields}
+
+
+def test_status_only_moves_forward(store):
+    store.put(event("a"))
+    first, second = store.apply_actions([act("a", "resolve"), act("a", "acknowledge")])
+    assert (first["result"], first["previousStatus"]) == ("applied", "pending")
+    assert (second["result"], second["event"]["status"]) == ("conflict", "resolved")
+    assert store.get("a")["status"] == "resolved"
+
+
+def test_older_note_loses_to_a_newer_one(store):
+    store.put(event("a"))
+    store.apply_actions([act("a", "note", note="newer", at="2026-10-18T10:05:00Z")])
+    [result] = store.apply_actions([act("a", "note", note="older", at="2026-10-18T10:01:00Z")])
+    assert result["result"] == "conflict"
+    assert store.get("a")["notes"] == "newer"
+
+
+def test_retried_action_is_applied_once(store):
+    store.put(event("a"))
+    action = act("a", "escalate", actionId="act-1")
+    store.apply_actions([action])
+    [result] = store.apply_actions([action])
+    assert result["result"] == "applied"
+    saved = store.get("a")
+    assert saved["version"] == 1
+    assert len(saved["timeline"]) == 2
+
+
+def test_unknown_event_and_invalid_action(store):
+    assert store.apply_actions([act("missing", "resolve")])[0]["result"] == "not_found"
+    with pytest.raises(ValueError):
+        store.apply_actions([act("a", "delete")])
@@ -0,0 +1,429 @@
+"""Token-sharded, rate-limited notification fan-out.
+
+Owns a registry of staff device tokens (FCM) and phone numbers (SMS) in
+``data/tokens.db``. Each alert is rendered once per channel, the channel's
+recipients are split into provider-sized chunks, and the chunks are sent
+concurrently, each attempt (retries included) first taking its recipients'
+worth of tokens from that channel's token bucket. Recipients the provider
+reports as invalid or unregistered are pruned from the registry.
+
+Providers are reached over HTTP with a small JSON contract modelled on
+``sendEachForMulticast``; ``--fake`` mounts a local sink speaking it:
+
+    POST {FCM_URL} {"tokens": [...], "notification": {...}} -> {"responses": [{"success", "error"}]}
+    POST {SMS_URL} {"to": [...], "body": "..."}              -> {"results": [{"to", "status", "code"}]}
+
+Service routes (``/notify`` and ``/notify/batch`` accept what AlertPublisher sends):
+
+    POST /tokens          {"tokens": [{"token", "channel", "site", "staffId"}]}
+    POST /tokens/remove   {"tokens": ["..."]}
+    POST /dispatch        one alert, optionally {"channels": [...], "site": "..."}
+    POST /notify          same as /dispatch
+    POST /notify/batch    {"alerts": [...]}
+    GET  /stats
+
+    python dispatcher.py --port 5050 --fake --seed-tokens 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+TOKENS_DB = Path(__file__).resolve().parents[3] / "data" / "tokens.db"
+
+FCM_URL = os.environ.get("WATCHTOWER_FCM_URL", "http://localhost:5050/fake/fcm")
+SMS_URL = os.environ.get("WATCHTOWER_SMS_URL", "http://localhost:5050/fake/sms")
+
+# chunk: recipients per provider request; rate/burst: recipients per second
+CHANNELS = {
+    "fcm": {"url": FCM_URL, "chunk": 500, "rate": 20000.0, "burst": 5000, "concurrency": 16},
+    "sms": {"url": SMS_URL, "chunk": 10, "rate": 30.0, "burst": 30, "concurrency": 4},
+}
+
+# Provider error codes that mean the recipient will never succeed
+INVALID_CODES = {
+    "messaging/registration-token-not-registered",
+    "messaging/invalid-registration-token",
+    21211,  # invalid 'To' phone number
+    21610,  # recipient unsubscribed
+    21614,  # not a mobile number
+}
+
+SEND_RETRIES = 2
+REQUEST_TIMEOUT = 5.0
+
+# Same copy as alertCampaigns in routes/notify.js
+ALERT_CAMPAIGNS = {
+    "fire": ("🔥 Fire Alert", "A fire has been detected. Please evacuate immediately."),
+    "fall": ("🚨 Fall Detected", "A person has fallen. Immediate medical attention may be needed."),
+    "fight": ("⚠️ Conflict Detected", "Aggressive behavior detected. Please investigate."),
+    "weapon": ("🔫 Weapon Threat", "Suspicious object or weapon detected."),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    token         TEXT PRIMARY KEY,
+    channel       TEXT NOT NULL,
+    site          TEXT,
+    staff_id      TEXT,
+    registered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tokens_channel_site ON tokens (channel, site);
+"""
+
+
+class TokenRegistry:
+    """Device tokens and phone numbers by channel, in SQLite (WAL)."""
+
+    def __init__(self, path=TOKENS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def register(self, entries):
+        """Add or update recipients; returns how many were written."""
+        now = time.time()
+        rows = []
+        for e in entries:
+            channel = e.get("channel", "fcm")
+            if not e.get("token") or channel not in CHANNELS:
+                raise ValueError(f"Each entry needs a token and a channel in {sorted(CHANNELS)}.")
+            rows.append((e["token"], channel, e.get("site"), e.get("staffId"), now))
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def remove(self, tokens):
+        if not tokens:
+            return 0
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                cur = conn.executemany("DELETE FROM tokens WHERE token = ?", [(t,) for t in tokens])
+        return cur.rowcount
+
+    def recipients(self, channel, site=None):
+        sql, params = "SELECT token FROM tokens WHERE channel = ?", [channel]
+        if site:
+            sql += " AND site = ?"
+            params.append(site)
+        return [t for (t,) in self._conn().execute(sql, params)]
+
+    def counts(self):
+        return dict(self._conn().execute("SELECT channel, COUNT(*) FROM tokens GROUP BY channel").fetchall())
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0  # total seconds callers spent throttled
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, n=1):
+        n = min(n, self.burst)
+        async with self._lock:
+            self._refill()
+            while self.tokens < n:
+                wait = (n - self.tokens) / self.rate
+                self.waited += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= n
+
+
+class ChannelStats:
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.pruned = 0
+        self.chunks = 0
+        self.retries = 0
+
+
+def render(alert, channel):
+    """Provider request body for ``alert`` on ``channel``, minus the recipients."""
+    alert_type = alert.get("type") or "incident"
+    if channel == "sms":
+        location = alert.get("location") or "an unknown location"
+        return {"body": f"🚨 {alert_type.upper()} detected at {location}. Immediate attention required!"}
+    title, body = ALERT_CAMPAIGNS.get(alert_type, ("⚠️ Incident Alert", "Suspicious activity detected."))
+    title = alert.get("overrideTitle") or title
+    body = alert.get("overrideBody") or f"{body} ({alert.get('reason') or 'unspecified'})"
+    return {"notification": {"title": title, "body": body}}
+
+
+def parse_outcomes(channel, chunk, data):
+    """(sent, invalid recipients, failed) from a provider response."""
+    sent, invalid, failed = 0, [], 0
+    if channel == "sms":
+        outcomes = [(r.get("status") != "failed", r.get("code")) for r in data.get("results", [])]
+    else:
+        outcomes = [(r.get("success"), (r.get("error") or {}).get("code")) for r in data.get("responses", [])]
+    for recipient, (ok, code) in zip(chunk, outcomes):
+        if ok:
+            sent += 1
+        elif code in INVALID_CODES:
+            invalid.append(recipient)
+        else:
+            failed += 1
+    return sent, invalid, failed + max(0, len(chunk) - len(outcomes))
+
+
+class Dispatcher:
+    def __init__(self, registry, channels=CHANNELS, timeout=REQUEST_TIMEOUT):
+        self.registry = registry
+        self.channels = channels
+        self.timeout = timeout
+        self.buckets = {name: TokenBucket(cfg["rate"], cfg["burst"]) for name, cfg in channels.items()}
+        self.stats_by_channel = {name: ChannelStats() for name in channels}
+        self.dispatches = 0
+        self.last_elapsed = 0.0
+        self._semaphores = {}
+        self._session = None
+
+    async def start(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=sum(c["concurrency"] for c in self.channels.values()))
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphores = {name: asyncio.Semaphore(cfg["concurrency"])
+                                for name, cfg in self.channels.items()}
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def dispatch(self, alert, channels=None, site=None):
+        """Fan ``alert`` out to every registered recipient; returns a delivery summary."""
+        await self.start()
+        t0 = time.perf_counter()
+        channels = [c for c in (channels or self.channels) if c in self.channels]
+        # Channels go out in parallel so a throttled SMS run never holds back push
+        results = await asyncio.gather(*(self._fan_out(alert, channel, site) for channel in channels))
+        self.dispatches += 1
+        self.last_elapsed = time.perf_counter() - t0
+        return {"channels": dict(zip(channels, results)), "elapsed_ms": round(1000 * self.last_elapsed, 1)}
+
+    async def _fan_out(self, alert, channel, site):
+        if channel == "fcm" and alert.get("tokens"):
+            recipients = list(dict.fromkeys(alert["tokens"]))
+        else:
+            recipients = await asyncio.to_thread(self.registry.recipients, channel, site)
+        message = render(alert, channel)
+        size = self.channels[channel]["chunk"]
+        chunks = [recipients[i:i + size] for i in range(0, len(recipients), size)]
+        results = await asyncio.gather(*(self._send_chunk(channel, chunk, message) for chunk in chunks))
+        sent = sum(r[0] for r in results)
+        invalid = [t for r in results for t in r[1]]
+        failed = sum(r[2] for r in results)
+        pruned = await asyncio.to_thread(self.registry.remove, invalid)
+        stats = self.stats_by_channel[channel]
+        stats.sent += sent
+        stats.failed += failed
+        stats.pruned += len(invalid)
+        return {"recipients": len(recipients), "chunks": len(chunks), "sent": sent,
+                "failed": failed, "invalid": len(invalid), "pruned": pruned}
+
+    async def _send_chunk(self, channel, chunk, message):
+        cfg, stats = self.channels[channel], self.stats_by_channel[channel]
+        key = "to" if channel == "sms" else "tokens"
+        async with self._semaphores[channel]:
+            stats.chunks += 1
+            for attempt in range(SEND_RETRIES + 1):
+                # Every attempt is a provider request, so retries pay for their recipients too
+                await self.buckets[channel].acquire(len(chunk))
+                try:
+                    async with self._session.post(cfg["url"], json={key: chunk, **message}) as resp:
+                        if resp.status < 400:
+                            return parse_outcomes(channel, chunk, await resp.json())
+                        if resp.status != 429 and resp.status < 500:
+                            # Rejected outright (bad request, credentials, ...): retrying cannot help
+                            print(f"❌ {channel} chunk rejected ({resp.status}): {await resp.text()}")
+                            return 0, [], len(chunk)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                if attempt < SEND_RETRIES:
+                    stats.retries += 1
+                    await asyncio.sleep(0.2 * 2 ** attempt * random.uniform(0.5, 1.5))
+        return 0, [], len(chunk)
+
+    def stats(self):
+        return {
+            "dispatches": self.dispatches,
+            "last_elapsed_ms": round(1000 * self.last_elapsed, 1),
+            "channels": {
+                name: {**vars(s), "throttled_s": round(self.buckets[name].waited, 3)}
+                for name, s in self.stats_by_channel.items()
+            },
+        }
+
+
+# --- HTTP service ---
+
+def _bad_request(message):
+    return web.json_response({"error": message}, status=400)
+
+
+async def _json_object(request):
+    """Request body as a JSON object, or None if it is malformed or not an object."""
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+class DispatcherService:
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    async def register(self, request):
+        entries = (await _json_object(request) or {}).get("tokens")
+        if not isinstance(entries, list):
+            return _bad_request("An array of tokens is required.")
+        try:
+            count = await asyncio.to_thread(self.dispatcher.registry.register, entries)
+        except ValueError as e:
+            return _bad_request(str(e))
+        return web.json_response({"registered": count}, status=201)
+
+    async def remove(self, request):
+        tokens = (await _json_object(request) or {}).get("tokens")
+        if not isinstance(tokens, list):
+            return _bad_request("An array of tokens is required.")
+        removed = await asyncio.to_thread(self.dispatcher.registry.remove, tokens)
+        return web.json_response({"removed": removed})
+
+    async def dispatch(self, request):
+        alert = await _json_object(request)
+        if alert is None:
+            return _bad_request("The alert must be a JSON object.")
+        summary = await self.dispatcher.dispatch(alert, alert.get("channels"), alert.get("site"))
+        return web.json_response({"success": True, **summary})
+
+    async def dispatch_batch(self, request):
+        alerts = (await _json_object(request) or {}).get("alerts")
+        if not isinstance(alerts, list) or not all(isinstance(a, dict) for a in alerts):
+            return _bad_request("An array of alerts is required.")
+        summaries = await asyncio.gather(*(self.dispatcher.dispatch(a, a.get("channels"), a.get("site"))
+                                           for a in alerts))
+        return web.json_response({"results": [{"status": 200, "success": True, **s} for s in summaries]})
+
+    async def stats(self, request):
+        counts = await asyncio.to_thread(self.dispatcher.registry.counts)
+        return web.json_response({"registered": counts, **self.dispatcher.stats()})
+
+
+# --- Fake providers ---
+
+def fake_sink_routes(app, invalid_rate=0.01, latency=0.02):
+    """Mount ``/fake/fcm`` and ``/fake/sms``; tokens starting with "invalid" always fail."""
+
+    def is_invalid(recipient):
+        return recipient.startswith("invalid") or random.random() < invalid_rate
+
+    async def fcm(request):
+        body = await _json_object(request)
+        if body is None:
+            return _bad_request("The message must be a JSON object.")
+        await asyncio.sleep(latency)
+        return web.json_response({"responses": [
+            {"success": False, "error": {"code": "messaging/registration-token-not-registered"}}
+            if is_invalid(t) else {"success": True, "messageId": uuid.uuid4().hex}
+            for t in body.get("tokens", [])
+        ]})
+
+    async def sms(request):
+        body = await _json_object(request)
+        if body is None:
+            return _bad_request("The message must be a JSON object.")
+        await asyncio.sleep(latency)
+        return web.json_response({"results": [
+            {"to": n, "status": "failed", "code": 21211} if is_invalid(n) else {"to": n, "status": "queued"}
+            for n in body.get("to", [])
+        ]})
+
+    app.router.add_post("/fake/fcm", fcm)
+    app.router.add_post("/fake/sms", sms)
+
+
+def make_app(db_path=TOKENS_DB, fake=False, invalid_rate=0.01, sink_latency=0.02):
+    dispatcher = Dispatcher(TokenRegistry(db_path))
+    service = DispatcherService(dispatcher)
+    app = web.Application(client_max_size=32 * 1024 ** 2)
+    app.router.add_post("/tokens", service.register)
+    app.router.add_post("/tokens/remove", service.remove)
+    app.router.add_post("/dispatch", service.dispatch)
+    app.router.add_post("/notify", service.dispatch)
+    app.router.add_post("/notify/batch", service.dispatch_batch)
+    app.router.add_get("/stats", service.stats)
+    if fake:
+        fake_sink_routes(app, invalid_rate, sink_latency)
+
+    async def close_dispatcher(app):
+        await dispatcher.close()
+
+    app.on_cleanup.append(close_dispatcher)
+    app["dispatcher"] = dispatcher
+    return app
+
+
+def seed_tokens(registry, count, sites=("HQ", "Warehouse", "Campus East")):
+    """Register ``count`` synthetic devices plus one phone number per 50 of them."""
+    entries = [{"token": f"fcm_{uuid.uuid4().hex}", "channel": "fcm", "site": random.choice(sites),
+                "staffId": f"staff_{i:05d}"} for i in range(count)]
+    entries += [{"token": f"+2547{random.randint(10000000, 99999999)}", "channel": "sms",
+                 "site": random.choice(sites), "staffId": f"staff_{i:05d}"} for i in range(count // 50)]
+    return registry.register(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--db", default=str(TOKENS_DB), help="token registry path")
+    parser.add_argument("--fake", action="store_true", help="serve the fake FCM/SMS sink on this port")
+    parser.add_argument("--invalid-rate", type=float, default=0.01, help="fake sink: share of recipients rejected")
+    parser.add_argument("--sink-latency-ms", type=float, default=20.0)
+    parser.add_argument("--seed-tokens", type=int, default=0, help="register this many synthetic devices first")
+    args = parser.parse_args()
+    app = make_app(args.db, args.fake, args.invalid_rate, args.sink_latency_ms / 1000)
+    if args.seed_tokens:
+        seeded = seed_tokens(app["dispatcher"].registry, args.seed_tokens)
+        print(f"🌱 Registered {seeded} synthetic recipients")
+    print(f"📣 Dispatcher at http://localhost:{args.port}/dispatch")
+    web.run_app(app, port=args.port)
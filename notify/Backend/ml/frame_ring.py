@@ -0,0 +1,167 @@
+"""Shared-memory frame rings between capture and inference processes.
+
+Each camera owns one ``multiprocessing.shared_memory`` block holding a small
+int64 index, a timestamp per slot and ``slots`` fixed-size frame slots. The
+capture side copies each decoded frame into a slot once; inference workers
+attach to the same block and read frames through NumPy views, so nothing
+crosses the process boundary except ``(slot, seq)`` pairs.
+
+Protocol (one producer per ring, any number of readers):
+
+- The lock guards only the index, never a frame copy.
+- ``write`` picks the oldest slot that is neither pinned nor the latest,
+  marks it as being written, copies the frame in, then publishes it as the
+  latest. Slots a reader never pinned are simply overwritten, which is how
+  stale frames are dropped when inference falls behind.
+- ``acquire`` pins the latest slot so the producer cannot reuse it, and
+  returns a read-only view. ``release`` unpins it. If every other slot is
+  pinned, the new frame is dropped instead of blocking capture.
+"""
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+RING_SLOTS = 4
+
+# Index fields at the start of the block, followed by slots seq + slots pin counts
+_LATEST_SEQ, _LATEST_SLOT, _WRITES, _WRITE_DROPS = range(4)
+_INDEX_FIELDS = 4
+_WRITING = -2
+_EMPTY = -1
+
+
+def _align(offset, to=64):
+    return (offset + to - 1) // to * to
+
+
+def _layout(shape, slots):
+    index_bytes = (_INDEX_FIELDS + 2 * slots) * 8
+    frames_offset = _align(index_bytes + slots * 8)
+    return index_bytes, frames_offset, frames_offset + slots * int(np.prod(shape))
+
+
+class FrameRef:
+    """A pinned, read-only view of one frame; release it when done."""
+
+    __slots__ = ("ring", "slot", "seq", "timestamp", "frame")
+
+    def __init__(self, ring, slot, seq, timestamp, frame):
+        self.ring = ring
+        self.slot = slot
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame
+
+    def release(self):
+        if self.frame is not None:
+            self.frame = None
+            self.ring.release(self.slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FrameRing:
+    def __init__(self, shm, shape, slots, lock, owner=False):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.slots = slots
+        self._lock = lock
+        self._owner = owner
+        index_bytes, frames_offset, _ = _layout(self.shape, slots)
+        self._index = np.ndarray((_INDEX_FIELDS + 2 * slots,), np.int64, buffer=shm.buf)
+        self._slot_seq = self._index[_INDEX_FIELDS:_INDEX_FIELDS + slots]
+        self._pins = self._index[_INDEX_FIELDS + slots:]
+        self._stamps = np.ndarray((slots,), np.float64, buffer=shm.buf, offset=index_bytes)
+        self._frames = np.ndarray((slots, *self.shape), np.uint8, buffer=shm.buf, offset=frames_offset)
+
+    @classmethod
+    def create(cls, shape, slots=RING_SLOTS):
+        shm = SharedMemory(create=True, size=_layout(tuple(shape), slots)[2])
+        ring = cls(shm, shape, slots, multiprocessing.Lock(), owner=True)
+        ring._index[:] = 0
+        ring._index[_LATEST_SLOT] = _EMPTY
+        ring._slot_seq[:] = _EMPTY
+        return ring
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, slots, lock = spec
+        # Workers started by the owner share its resource tracker, so attaching
+        # here does not make them unlink the block on exit
+        return cls(SharedMemory(name=name), shape, slots, lock)
+
+    def spec(self):
+        """Picklable description for ``attach`` in another process (pass at process start)."""
+        return self.shm.name, self.shape, self.slots, self._lock
+
+    # --- Producer ---
+
+    def write(self, frame, timestamp):
+        """Copy ``frame`` into a free slot; returns its seq, or None if it was dropped."""
+        with self._lock:
+            latest = self._index[_LATEST_SLOT]
+            free = [s for s in range(self.slots) if self._pins[s] == 0 and s != latest]
+            if not free:
+                self._index[_WRITE_DROPS] += 1
+                return None
+            slot = min(free, key=lambda s: self._slot_seq[s])
+            self._slot_seq[slot] = _WRITING
+        self._frames[slot] = frame
+        with self._lock:
+            seq = int(self._index[_LATEST_SEQ]) + 1
+            self._stamps[slot] = timestamp
+            self._slot_seq[slot] = seq
+            self._index[_LATEST_SEQ] = seq
+            self._index[_LATEST_SLOT] = slot
+            self._index[_WRITES] += 1
+        return seq
+
+    # --- Readers ---
+
+    def acquire(self, after_seq=0):
+        """Pin the latest frame if it is newer than ``after_seq``; None otherwise."""
+        with self._lock:
+            seq = int(self._index[_LATEST_SEQ])
+            if seq <= after_seq:
+                return None
+            slot = int(self._index[_LATEST_SLOT])
+            self._pins[slot] += 1
+            timestamp = float(self._stamps[slot])
+        return FrameRef(self, slot, seq, timestamp, self.view(slot))
+
+    def release(self, slot):
+        with self._lock:
+            self._pins[slot] -= 1
+
+    def view(self, slot, seq=None):
+        """Read-only view of ``slot``; None if it no longer holds frame ``seq``."""
+        if seq is not None and self._slot_seq[slot] != seq:
+            return None
+        frame = self._frames[slot].view()
+        frame.flags.writeable = False
+        return frame
+
+    def latest_seq(self):
+        return int(self._index[_LATEST_SEQ])
+
+    def stats(self):
+        with self._lock:
+            return {
+                "writes": int(self._index[_WRITES]),
+                "write_drops": int(self._index[_WRITE_DROPS]),
+                "pinned": int(np.count_nonzero(self._pins)),
+            }
+
+    def close(self):
+        self._index = self._slot_seq = self._pins = self._stamps = self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # a caller still holds a view; the mapping goes away with the process
+        if self._owner:
+            self.shm.unlink()
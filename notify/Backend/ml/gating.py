@@ -0,0 +1,101 @@
+"""Confidence gating and duplicate suppression in front of the publisher.
+
+Mirrors the per-type thresholds in ``routes/notify.js`` so low-confidence
+detections never cost an HTTP round trip, and collapses repeated detections
+of the same incident (same camera, type and location) within a sliding
+window into a single alert.
+
+    gate = AlertGate(publisher)
+    for detection in detections:
+        gate.submit(detection)  # forwarded to publisher.submit() if admitted
+"""
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# The metrics core is shared with the dashboard from shared/ at the repository root
+_SHARED_DIR = Path(__file__).resolve().parents[3] / "shared"
+if str(_SHARED_DIR) not in sys.path:
+    sys.path.append(str(_SHARED_DIR))
+
+import instrument  # noqa: E402
+
+ALERTS = instrument.counter("watchtower_alerts_total", "Alerts by type and outcome", ("type", "outcome"))
+
+# Keep in sync with confidenceThresholds in routes/notify.js
+CONFIDENCE_THRESHOLDS = {
+    "fire": 0.7,
+    "fall": 0.75,
+    "fight": 0.85,
+    "weapon": 0.6
+}
+DEFAULT_THRESHOLD = 0.7
+
+DEDUP_WINDOW = 30.0  # seconds between alerts for the same ongoing incident
+MAX_TRACKED_INCIDENTS = 4096
+
+
+class AlertGate:
+    def __init__(self, downstream=None, thresholds=None, window=DEDUP_WINDOW,
+                 max_keys=MAX_TRACKED_INCIDENTS, clock=time.monotonic):
+        self.downstream = downstream
+        self.thresholds = dict(CONFIDENCE_THRESHOLDS, **(thresholds or {}))
+        self.window = window
+        self.max_keys = max_keys
+        self.clock = clock
+        # hash(camera, type, location) -> monotonic time of the last admitted alert,
+        # oldest first, so expiry and size eviction both pop from the front
+        self._last_sent = OrderedDict()
+        self.admitted = 0
+        self.below_threshold = 0
+        self.duplicates = 0
+
+    def threshold_for(self, alert_type):
+        return self.thresholds.get(alert_type, DEFAULT_THRESHOLD)
+
+    def admit(self, payload, now=None):
+        """Return True if ``payload`` should be sent, recording it if so."""
+        confidence = payload.get("confidence")
+        if confidence is not None and confidence < self.threshold_for(payload.get("type")):
+            self.below_threshold += 1
+            ALERTS.inc(type=payload.get("type"), outcome="below_threshold")
+            return False
+
+        now = self.clock() if now is None else now
+        self._expire(now)
+        key = hash((payload.get("cameraId"), payload.get("type"), payload.get("location")))
+        if key in self._last_sent:
+            self.duplicates += 1
+            ALERTS.inc(type=payload.get("type"), outcome="duplicate")
+            return False
+
+        self._last_sent[key] = now
+        if len(self._last_sent) > self.max_keys:
+            self._last_sent.popitem(last=False)
+        self.admitted += 1
+        return True
+
+    def submit(self, payload):
+        """Gate ``payload`` and forward it downstream when admitted."""
+        if not self.admit(payload):
+            return False
+        if self.downstream is not None:
+            self.downstream.submit(payload)
+        return True
+
+    def _expire(self, now):
+        cutoff = now - self.window
+        while self._last_sent:
+            key, sent_at = next(iter(self._last_sent.items()))
+            if sent_at > cutoff:
+                break
+            self._last_sent.popitem(last=False)
+
+    def stats(self):
+        return {
+            "admitted": self.admitted,
+            "below_threshold": self.below_threshold,
+            "duplicates": self.duplicates,
+            "tracked_incidents": len(self._last_sent),
+        }
@@ -0,0 +1,111 @@
+"""Motion gate: skip inference on frames where nothing moved.
+
+Each frame is downscaled by striding and converted to grayscale, then
+differenced against the previous frame from the same camera. The motion
+score is the share of pixels whose brightness changed by more than
+``PIXEL_DELTA``. Every camera keeps a running mean and variance of its own
+quiet-scene scores, so a noisy sensor or flickering light raises that
+camera's threshold without touching the others. A frame goes to the model
+if its score clears the threshold, or as a keepalive if the camera has not
+sent one for ``KEEPALIVE_SECONDS``.
+"""
+import time
+
+import numpy as np
+
+DOWNSCALE = 4  # keep every 4th pixel in each direction
+PIXEL_DELTA = 18  # grey levels a pixel must change by to count as moving
+MIN_MOTION_FRACTION = 0.002
+THRESHOLD_SIGMAS = 4.0
+BASELINE_ALPHA = 0.05  # weight of each quiet frame in the running baseline
+KEEPALIVE_SECONDS = 1.0  # at least one frame per camera per second reaches the model
+
+_GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def to_gray(frame, downscale=DOWNSCALE):
+    """Strided grayscale copy of an (H, W, 3) uint8 frame as int16."""
+    small = frame[::downscale, ::downscale]
+    return (small @ _GRAY_WEIGHTS).astype(np.int16)
+
+
+class _CameraState:
+    __slots__ = ("previous", "mean", "var", "last_sent", "frames", "motion", "keepalive")
+
+    def __init__(self):
+        self.previous = None
+        self.mean = 0.0
+        self.var = 0.0
+        self.last_sent = float("-inf")
+        self.frames = 0
+        self.motion = 0
+        self.keepalive = 0
+
+
+class MotionGate:
+    def __init__(self, downscale=DOWNSCALE, pixel_delta=PIXEL_DELTA, min_fraction=MIN_MOTION_FRACTION,
+                 sigmas=THRESHOLD_SIGMAS, alpha=BASELINE_ALPHA, keepalive=KEEPALIVE_SECONDS,
+                 clock=time.monotonic):
+        self.downscale = downscale
+        self.pixel_delta = pixel_delta
+        self.min_fraction = min_fraction
+        self.sigmas = sigmas
+        self.alpha = alpha
+        self.keepalive = keepalive
+        self.clock = clock
+        self._cameras = {}
+
+    def threshold(self, camera_id):
+        state = self._cameras.get(camera_id)
+        if state is None:
+            return self.min_fraction
+        return max(self.min_fraction, state.mean + self.sigmas * state.var ** 0.5)
+
+    def score(self, previous, gray):
+        return float(np.count_nonzero(np.abs(gray - previous) > self.pixel_delta)) / gray.size
+
+    def admit(self, camera_id, frame, now=None):
+        """True if ``frame`` should go to the model."""
+        now = self.clock() if now is None else now
+        state = self._cameras.get(camera_id)
+        if state is None:
+            state = self._cameras[camera_id] = _CameraState()
+        state.frames += 1
+        gray = to_gray(frame, self.downscale)
+        previous, state.previous = state.previous, gray
+        if previous is None:
+            moving = True
+        else:
+            score = self.score(previous, gray)
+            moving = score > self.threshold(camera_id)
+            if not moving:
+                # Only quiet frames feed the baseline, so sustained motion can't raise it
+                delta = score - state.mean
+                state.mean += self.alpha * delta
+                state.var = (1 - self.alpha) * (state.var + self.alpha * delta * delta)
+        if moving:
+            state.motion += 1
+        elif now - state.last_sent >= self.keepalive:
+            state.keepalive += 1
+        else:
+            return False
+        state.last_sent = now
+        return True
+
+    def stats(self):
+        frames = sum(s.frames for s in self._cameras.values())
+        sent = sum(s.motion + s.keepalive for s in self._cameras.values())
+        return {
+            "frames": frames,
+            "sent": sent,
+            "skip_ratio": round(1 - sent / frames, 3) if frames else 0.0,
+            "cameras": {
+                cam_id: {
+                    "motion": s.motion,
+                    "keepalive": s.keepalive,
+                    "skipped": s.frames - s.motion - s.keepalive,
+                    "threshold": round(self.threshold(cam_id), 4),
+                }
+                for cam_id, s in self._cameras.items()
+            },
+        }
@@ -0,0 +1,346 @@
+"""CPU-only, batched multi-camera detection pipeline.
+
+Each camera has a reader task that keeps only its latest frame. A scheduler
+collects the frames waiting across all cameras into one ``(N, H, W, 3)``
+batch and runs a single model call for it on a process pool, keeping at most
+one batch in flight per worker. An optional ``MotionGate`` in front of the
+scheduler drops frames from static scenes before they are ever batched.
+Frames reach the workers through per-camera shared-memory rings
+(``frame_ring.py``), so only slot numbers are pickled. Scores above the
+model's floor become detections in the same payload shape
+``simulate_alert.py`` sends, handed to a sink such as
+``AlertGate(publisher).submit``.
+
+``models/`` ships no trained weights yet, so the default model is a colour
+heuristic that only scores ``fire``; any picklable factory returning an
+object with ``predict(batch) -> [{type: score}]`` can replace it.
+
+    python pipeline.py --cameras 8 --fps 15 --seconds 10 --workers 2
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from frame_ring import RING_SLOTS, FrameRing
+from motion import MotionGate
+
+FRAME_SIZE = (224, 224)
+MAX_BATCH = 32
+BATCH_INTERVAL = 0.02  # seconds the scheduler waits to fill a batch
+DETECTION_FLOOR = 0.5  # scores below this never leave the pipeline
+
+
+# --- Models ---
+
+class ColorHeuristicModel:
+    """Scores ``fire`` by the share of flame-coloured pixels in each frame."""
+
+    def __init__(self, saturation_fraction=0.02):
+        self.saturation_fraction = saturation_fraction
+
+    def predict(self, batch):
+        r = batch[..., 0].astype(np.int16)
+        g = batch[..., 1].astype(np.int16)
+        b = batch[..., 2].astype(np.int16)
+        flame = (r > 190) & (g > 60) & (g < 200) & (b < 110) & (r - b > 100)
+        fraction = flame.reshape(len(batch), -1).mean(axis=1)
+        scores = np.clip(fraction / self.saturation_fraction, 0.0, 1.0) * 0.99
+        return [{"fire": float(s)} for s in scores]
+
+
+_worker_model = None
+_worker_rings = {}
+
+
+def _init_worker(model_factory, ring_specs=None):
+    global _worker_model
+    _worker_model = model_factory()
+    for cam_id, spec in (ring_specs or {}).items():
+        _worker_rings[cam_id] = FrameRing.attach(spec)
+
+
+def _predict(batch):
+    return _worker_model.predict(batch)
+
+
+def _predict_shared(refs):
+    """Predict on frames the parent pinned in shared memory: [(camera_id, slot, seq)]."""
+    batch = np.stack([_worker_rings[cam_id].view(slot, seq) for cam_id, slot, seq in refs])
+    return _worker_model.predict(batch)
+
+
+# --- Frame sources ---
+
+class SyntheticCamera:
+    """Static noisy scene with an occasional flame-coloured patch."""
+
+    def __init__(self, camera_id, location, fps=15.0, size=FRAME_SIZE, incident_rate=0.01, seed=None):
+        self.camera_id = camera_id
+        self.location = location
+        self.fps = fps
+        self.shape = (*size, 3)
+        self.rng = np.random.default_rng(seed)
+        self.background = self.rng.integers(40, 120, size=(*size, 3), dtype=np.uint8)
+        self.incident_rate = incident_rate
+        self._incident_frames = 0
+
+    def read(self):
+        frame = self.background.copy()
+        frame += self.rng.integers(0, 8, size=frame.shape, dtype=np.uint8)
+        if self._incident_frames == 0 and self.rng.random() < self.incident_rate:
+            self._incident_frames = int(self.fps * 3)
+        if self._incident_frames:
+            self._incident_frames -= 1
+            h, w = frame.shape[:2]
+            # Flames flicker, so the patch changes size every frame
+            top = h // 3 - int(self.rng.integers(0, h // 12))
+            frame[top:h // 2, w // 3:w // 2] = (240, int(self.rng.integers(90, 150)), 30)
+        return frame
+
+
+class VideoFileCamera:
+    """Frames from a video file (needs ``opencv-python``), looping at the end."""
+
+    def __init__(self, camera_id, location, path, size=FRAME_SIZE):
+        import cv2
+        self._cv2 = cv2
+        self.camera_id = camera_id
+        self.location = location
+        self.size = size
+        self.shape = (*size, 3)
+        self.capture = cv2.VideoCapture(str(path))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 15.0
+
+    def read(self):
+        ok, frame = self.capture.read()
+        if not ok:
+            self.capture.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+            if not ok:
+                return None
+        frame = self._cv2.resize(frame, self.size[::-1])
+        return self._cv2.cvtColor(frame, self._cv2.COLOR_BGR2RGB)
+
+
+# --- Pipeline ---
+
+class CameraStats:
+    def __init__(self):
+        self.captured = 0
+        self.inferred = 0
+        self.dropped = 0  # frames replaced before the scheduler picked them up
+        self.skipped = 0  # frames the motion gate kept from the model
+        self.detections = 0
+
+
+class DetectionPipeline:
+    def __init__(self, cameras, sink, model_factory=ColorHeuristicModel, workers=2,
+                 max_batch=MAX_BATCH, batch_interval=BATCH_INTERVAL, floor=DETECTION_FLOOR,
+                 tokens=None, motion_gate=None, shared_frames=True, ring_slots=RING_SLOTS):
+        self.cameras = {cam.camera_id: cam for cam in cameras}
+        self.sink = sink
+        self.model_factory = model_factory
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_interval = batch_interval
+        self.floor = floor
+        self.tokens = tokens or []
+        self.motion_gate = motion_gate
+        self.shared_frames = shared_frames
+        self.ring_slots = ring_slots
+        self._rings = {}
+        self.camera_stats = {cam_id: CameraStats() for cam_id in self.cameras}
+        self._latest = {}  # camera_id -> (captured_at, frame or None when it is in the ring)
+        self._frame_ready = asyncio.Event()
+        self.batches = 0
+        self.batch_frames = 0
+        self.model_seconds = 0.0
+        self._started = None
+
+    async def _read_camera(self, cam):
+        stats = self.camera_stats[cam.camera_id]
+        interval = 1.0 / cam.fps
+        next_at = time.monotonic()
+        while True:
+            frame = cam.read()
+            if frame is not None:
+                stats.captured += 1
+            if frame is not None and self.motion_gate is not None \
+                    and not self.motion_gate.admit(cam.camera_id, frame):
+                stats.skipped += 1
+            elif frame is not None:
+                captured_at = time.time()
+                ring = self._rings.get(cam.camera_id)
+                if ring is not None and ring.write(frame, captured_at) is None:
+                    stats.dropped += 1  # every other slot is pinned by in-flight batches
+                else:
+                    if cam.camera_id in self._latest:
+                        stats.dropped += 1
+                    self._latest[cam.camera_id] = (captured_at, None if ring is not None else frame)
+                    self._frame_ready.set()
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+
+    def _take_batch(self):
+        """[(camera_id, captured_at, frame or pinned FrameRef)] for up to max_batch cameras."""
+        cam_ids = list(self._latest)[:self.max_batch]
+        entries = []
+        for cam_id in cam_ids:
+            captured_at, frame = self._latest.pop(cam_id)
+            if cam_id in self._rings:
+                frame = self._rings[cam_id].acquire()
+                if frame is None:
+                    continue
+                captured_at = frame.timestamp
+            entries.append((cam_id, captured_at, frame))
+        if not self._latest:
+            self._frame_ready.clear()
+        return entries
+
+    async def _schedule(self, pool):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.workers)
+        inflight = set()
+        try:
+            await self._dispatch_batches(loop, pool, slots, inflight)
+        finally:
+            # Workers must let go of their pinned slots before the rings close
+            for task in inflight:
+                task.cancel()
+            await asyncio.gather(*inflight, return_exceptions=True)
+
+    async def _dispatch_batches(self, loop, pool, slots, inflight):
+        while True:
+            await self._frame_ready.wait()
+            await slots.acquire()
+            await asyncio.sleep(self.batch_interval)
+            entries = self._take_batch()
+            if not entries:
+                slots.release()
+                continue
+            if self._rings:
+                call = (_predict_shared, [(cam_id, ref.slot, ref.seq) for cam_id, _, ref in entries])
+            else:
+                call = (_predict, np.stack([frame for _, _, frame in entries]))
+            task = asyncio.ensure_future(self._infer(loop, pool, entries, call))
+            task.add_done_callback(lambda _: slots.release())
+            inflight.add(task)
+            task.add_done_callback(inflight.discard)
+
+    async def _infer(self, loop, pool, entries, call):
+        t0 = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(pool, *call)
+        finally:
+            if self._rings:
+                for _, _, ref in entries:
+                    ref.release()
+        self.model_seconds += time.perf_counter() - t0
+        self.batches += 1
+        self.batch_frames += len(entries)
+        for (cam_id, captured_at, _), scores in zip(entries, results):
+            self.camera_stats[cam_id].inferred += 1
+            for alert_type, score in scores.items():
+                if score >= self.floor:
+                    self.camera_stats[cam_id].detections += 1
+                    self.sink(self._payload(self.cameras[cam_id], alert_type, score, captured_at))
+
+    def _payload(self, cam, alert_type, score, captured_at):
+        return {
+            "tokens": self.tokens,
+            "type": alert_type,
+            "confidence": round(score, 3),
+            "reason": f"Detected by {cam.camera_id}",
+            "timestamp": datetime.utcfromtimestamp(captured_at).isoformat(),
+            "cameraId": cam.camera_id,
+            "location": cam.location,
+        }
+
+    async def run(self, seconds=None):
+        self._started = time.monotonic()
+        if self.shared_frames:
+            self._rings = {cam_id: FrameRing.create(cam.shape, self.ring_slots)
+                           for cam_id, cam in self.cameras.items()}
+        ring_specs = {cam_id: ring.spec() for cam_id, ring in self._rings.items()}
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.model_factory, ring_specs)) as pool:
+                tasks = [asyncio.create_task(self._read_camera(cam)) for cam in self.cameras.values()]
+                tasks.append(asyncio.create_task(self._schedule(pool)))
+                try:
+                    if seconds is None:
+                        await asyncio.gather(*tasks)
+                    else:
+                        await asyncio.sleep(seconds)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for ring in self._rings.values():
+                ring.close()
+
+    def stats(self):
+        elapsed = max(time.monotonic() - (self._started or time.monotonic()), 1e-9)
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "batches": self.batches,
+            "avg_batch_size": round(self.batch_frames / self.batches, 2) if self.batches else 0.0,
+            "batch_utilization": round(self.batch_frames / (self.batches * self.max_batch), 3) if self.batches else 0.0,
+            "model_ms_per_frame": round(1000 * self.model_seconds / self.batch_frames, 3) if self.batch_frames else 0.0,
+            "cameras": {
+                cam_id: {
+                    "capture_fps": round(s.captured / elapsed, 2),
+                    "inference_fps": round(s.inferred / elapsed, 2),
+                    "dropped": s.dropped,
+                    "skipped": s.skipped,
+                    "detections": s.detections,
+                }
+                for cam_id, s in self.camera_stats.items()
+            },
+            "motion": self.motion_gate.stats() if self.motion_gate is not None else None,
+            "transport": "shared_memory" if self.shared_frames else "pickle",
+        }
+
+
+async def main(args):
+    cameras = [SyntheticCamera(f"cam_{i:02d}", f"Zone {i}", fps=args.fps, seed=i) for i in range(args.cameras)]
+    motion_gate = None if args.no_motion_gate else MotionGate()
+    if args.publish:
+        from gating import AlertGate
+        from publisher import AlertPublisher
+        async with AlertPublisher() as publisher:
+            pipeline = DetectionPipeline(cameras, AlertGate(publisher).submit, workers=args.workers,
+                                         motion_gate=motion_gate, shared_frames=not args.pickle_frames)
+            await pipeline.run(args.seconds)
+        print(f"📡 Publisher: {publisher.stats()}")
+    else:
+        pipeline = DetectionPipeline(cameras, lambda payload: None, workers=args.workers,
+                                     motion_gate=motion_gate, shared_frames=not args.pickle_frames)
+        await pipeline.run(args.seconds)
+    return pipeline.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cameras", type=int, default=8)
+    parser.add_argument("--fps", type=float, default=15.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--no-motion-gate", action="store_true", help="send every frame to the model")
+    parser.add_argument("--pickle-frames", action="store_true",
+                        help="pickle frames to the workers instead of sharing memory")
+    parser.add_argument("--publish", action="store_true", help="send detections through the gate and publisher")
+    args = parser.parse_args()
+    stats = asyncio.run(main(args))
+    print(f"🧠 Batches ({stats['transport']}): {stats['batches']}, avg size {stats['avg_batch_size']}, "
+          f"utilization {stats['batch_utilization']:.0%}, {stats['model_ms_per_frame']} ms/frame")
+    if stats["motion"]:
+        print(f"🏃 Motion gate skipped {stats['motion']['skip_ratio']:.0%} of {stats['motion']['frames']} frames")
+    for cam_id, s in stats["cameras"].items():
+        print(f"  {cam_id}: capture {s['capture_fps']} fps, inference {s['inference_fps']} fps, "
+              f"dropped {s['dropped']}, skipped {s['skipped']}, detections {s['detections']}")
@@ -0,0 +1,309 @@
+"""Severity-aware priority queue with aging and load shedding.
+
+Drop-in for the ``asyncio.Queue`` inside AlertPublisher. Alerts are ordered
+by class (from the alert type), then severity, then confidence. Aging is
+folded into the sort key: every second an alert waits is worth
+``AGING_RATE`` points, so older alerts go first within their class. Because
+every entry ages at the same rate, the key never has to be recomputed after it
+is pushed. Across classes the aging bonus is capped at ``MAX_AGING`` points,
+the gap between the worst alert of one class and the best of the next, so a
+briefly waiting alert never overtakes a fresh alert of a higher class: a
+theft or fall queued a moment ago does not delay a new fire. So that nothing
+starves under sustained critical load, an alert that has waited its class's
+``MAX_WAIT`` is promoted ahead of everything fresher.
+
+When the queue is full, a new non-critical alert is first coalesced into a
+queued alert for the same camera, type and location (alerts without a
+cameraId or location are never coalesced). Otherwise the
+worst-ranked alert of the lowest class present is shed, and that may be the
+new alert itself. Critical alerts are never shed: if only critical alerts
+are queued, the queue grows past its bound.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+
+PRIORITY_CLASSES = ("critical", "high", "normal", "low")
+TYPE_CLASSES = {
+    "fire": "critical",
+    "weapon": "critical",
+    "fight": "high",
+    "accident": "high",
+    "fall": "normal",
+    "theft": "normal",
+}
+DEFAULT_CLASS = "low"
+
+SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# Sort-key points; lower goes first
+CLASS_STEP = 10.0
+SEVERITY_STEP = 3.0
+CONFIDENCE_STEP = 2.0
+AGING_RATE = 1.0  # points per second waited
+# Most an alert gains on other classes by waiting (below CLASS_STEP)
+MAX_AGING = CLASS_STEP - 2 * SEVERITY_STEP - CONFIDENCE_STEP
+# Seconds an alert of each class may wait before it goes out ahead of anything fresher
+MAX_WAIT = {"high": 5.0, "normal": 15.0, "low": 30.0}
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (0 < q <= 100); 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(q / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def severity_of(payload):
+    """Explicit severity, else the confidence bands used by routes/stream.js."""
+    if payload.get("severity") in SEVERITY_RANK:
+        return payload["severity"]
+    confidence = payload.get("confidence")
+    if confidence is None:
+        return "medium"
+    if confidence >= 0.9:
+        return "high"
+    if confidence >= 0.75:
+        return "medium"
+    return "low"
+
+
+def priority_class(payload):
+    return TYPE_CLASSES.get(payload.get("type"), DEFAULT_CLASS)
+
+
+def _coalesce_key(payload):
+    """Incident identity for coalescing; None (never coalesced) unless camera and location are known."""
+    key = (payload.get("cameraId"), payload.get("type"), payload.get("location"))
+    return key if None not in key else None
+
+
+class ClassStats:
+    def __init__(self, window=2048):
+        self.queued = 0
+        self.coalesced = 0
+        self.shed = 0
+        self.waits = deque(maxlen=window)  # seconds spent in the queue
+
+
+class _ClassQueue:
+    """Queued items of one class, reachable best first, worst first and oldest first.
+
+    Items are ``[key, seq, enqueued_at, cls, entry, alive]``. Taking an item
+    out through one view only marks it dead (and re-keying only bumps its
+    seq), so the other views skip stale entries when they reach them and
+    every operation stays O(log n); the views are rebuilt once stale entries
+    outnumber live ones.
+    """
+
+    def __init__(self):
+        self.best = []  # (key, seq, item)
+        self.worst = []  # (-key, -seq, item)
+        self.arrivals = deque()  # items, oldest first
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, item):
+        self.arrivals.append(item)
+        self.size += 1
+        self._index(item)
+
+    def _index(self, item):
+        heapq.heappush(self.best, (item[0], item[1], item))
+        heapq.heappush(self.worst, (-item[0], -item[1], item))
+
+    def rekey(self, item, key, seq):
+        item[0], item[1] = key, seq
+        self._index(item)
+        self._compact()
+
+    def remove(self, item):
+        item[5] = False
+        self.size -= 1
+        self._compact()
+
+    def head(self):
+        while self.best and not _current(self.best[0][2], self.best[0][1]):
+            heapq.heappop(self.best)
+        return self.best[0][2] if self.best else None
+
+    def tail(self):
+        while self.worst and not _current(self.worst[0][2], -self.worst[0][1]):
+            heapq.heappop(self.worst)
+        return self.worst[0][2] if self.worst else None
+
+    def oldest(self):
+        while self.arrivals and not self.arrivals[0][5]:
+            self.arrivals.popleft()
+        return self.arrivals[0] if self.arrivals else None
+
+    def _compact(self):
+        if len(self.best) + len(self.worst) + len(self.arrivals) <= 6 * self.size + 64:
+            return
+        live = [item for item in self.arrivals if item[5]]
+        self.arrivals = deque(live)
+        self.best = [(item[0], item[1], item) for item in live]
+        self.worst = [(-item[0], -item[1], item) for item in live]
+        heapq.heapify(self.best)
+        heapq.heapify(self.worst)
+
+
+def _current(item, seq):
+    return item[5] and item[1] == seq
+
+
+class PriorityAlertQueue:
+    """Holds ``(submitted_at, payload)`` entries, highest priority out first.
+
+    An alert that has waited ``MAX_WAIT`` seconds for its class goes out
+    ahead of everything fresher, whatever its class, so a steady stream of
+    critical alerts delays the others by a bounded time instead of forever.
+    """
+
+    def __init__(self, maxsize=0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._epoch = clock()
+        self._classes = {cls: _ClassQueue() for cls in PRIORITY_CLASSES}
+        self._by_incident = {}  # coalesce key -> queued non-critical item
+        self._seq = itertools.count()
+        self._size = 0
+        self._unfinished = 0
+        self._not_empty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self.class_stats = {cls: ClassStats() for cls in PRIORITY_CLASSES}
+
+    def qsize(self):
+        return self._size
+
+    def empty(self):
+        return self._size == 0
+
+    def sort_key(self, payload, enqueued_at):
+        cls = priority_class(payload)
+        confidence = payload.get("confidence")
+        return (PRIORITY_CLASSES.index(cls) * CLASS_STEP
+                + SEVERITY_RANK[severity_of(payload)] * SEVERITY_STEP
+                + (1.0 - (confidence if confidence is not None else 0.5)) * CONFIDENCE_STEP
+                + (enqueued_at - self._epoch) * AGING_RATE)
+
+    def _effective_key(self, item, now):
+        """Sort key of a queued item against other classes, with its aging bonus capped."""
+        return item[0] + max(0.0, (now - item[2]) * AGING_RATE - MAX_AGING)
+
+    # --- Producer ---
+
+    def put_nowait(self, entry):
+        """Queue ``entry``; returns the entries shed to make room (possibly ``entry`` itself)."""
+        payload = entry[1]
+        cls = priority_class(payload)
+        now = self.clock()
+        if self.maxsize and self._size >= self.maxsize and cls != "critical":
+            if self._coalesce(payload):
+                return []
+            victim_cls = next((c for c in reversed(PRIORITY_CLASSES) if c != "critical" and self._classes[c]), None)
+            key = self.sort_key(payload, now)
+            if victim_cls is None or PRIORITY_CLASSES.index(victim_cls) < PRIORITY_CLASSES.index(cls):
+                self.class_stats[cls].shed += 1
+                return [entry]
+            victim = self._classes[victim_cls].tail()
+            if victim_cls == cls and victim[0] <= key:
+                self.class_stats[cls].shed += 1
+                return [entry]
+            self._classes[victim_cls].remove(victim)
+            self._forget(victim)
+            self._size -= 1
+            self._unfinished -= 1
+            self.class_stats[victim_cls].shed += 1
+            shed = [victim[4]]
+        else:
+            key = self.sort_key(payload, now)
+            shed = []
+        item = [key, next(self._seq), now, cls, entry, True]
+        self._classes[cls].push(item)
+        incident = _coalesce_key(payload)
+        if cls != "critical" and incident is not None:
+            self._by_incident.setdefault(incident, item)
+        self._size += 1
+        self._unfinished += 1
+        self.class_stats[cls].queued += 1
+        self._not_empty.set()
+        self._finished.clear()
+        return shed
+
+    def _coalesce(self, payload):
+        incident = _coalesce_key(payload)
+        item = self._by_incident.get(incident) if incident is not None else None
+        if item is None:
+            return False
+        queued = item[4][1]
+        queued["coalesced"] = queued.get("coalesced", 0) + 1
+        if (payload.get("confidence") or 0) > (queued.get("confidence") or 0):
+            queued["confidence"] = payload["confidence"]
+            # A surer detection ranks higher; it keeps the time it has already waited
+            self._classes[item[3]].rekey(item, self.sort_key(queued, item[2]), next(self._seq))
+        self.class_stats[item[3]].coalesced += 1
+        return True
+
+    def _forget(self, item):
+        incident = _coalesce_key(item[4][1])
+        if incident is not None and self._by_incident.get(incident) is item:
+            del self._by_incident[incident]
+
+    # --- Consumer ---
+
+    def _overdue(self, now):
+        """Longest-waiting alert past its class's ``MAX_WAIT``, if any."""
+        due = [item for cls, limit in MAX_WAIT.items()
+               if (item := self._classes[cls].oldest()) is not None and now - item[2] >= limit]
+        return min(due, key=lambda item: item[2]) if due else None
+
+    def get_nowait(self):
+        if not self._size:
+            raise asyncio.QueueEmpty
+        now = self.clock()
+        item = self._overdue(now)
+        if item is None:
+            heads = [head for q in self._classes.values() if (head := q.head()) is not None]
+            item = min(heads, key=lambda head: self._effective_key(head, now))
+        self._classes[item[3]].remove(item)
+        self._forget(item)
+        self._size -= 1
+        if not self._size:
+            self._not_empty.clear()
+        self.class_stats[item[3]].waits.append(now - item[2])
+        return item[4]
+
+    async def get(self):
+        while not self._size:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def task_done(self):
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._finished.set()
+
+    async def join(self):
+        await self._finished.wait()
+
+    def stats(self):
+        return {
+            cls: {
+                "depth": len(self._classes[cls]),
+                "queued": s.queued,
+                "coalesced": s.coalesced,
+                "shed": s.shed,
+                "wait_p50": percentile(s.waits, 50),
+                "wait_p95": percentile(s.waits, 95),
+            }
+            for cls, s in self.class_stats.items()
+        }
@@ -0,0 +1,282 @@
+"""Async, micro-batched alert publisher for the notify backend.
+
+Detectors call ``submit(payload)`` and move on. Payloads wait in a bounded
+in-process priority queue (``priority.py``), are flushed to
+``POST /notify/batch`` in micro-batches, up to ``POOL_SIZE`` batches at a time
+over one pooled HTTP session. Failed batches wait out their exponential
+backoff off to the side, so they never hold up the batches behind them.
+Critical alerts go out first and are never shed; anything that still cannot
+be delivered, or that the queue sheds under overload, is appended to a JSONL
+spill file under ``data/`` and replayed once the backend answers again.
+
+    async with AlertPublisher() as publisher:
+        publisher.submit({"tokens": TOKENS, "type": "fire", "confidence": 0.93, ...})
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+import aiohttp
+
+# The metrics core is shared with the dashboard from shared/ at the repository root
+_SHARED_DIR = Path(__file__).resolve().parents[3] / "shared"
+if str(_SHARED_DIR) not in sys.path:
+    sys.path.append(str(_SHARED_DIR))
+
+import instrument  # noqa: E402
+from priority import PriorityAlertQueue, percentile, priority_class  # noqa: E402
+
+# 🔧 Configure your backend URL
+BACKEND_URL = "http://localhost:5000/notify"
+
+SPILL_PATH = Path(__file__).resolve().parents[3] / "data" / "spill" / "alerts.jsonl"
+
+MAX_QUEUE = 10000
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 0.05  # seconds a partial batch may wait for company
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 10.0
+REQUEST_TIMEOUT = 5.0
+POOL_SIZE = 8  # batches in flight at once
+METRICS_PORT = 9465  # dashboard defaults to 9464
+
+ALERTS = instrument.counter("watchtower_alerts_total", "Alerts by type and outcome", ("type", "outcome"))
+PUBLISH_SECONDS = instrument.histogram("watchtower_publish_request_seconds",
+                                       "POST /notify/batch round trip", ("status",))
+
+
+class PublisherMetrics:
+    def __init__(self, window=2048):
+        self.submitted = 0
+        self.delivered = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.retries = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.batches = 0
+        self.batch_sizes = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)  # submit -> backend ack, seconds
+
+    def snapshot(self, queue_depth=0):
+        return {
+            "queue_depth": queue_depth,
+            "submitted": self.submitted,
+            "delivered": self.delivered,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "batches": self.batches,
+            "batch_size_avg": (sum(self.batch_sizes) / len(self.batch_sizes)) if self.batch_sizes else 0.0,
+            "latency_p50": percentile(self.latencies, 50),
+            "latency_p95": percentile(self.latencies, 95),
+            "latency_p99": percentile(self.latencies, 99),
+        }
+
+
+class AlertPublisher:
+    def __init__(self, url=BACKEND_URL, max_queue=MAX_QUEUE, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_retries=MAX_RETRIES,
+                 spill_path=SPILL_PATH, pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spill_path = Path(spill_path)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.metrics = PublisherMetrics()
+        self._queue = PriorityAlertQueue(maxsize=max_queue)
+        self._session = None
+        self._worker = None
+        self._slots = None  # one per batch in flight, created in start()
+        self._tasks = set()
+        self._has_spill = self.spill_path.exists()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._slots = asyncio.Semaphore(self.pool_size)
+        self._worker = asyncio.create_task(self._run())
+        instrument.serve_from_env(METRICS_PORT)
+        await self.replay_spill()
+
+    async def close(self, drain=True):
+        """Stop the flush loop; with ``drain`` wait for queued alerts first."""
+        if drain:
+            await self._queue.join()
+        tasks = [t for t in (self._worker, *self._tasks) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+
+    def submit(self, payload):
+        """Queue one alert without blocking; alerts shed under overload go to the spill file.
+
+        The alert gets its eventId here, so retries and spill replays reach
+        dashboards as the same event rather than as duplicates.
+        """
+        self.metrics.submitted += 1
+        if not payload.get("eventId"):
+            payload = {**payload, "eventId": f"evt_{uuid.uuid4().hex[:12]}"}
+        return self._enqueue(payload)
+
+    def _enqueue(self, payload):
+        shed = self._queue.put_nowait((time.monotonic(), payload))
+        if shed:
+            self._spill([p for _, p in shed])
+        return all(p is not payload for _, p in shed)
+
+    def stats(self):
+        return {**self.metrics.snapshot(queue_depth=self.queue_depth), "priority": self._queue.stats()}
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        if priority_class(batch[0][1]) == "critical":
+            # Critical alerts don't wait for company, only take what is already queued
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            # Alerts keep queueing while every slot is busy, so batches fill up under load
+            await self._slots.acquire()
+            batch = await self._next_batch()
+            self.metrics.batches += 1
+            self.metrics.batch_sizes.append(len(batch))
+            self._spawn(self._send(batch, 0))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _done(self, count):
+        for _ in range(count):
+            self._queue.task_done()
+
+    async def _send(self, batch, attempt):
+        """Post a batch on an acquired slot; what fails is retried later without holding one."""
+        try:
+            pending = await self._post(batch)
+        finally:
+            self._slots.release()
+        self._done(len(batch) - len(pending))
+        if not pending:
+            if self._has_spill:
+                await self.replay_spill()
+            return
+        if attempt >= self.max_retries:
+            self._spill([payload for _, payload in pending])
+            self._done(len(pending))
+            return
+        self.metrics.retries += 1
+        self._spawn(self._retry(pending, attempt))
+
+    async def _retry(self, batch, attempt):
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        await self._slots.acquire()
+        await self._send(batch, attempt + 1)
+
+    async def _post(self, batch):
+        """Send one batch; returns the entries that should be retried."""
+        started, status = time.perf_counter(), "error"
+        try:
+            async with self._session.post(f"{self.url}/batch",
+                                          json={"alerts": [p for _, p in batch]}) as resp:
+                status = str(resp.status)
+                if resp.status >= 500:
+                    return batch
+                if resp.status != 200:
+                    # Rejected as malformed: retrying will not help
+                    print(f"❌ Batch rejected ({resp.status}): {await resp.text()}")
+                    return []
+                results = (await resp.json()).get("results", [])
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return batch
+        finally:
+            PUBLISH_SECONDS.observe(time.perf_counter() - started, status=status)
+
+        now = time.monotonic()
+        retry = []
+        for entry, result in zip(batch, results):
+            status = result.get("status", 500)
+            if status >= 500:
+                retry.append(entry)
+                continue
+            if status != 200:
+                # Rejected as malformed: retrying will not help
+                self.metrics.rejected += 1
+                ALERTS.inc(type=entry[1].get("type"), outcome="rejected")
+                print(f"❌ Alert rejected ({status}): {result.get('error')}")
+            elif result.get("skipped"):
+                self.metrics.skipped += 1
+                ALERTS.inc(type=entry[1].get("type"), outcome="skipped")
+            else:
+                self.metrics.delivered += 1
+                ALERTS.inc(type=entry[1].get("type"), outcome="sent")
+            self.metrics.latencies.append(now - entry[0])
+        retry.extend(batch[len(results):])
+        return retry
+
+    def _spill(self, payloads):
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("a", encoding="utf-8") as fh:
+            for payload in payloads:
+                fh.write(json.dumps(payload) + "\n")
+        self.metrics.spilled += len(payloads)
+        for payload in payloads:
+            ALERTS.inc(type=payload.get("type"), outcome="spilled")
+        self._has_spill = True
+
+    async def replay_spill(self):
+        """Re-queue alerts spilled during an earlier outage (already counted as submitted)."""
+        self._has_spill = False
+        replay = self.spill_path.with_suffix(".replaying")
+        if self.spill_path.exists() and not replay.exists():
+            self.spill_path.replace(replay)
+        if not replay.exists():
+            return 0
+        count = 0
+        with replay.open(encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    self._enqueue(json.loads(line))
+                    count += 1
+        replay.unlink()
+        self.metrics.replayed += count
+        return count
@@ -1,7 +1,9 @@
-import requests
-import json
+import asyncio
 from datetime import datetime
 
+from gating import AlertGate
+from publisher import AlertPublisher
+
 # 🔧 Configure your backend URL
 BACKEND_URL = 'http://localhost:5000/notify'
 
@@ -19,10 +21,21 @@ payload = {
     "timestamp": datetime.utcnow().isoformat()
 }
 
-# 📡 Send POST request to backend
-try:
-    res = requests.post(BACKEND_URL, data=json.dumps(payload), headers={'Content-Type': 'application/json'})
-    print(f"✅ Response: {res.status_code}")
-    print(res.json())
-except Exception as e:
-    print("❌ Error:", e)
+
+# 📡 Gate, queue and wait until the alert is delivered, retried or spilled to disk
+async def main():
+    async with AlertPublisher(BACKEND_URL) as publisher:
+        if not AlertGate(publisher).submit(payload):
+            print("⏭️ Alert gated out (below threshold or duplicate)")
+            return
+    stats = publisher.stats()
+    if stats["delivered"] or stats["skipped"]:
+        print(f"✅ Delivered: {stats}")
+    elif stats["rejected"]:
+        print(f"❌ Rejected by the backend: {stats}")
+    else:
+        print(f"❌ Not delivered, spilled for retry: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
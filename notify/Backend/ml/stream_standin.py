@@ -0,0 +1,196 @@
+"""Local stand-in for the notify backend's SSE channel (routes/stream.js).
+
+Serves ``GET /stream`` with the same event frames as the Node backend and
+accepts ``POST /notify`` and ``POST /notify/batch`` so ``simulate_alert.py``
+can drive it. With ``--rate`` it also synthesizes alerts on its own. Like the
+Node backend, accepted alerts are stored through the events API before they
+are pushed, so their dashboard cards open real detail pages:
+
+    python stream_standin.py --port 5000 --rate 2 --events-api http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import aiohttp
+from aiohttp import web
+
+ALERT_TYPES = ["fire", "fall", "fight", "weapon", "theft", "accident"]
+LOCATIONS = ["Warehouse Sector 3", "Main Entrance Gate 3", "Zone B, Vehicle Docking Area",
+             "Corridor 2", "Parking Level 1"]
+EVENTS_API_URL = "http://localhost:8000"
+# eventIds already pushed, so a retried alert is not shown twice
+RECENT_IDS = 4096
+STORE_TIMEOUT = 2.0
+STORE_RETRY = 2.0
+STORE_RETRY_MAX = 60.0
+
+
+def severity_for(confidence):
+    if confidence is None:
+        return "medium"
+    if confidence >= 0.9:
+        return "high"
+    if confidence >= 0.75:
+        return "medium"
+    return "low"
+
+
+def to_event(alert):
+    """Same mapping as ``toEvent`` in routes/stream.js."""
+    return {
+        "eventId": alert.get("eventId") or f"evt_{uuid.uuid4().hex[:12]}",
+        "eventType": alert.get("type"),
+        "timestamp": alert.get("timestamp") or datetime.now(timezone.utc).isoformat(),
+        "location": alert.get("location") or "Unknown",
+        "coordinates": alert.get("coordinates"),
+        "severity": severity_for(alert.get("confidence")),
+        "confidence": alert.get("confidence"),
+        "snapshotUrl": alert.get("snapshotUrl"),
+        "status": "pending",
+        "notes": alert.get("reason") or "",
+    }
+
+
+def synthetic_alert():
+    return {
+        "type": random.choice(ALERT_TYPES),
+        "confidence": round(random.uniform(0.6, 0.99), 2),
+        "reason": "Synthetic stand-in alert",
+        "location": random.choice(LOCATIONS),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class StreamHub:
+    def __init__(self, events_url=EVENTS_API_URL):
+        self.clients = set()
+        self.events_url = events_url.rstrip("/") if events_url else None
+        self._recent = OrderedDict()
+        self._session = None
+
+    async def publish(self, alert):
+        """Store and push one alert, once per eventId; returns its event.
+
+        The eventId is claimed before the first await, so concurrent copies of
+        one alert cannot both get through, and the event is only pushed once
+        stored; failed stores are retried in the background with backoff.
+        """
+        event = to_event(alert)
+        if self._claim(event["eventId"]):
+            if await self.store(event):
+                self.broadcast(event)
+            else:
+                asyncio.create_task(self._retry_store(event))
+        return event
+
+    def _claim(self, event_id):
+        if event_id in self._recent:
+            return False
+        self._recent[event_id] = True
+        if len(self._recent) > RECENT_IDS:
+            self._recent.popitem(last=False)
+        return True
+
+    async def _retry_store(self, event):
+        delay = STORE_RETRY
+        while True:
+            await asyncio.sleep(delay)
+            if await self.store(event):
+                self.broadcast(event)
+                return
+            delay = min(delay * 2, STORE_RETRY_MAX)
+
+    async def store(self, event):
+        """POST ``event`` to the events API; True once it is stored (always, without one)."""
+        if not self.events_url:
+            return True
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=STORE_TIMEOUT))
+        try:
+            async with self._session.post(f"{self.events_url}/api/events", json=event) as resp:
+                if resp.status < 300:
+                    return True
+                print(f"❌ Failed to store event {event['eventId']}: {resp.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"❌ Failed to store event {event['eventId']}: {e!r}")
+        return False
+
+    def broadcast(self, event):
+        frame = f"id: {event['eventId']}\ndata: {json.dumps(event)}\n\n".encode()
+        for queue in self.clients:
+            queue.put_nowait(frame)
+
+    async def stream(self, request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream",
+                                           "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        await resp.write(b"retry: 1000\n\n")
+        queue = asyncio.Queue()
+        self.clients.add(queue)
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    frame = b": ping\n\n"
+                await resp.write(frame)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(queue)
+        return resp
+
+    async def notify(self, request):
+        alert = await request.json()
+        event = await self.publish(alert)
+        return web.json_response({"success": True, "event": event})
+
+    async def notify_batch(self, request):
+        alerts = (await request.json()).get("alerts", [])
+        results = [{"status": 200, "success": True, "event": await self.publish(a)} for a in alerts]
+        return web.json_response({"results": results})
+
+
+async def synthesize(hub, rate):
+    while True:
+        await asyncio.sleep(random.expovariate(rate))
+        await hub.publish(synthetic_alert())
+
+
+def make_app(rate=0.0, events_url=EVENTS_API_URL):
+    hub = StreamHub(events_url)
+    app = web.Application()
+    app.router.add_get("/stream", hub.stream)
+    app.router.add_post("/notify", hub.notify)
+    app.router.add_post("/notify/batch", hub.notify_batch)
+    app["hub"] = hub
+
+    async def start_synth(app):
+        if rate > 0:
+            app["synth"] = asyncio.create_task(synthesize(hub, rate))
+
+    async def stop_synth(app):
+        if "synth" in app:
+            app["synth"].cancel()
+        if hub._session is not None:
+            await hub._session.close()
+
+    app.on_startup.append(start_synth)
+    app.on_cleanup.append(stop_synth)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=0.0, help="synthetic alerts per second")
+    parser.add_argument("--events-api", default=EVENTS_API_URL,
+                        help="events API that stores accepted alerts ('' to only push them)")
+    args = parser.parse_args()
+    print(f"📡 Stand-in stream at http://localhost:{args.port}/stream")
+    web.run_app(make_app(args.rate, args.events_api), port=args.port)
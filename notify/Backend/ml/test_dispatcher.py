@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+import dispatcher
+from dispatcher import Dispatcher, TokenBucket, TokenRegistry, make_app
+
+
+@pytest.fixture(autouse=True)
+def quick_backoff(monkeypatch):
+    monkeypatch.setattr(dispatcher.random, "uniform", lambda a, b: 0.05)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return TokenRegistry(tmp_path / "tokens.db")
+
+
+def test_bucket_serves_the_burst_then_throttles_to_the_rate():
+    async def main():
+        bucket = TokenBucket(rate=100.0, burst=10)
+        started = time.monotonic()
+        await bucket.acquire(10)
+        burst = time.monotonic() - started
+        await bucket.acquire(5)
+        return burst, time.monotonic() - started, bucket.waited
+
+    burst, total, waited = asyncio.run(main())
+    assert burst < 0.01
+    assert 0.04 <= total < 0.5
+    assert waited == pytest.approx(0.05, abs=0.01)
+
+
+def test_bucket_caps_a_request_at_its_burst():
+    async def main():
+        bucket = TokenBucket(rate=1000.0, burst=5)
+        await asyncio.wait_for(bucket.acquire(50), 1.0)
+        return bucket.tokens
+
+    assert asyncio.run(main()) < 1
+
+
+async def dispatch_to(provider, registry, alert):
+    """Dispatch ``alert`` over FCM to a local provider app; returns (summary, provider requests)."""
+    requests = []
+
+    async def fcm(request):
+        requests.append(await request.json())
+        return await provider(request, len(requests))
+
+    app = web.Application()
+    app.router.add_post("/fcm", fcm)
+    async with TestServer(app) as server:
+        channels = {"fcm": {"url": str(server.make_url("/fcm")), "chunk": 2, "rate": 1000.0,
+                            "burst": 100, "concurrency": 2}}
+        fan_out = Dispatcher(registry, channels=channels)
+        try:
+            summary = await fan_out.dispatch(alert, ["fcm"])
+        finally:
+            await fan_out.close()
+    return summary["channels"]["fcm"], requests, fan_out
+
+
+def ok(tokens):
+    return web.json_response({"responses": [{"success": True} for _ in tokens]})
+
+
+def test_server_errors_are_retried(registry):
+    async def provider(request, count):
+        if count == 1:
+            return web.Response(status=503)
+        return ok((await request.json())["tokens"])
+
+    summary, requests, fan_out = asyncio.run(dispatch_to(provider, registry, {"type": "fire", "tokens": ["a"]}))
+    assert summary["sent"] == 1
+    assert len(requests) == 2
+    assert fan_out.stats_by_channel["fcm"].retries == 1
+
+
+def test_rejected_chunks_are_not_retried(registry):
+    async def provider(request, count):
+        return web.json_response({"error": "bad credentials"}, status=401)
+
+    summary, requests, fan_out = asyncio.run(dispatch_to(provider, registry, {"type": "fire", "tokens": ["a", "b"]}))
+    assert summary["failed"] == 2
+    assert len(requests) == 1
+    assert fan_out.stats_by_channel["fcm"].retries == 0
+
+
+def test_invalid_recipients_are_pruned(registry):
+    registry.register([{"token": t, "channel": "fcm"} for t in ("good", "gone", "other")])
+
+    async def provider(request, count):
+        return web.json_response({"responses": [
+            {"success": False, "error": {"code": "messaging/registration-token-not-registered"}}
+            if t == "gone" else {"success": True} for t in (await request.json())["tokens"]]})
+
+    summary, requests, _ = asyncio.run(dispatch_to(provider, registry, {"type": "fire"}))
+    assert (summary["chunks"], summary["sent"], summary["pruned"]) == (2, 2, 1)
+    assert sorted(registry.recipients("fcm")) == ["good", "other"]
+
+
+@pytest.mark.parametrize("route", ["/tokens", "/tokens/remove", "/dispatch", "/notify/batch"])
+def test_malformed_json_is_a_bad_request(tmp_path, route):
+    async def main():
+        async with TestClient(TestServer(make_app(tmp_path / "tokens.db"))) as client:
+            resp = await client.post(route, data="{not json", headers={"Content-Type": "application/json"})
+            return resp.status
+
+    assert asyncio.run(main()) == 400
@@ -0,0 +1,115 @@
+import pytest
+
+from priority import MAX_WAIT, PriorityAlertQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def alert(alert_type, confidence=0.8, **fields):
+    return {"type": alert_type, "confidence": confidence, **fields}
+
+
+def put(queue, payload):
+    return queue.put_nowait((0.0, payload))
+
+
+def drain(queue):
+    out = []
+    while not queue.empty():
+        out.append(queue.get_nowait()[1])
+    return out
+
+
+def test_higher_class_and_severity_go_first(clock):
+    queue = PriorityAlertQueue(clock=clock)
+    for payload in (alert("theft"), alert("fight", 0.5), alert("fire"), alert("fight", 0.95)):
+        put(queue, payload)
+    assert [(p["type"], p["confidence"]) for p in drain(queue)] == [
+        ("fire", 0.8), ("fight", 0.95), ("fight", 0.5), ("theft", 0.8)]
+
+
+@pytest.mark.parametrize("waited, first", [(1, "sure"), (5, "old")])
+def test_waiting_outweighs_a_surer_detection_within_its_class(clock, waited, first):
+    # One severity step is worth SEVERITY_STEP seconds of waiting
+    queue = PriorityAlertQueue(clock=clock)
+    put(queue, alert("theft", 0.8, eventId="old"))
+    clock.now += waited
+    put(queue, alert("theft", 0.9, eventId="sure"))
+    assert queue.get_nowait()[1]["eventId"] == first
+
+
+def test_brief_wait_does_not_overtake_a_fresh_higher_class(clock):
+    queue = PriorityAlertQueue(clock=clock)
+    put(queue, alert("theft"))
+    clock.now += MAX_WAIT["normal"] - 1
+    put(queue, alert("fire", 0.6))
+    assert queue.get_nowait()[1]["type"] == "fire"
+
+
+def test_overdue_alert_is_promoted_under_sustained_critical_load(clock):
+    queue = PriorityAlertQueue(clock=clock)
+    put(queue, alert("theft", eventId="waiting"))
+    served = []
+    for _ in range(40):
+        put(queue, alert("fire"))
+        clock.now += 1
+        served.append(queue.get_nowait()[1].get("eventId"))
+    assert served.index("waiting") <= MAX_WAIT["normal"]
+
+
+def test_full_queue_sheds_the_lowest_class_first(clock):
+    queue = PriorityAlertQueue(maxsize=2, clock=clock)
+    put(queue, alert("unknown", eventId="low"))
+    put(queue, alert("theft"))
+    shed = put(queue, alert("fight"))
+    assert [p["eventId"] for _, p in shed] == ["low"]
+    assert queue.qsize() == 2
+    newcomer = alert("unknown")
+    assert put(queue, newcomer) == [(0.0, newcomer)]
+
+
+def test_critical_alerts_are_never_shed(clock):
+    queue = PriorityAlertQueue(maxsize=2, clock=clock)
+    for _ in range(5):
+        assert put(queue, alert("fire")) == []
+    assert queue.qsize() == 5
+
+
+def test_full_queue_coalesces_the_same_incident(clock):
+    queue = PriorityAlertQueue(maxsize=1, clock=clock)
+    put(queue, alert("theft", 0.7, cameraId="cam1", location="Gate"))
+    assert put(queue, alert("theft", 0.9, cameraId="cam1", location="Gate")) == []
+    [queued] = drain(queue)
+    assert queued["coalesced"] == 1
+    assert queued["confidence"] == 0.9
+    assert queue.stats()["normal"]["coalesced"] == 1
+
+
+def test_alerts_without_a_camera_are_not_coalesced(clock):
+    queue = PriorityAlertQueue(maxsize=1, clock=clock)
+    put(queue, alert("theft", 0.9, location="Gate"))
+    shed = put(queue, alert("theft", 0.7, location="Gate"))
+    assert len(shed) == 1
+    assert "coalesced" not in drain(queue)[0]
+
+
+def test_shedding_and_rekeying_keep_the_heaps_bounded(clock):
+    queue = PriorityAlertQueue(maxsize=50, clock=clock)
+    for i in range(5000):
+        clock.now += 0.01
+        put(queue, alert("theft", (i % 100) / 100, cameraId=f"cam{i % 60}", location="Gate"))
+    normal = queue._classes["normal"]
+    assert len(normal) == queue.qsize() == 50
+    assert len(normal.best) + len(normal.worst) + len(normal.arrivals) <= 6 * len(normal) + 64
+    assert len(drain(queue)) == 50
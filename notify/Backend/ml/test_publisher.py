@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import publisher
+from publisher import AlertPublisher
+
+
+@pytest.fixture(autouse=True)
+def quick_backoff(monkeypatch):
+    monkeypatch.setattr(publisher, "BACKOFF_BASE", 0.5)
+
+
+async def publish(results_for, spill_path, payloads, **options):
+    """Submit ``payloads`` to a local /notify/batch; returns (publisher, types in the order received)."""
+    received = []
+
+    async def batch(request):
+        alerts = (await request.json())["alerts"]
+        received.extend(a["type"] for a in alerts)
+        return web.json_response({"results": [results_for(a) for a in alerts]})
+
+    app = web.Application()
+    app.router.add_post("/notify/batch", batch)
+    async with TestServer(app) as server:
+        alerts = AlertPublisher(str(server.make_url("/notify")), spill_path=spill_path, **options)
+        await alerts.start()
+        for payload in payloads:
+            alerts.submit(payload)
+            await asyncio.sleep(0.1)
+        await alerts.close()
+    return alerts, received
+
+
+def sent(alert):
+    return {"status": 200, "success": True}
+
+
+def test_backoff_does_not_hold_up_later_alerts(tmp_path):
+    attempts = {}
+
+    def flaky_theft(alert):
+        if alert["type"] != "theft":
+            return sent(alert)
+        attempts[alert["eventId"]] = attempts.get(alert["eventId"], 0) + 1
+        return {"status": 500} if attempts[alert["eventId"]] == 1 else sent(alert)
+
+    alerts, received = asyncio.run(publish(flaky_theft, tmp_path / "spill.jsonl",
+                                           [{"type": "theft"}, {"type": "fire"}]))
+    assert received == ["theft", "fire", "theft"]
+    stats = alerts.stats()
+    assert (stats["delivered"], stats["retries"], stats["spilled"]) == (2, 1, 0)
+
+
+def test_rejected_alerts_are_not_retried(tmp_path):
+    alerts, received = asyncio.run(publish(lambda a: {"status": 400, "error": "no tokens"},
+                                           tmp_path / "spill.jsonl", [{"type": "fire"}]))
+    assert received == ["fire"]
+    assert (alerts.stats()["rejected"], alerts.stats()["retries"]) == (1, 0)
+
+
+def test_undeliverable_alerts_are_spilled(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    alerts, received = asyncio.run(publish(lambda a: {"status": 500}, spill, [{"type": "fire"}], max_retries=1))
+    assert received == ["fire", "fire"]
+    assert alerts.stats()["spilled"] == 1
+    assert json.loads(spill.read_text())["type"] == "fire"
+
+
+def test_spill_replay_keeps_the_event_id_and_is_not_counted_again(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    spill.write_text(json.dumps({"type": "fire", "eventId": "evt_spilled"}) + "\n")
+    seen = []
+
+    def record(alert):
+        seen.append(alert["eventId"])
+        return sent(alert)
+
+    alerts, _ = asyncio.run(publish(record, spill, [{"type": "theft"}]))
+    stats = alerts.stats()
+    assert "evt_spilled" in seen
+    assert (stats["submitted"], stats["replayed"], stats["delivered"]) == (1, 1, 2)
+    assert not spill.exists()
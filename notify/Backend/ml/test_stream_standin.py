@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import stream_standin
+from stream_standin import StreamHub
+
+
+@pytest.fixture(autouse=True)
+def quick_retry(monkeypatch):
+    monkeypatch.setattr(stream_standin, "STORE_RETRY", 0.05)
+
+
+async def run_hub(scenario, outages=0):
+    """Run ``scenario(hub)`` against a local events API that fails its first ``outages`` stores.
+
+    Returns (eventIds stored, eventIds pushed to a connected dashboard).
+    """
+    stored, calls = [], []
+
+    async def store(request):
+        calls.append(1)
+        if len(calls) <= outages:
+            return web.Response(status=503)
+        stored.append((await request.json())["eventId"])
+        return web.json_response({}, status=201)
+
+    app = web.Application()
+    app.router.add_post("/api/events", store)
+    async with TestServer(app) as server:
+        hub = StreamHub(str(server.make_url("")))
+        dashboard = asyncio.Queue()
+        hub.clients.add(dashboard)
+        try:
+            await scenario(hub, stored)
+        finally:
+            await hub._session.close()
+    pushed = []
+    while not dashboard.empty():
+        pushed.append(dashboard.get_nowait().decode().split("\n", 1)[0].removeprefix("id: "))
+    return stored, pushed
+
+
+def test_concurrent_copies_of_an_alert_are_stored_and_pushed_once():
+    async def scenario(hub, stored):
+        alert = {"type": "fire", "eventId": "evt_1"}
+        await asyncio.gather(*(hub.publish(dict(alert)) for _ in range(5)))
+
+    assert asyncio.run(run_hub(scenario)) == (["evt_1"], ["evt_1"])
+
+
+def test_alert_is_pushed_only_once_stored():
+    async def scenario(hub, stored):
+        await hub.publish({"type": "fire", "eventId": "evt_1"})
+        assert not stored
+        assert all(dashboard.empty() for dashboard in hub.clients)
+        for _ in range(100):
+            if stored:
+                break
+            await asyncio.sleep(0.01)
+
+    assert asyncio.run(run_hub(scenario, outages=1)) == (["evt_1"], ["evt_1"])
+
+
+def test_without_an_events_api_alerts_are_pushed_at_once():
+    async def main():
+        hub = StreamHub(events_url="")
+        dashboard = asyncio.Queue()
+        hub.clients.add(dashboard)
+        await hub.publish({"type": "fire", "eventId": "evt_1"})
+        return dashboard.qsize()
+
+    assert asyncio.run(main()) == 1
@@ -1,7 +1,79 @@
 const express = require('express');
 const router = express.Router(); 
 const admin = require('../firebase');
-router.post('/', async (req, res) => {
+const { toEvent, claim, broadcast } = require('./stream');
+
+// 🗄️ Events API that stores accepted alerts (api/events_service.py)
+const EVENTS_API_URL = process.env.EVENTS_API_URL || 'http://localhost:8000';
+const STORE_TIMEOUT_MS = 2000;
+// Alerts the events API could not take are retried in the background, then pushed
+const STORE_RETRY_MS = 2000;
+const STORE_RETRY_MAX_MS = 60000;
+const MAX_UNSTORED = 10000;
+let unstored = 0;
+
+const confidenceThresholds = {
+  fire: 0.7,
+  fall: 0.75,
+  fight: 0.85,
+  weapon: 0.6
+};
+
+const alertCampaigns = {
+  fire: {
+    title: '🔥 Fire Alert',
+    body: 'A fire has been detected. Please evacuate immediately.',
+  },
+  fall: {
+    title: '🚨 Fall Detected',
+    body: 'A person has fallen. Immediate medical attention may be needed.',
+  },
+  fight: {
+    title: '⚠️ Conflict Detected',
+    body: 'Aggressive behavior detected. Please investigate.',
+  },
+  weapon: {
+    title: '🔫 Weapon Threat',
+    body: 'Suspicious object or weapon detected.',
+  }
+};
+
+// Store an accepted alert so dashboard cards open a real detail page; resolves to true once stored
+const storeEvent = async (event) => {
+  try {
+    const res = await fetch(`${EVENTS_API_URL}/api/events`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(event),
+      signal: AbortSignal.timeout(STORE_TIMEOUT_MS)
+    });
+    if (res.ok) return true;
+    console.error(`❌ Failed to store event ${event.eventId}: ${res.status}`);
+  } catch (err) {
+    console.error(`❌ Failed to store event ${event.eventId}:`, err.message);
+  }
+  return false;
+};
+
+// Push an event only once it is stored; until then keep retrying with backoff
+const storeThenBroadcast = async (event, delay = STORE_RETRY_MS) => {
+  if (await storeEvent(event)) {
+    broadcast(event);
+    return;
+  }
+  if (unstored >= MAX_UNSTORED) {
+    console.error(`❌ Dropping event ${event.eventId}: ${unstored} events already waiting to be stored`);
+    return;
+  }
+  unstored += 1;
+  setTimeout(() => {
+    unstored -= 1;
+    storeThenBroadcast(event, Math.min(delay * 2, STORE_RETRY_MAX_MS));
+  }, delay);
+};
+
+// Validate, gate and deliver one alert; resolves to { status, body }
+const sendAlert = async (alert) => {
   const {
     tokens,
     type,
@@ -10,42 +82,23 @@ router.post('/', async (req, res) => {
     timestamp,
     overrideTitle,
     overrideBody
-  } = req.body;
+  } = alert;
 
   if (!tokens || !Array.isArray(tokens)) {
-    return res.status(400).json({ error: 'An array of tokens is required.' });
+    return { status: 400, body: { error: 'An array of tokens is required.' } };
   }
 
-  const confidenceThresholds = {
-    fire: 0.7,
-    fall: 0.75,
-    fight: 0.85,
-    weapon: 0.6
-  };
-
   const threshold = confidenceThresholds[type] || 0.7;
   if (confidence !== undefined && confidence < threshold) {
-    return res.status(200).json({ skipped: true, message: 'Confidence below threshold, no alert sent.' });
+    return { status: 200, body: { skipped: true, message: 'Confidence below threshold, no alert sent.' } };
   }
 
-  const alertCampaigns = {
-    fire: {
-      title: '🔥 Fire Alert',
-      body: 'A fire has been detected. Please evacuate immediately.',
-    },
-    fall: {
-      title: '🚨 Fall Detected',
-      body: 'A person has fallen. Immediate medical attention may be needed.',
-    },
-    fight: {
-      title: '⚠️ Conflict Detected',
-      body: 'Aggressive behavior detected. Please investigate.',
-    },
-    weapon: {
-      title: '🔫 Weapon Threat',
-      body: 'Suspicious object or weapon detected.',
-    }
-  };
+  // 📡 Store, then push to connected dashboards, independent of FCM delivery.
+  // A retried alert keeps its eventId and is stored and pushed only the first time.
+  const event = toEvent(alert);
+  if (claim(event.eventId)) {
+    await storeThenBroadcast(event);
+  }
 
   const campaign = alertCampaigns[type] || {};
   const title = overrideTitle || campaign.title || '⚠️ Incident Alert';
@@ -75,7 +128,7 @@ router.post('/', async (req, res) => {
     console.log('✅ Notification sent and logged');
     */
 
-    res.status(200).json({ success: true, response });
+    return { status: 200, body: { success: true, response } };
 
   } catch (err) {
     console.error('❌ Failed to send notification:', err.message);
@@ -94,7 +147,29 @@ router.post('/', async (req, res) => {
     });
     */
 
-    res.status(500).json({ success: false, error: err.message });
+    return { status: 500, body: { success: false, error: err.message } };
+  }
+};
+
+router.post('/', async (req, res) => {
+  const { status, body } = await sendAlert(req.body);
+  res.status(status).json(body);
+});
+
+// 📦 Micro-batched alerts from the Python publisher: { alerts: [...] }
+router.post('/batch', async (req, res) => {
+  const { alerts } = req.body;
+  if (!alerts || !Array.isArray(alerts)) {
+    return res.status(400).json({ error: 'An array of alerts is required.' });
   }
+  // Copies of one eventId in a batch share a single delivery
+  const byId = new Map();
+  const results = await Promise.all(alerts.map((alert) => {
+    const eventId = alert && alert.eventId;
+    if (!eventId) return sendAlert(alert);
+    if (!byId.has(eventId)) byId.set(eventId, sendAlert(alert));
+    return byId.get(eventId);
+  }));
+  res.status(200).json({ results: results.map(({ status, body }) => ({ status, ...body })) });
 });
 module.exports = router;
\ No newline at end of file
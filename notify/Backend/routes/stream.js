@@ -0,0 +1,70 @@
+const express = require('express');
+const router = express.Router();
+
+// 📡 Connected dashboards (Server-Sent Events responses)
+const clients = new Set();
+
+// eventIds already claimed for storing and pushing, so a retried alert is not shown twice
+const RECENT_IDS = 4096;
+const recentIds = new Set();
+
+const severityFor = (confidence) => {
+  if (confidence === undefined) return 'medium';
+  if (confidence >= 0.9) return 'high';
+  if (confidence >= 0.75) return 'medium';
+  return 'low';
+};
+
+// Turn an accepted /notify alert into the event shape the dashboard renders
+const toEvent = ({ type, confidence, reason, timestamp, location, coordinates, snapshotUrl, eventId }) => ({
+  eventId: eventId || `evt_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`,
+  eventType: type,
+  timestamp: timestamp || new Date().toISOString(),
+  location: location || 'Unknown',
+  coordinates: coordinates || null,
+  severity: severityFor(confidence),
+  confidence,
+  snapshotUrl: snapshotUrl || null,
+  status: 'pending',
+  notes: reason || ''
+});
+
+router.get('/', (req, res) => {
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive'
+  });
+  res.flushHeaders();
+  res.write('retry: 1000\n\n');
+  clients.add(res);
+
+  // Comment line keeps proxies from closing an idle stream
+  const heartbeat = setInterval(() => res.write(': ping\n\n'), 15000);
+  req.on('close', () => {
+    clearInterval(heartbeat);
+    clients.delete(res);
+  });
+});
+
+// Claim an eventId before storing and pushing it; false if it was already claimed.
+// Synchronous, so concurrent copies of one alert cannot both get through.
+const claim = (eventId) => {
+  if (recentIds.has(eventId)) return false;
+  recentIds.add(eventId);
+  if (recentIds.size > RECENT_IDS) recentIds.delete(recentIds.values().next().value);
+  return true;
+};
+
+// Push one claimed event (see toEvent) to every connected dashboard
+const broadcast = (event) => {
+  const frame = `id: ${event.eventId}\ndata: ${JSON.stringify(event)}\n\n`;
+  for (const res of clients) {
+    res.write(frame);
+  }
+};
+
+module.exports = router;
+module.exports.toEvent = toEvent;
+module.exports.claim = claim;
+module.exports.broadcast = broadcast;
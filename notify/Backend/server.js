@@ -4,6 +4,7 @@ const cors = require('cors');
 
 const notifyRoute = require('./routes/notify');
 const smsRoute = require('./routes/smsEvent'); 
+const streamRoute = require('./routes/stream');
 
 const app = express();
 app.use(cors());
@@ -13,6 +14,7 @@ app.use(bodyParser.urlencoded({ extended: true }));
 // Routes
 app.use('/notify', notifyRoute);
 app.use('/sms_event', smsRoute); // ✅ Mounts /sms_event/*
+app.use('/stream', streamRoute); // 📡 SSE feed for dashboards
 
 const PORT = process.env.PORT || 5000;
 app.listen(PORT, () => {
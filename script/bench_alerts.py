@@ -0,0 +1,205 @@
+"""Load generator and latency benchmark for the alert pipeline.
+
+Synthesizes (or replays from a JSONL file) alerts across all event types at a
+target rate, pushes them through the Python gate and publisher into a notify
+backend, then hammers the events API with reads. Throughput and p50/p95/p99
+latency per stage are printed and written as JSON to ``results/``.
+
+By default an in-process stand-in backend (``standin_backend.py``) is used;
+pass ``--url`` to point at a real one.
+
+    python script/bench_alerts.py --alerts 20000 --rate 5000
+    python script/bench_alerts.py --replay data/spill/alerts.jsonl --url http://localhost:5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import cycle, islice
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "notify" / "Backend" / "ml"))
+
+from gating import AlertGate  # noqa: E402
+from publisher import AlertPublisher, PublisherMetrics, percentile  # noqa: E402
+from standin_backend import make_app  # noqa: E402
+
+RESULTS_DIR = ROOT / "results"
+
+ALERT_TYPES = ["fire", "fall", "fight", "weapon", "theft", "accident"]
+LOCATIONS = ["Warehouse Sector 3", "Main Entrance Gate 3", "Zone B, Vehicle Docking Area",
+             "Corridor 2", "Parking Level 1", "Loading Dock"]
+
+
+def synthetic_alerts(count, cameras):
+    for i in range(count):
+        yield {
+            "tokens": [],
+            "type": random.choice(ALERT_TYPES),
+            "confidence": round(random.uniform(0.55, 0.99), 3),
+            "reason": "Synthetic benchmark alert",
+            "cameraId": f"cam_{i % cameras:03d}",
+            "location": random.choice(LOCATIONS),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "eventId": f"bench_{i}",
+        }
+
+
+def replayed_alerts(path, count):
+    with open(path, encoding="utf-8") as fh:
+        payloads = [json.loads(line) for line in fh if line.strip()]
+    if not payloads:
+        raise SystemExit(f"No alerts to replay in {path}")
+    return islice(cycle(payloads), count)
+
+
+def summarize(latencies, elapsed):
+    """Stage summary; ``latencies`` in seconds, reported in milliseconds."""
+    return {
+        "count": len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run_publish_stage(base_url, alerts, rate, args):
+    gate = AlertGate(window=args.dedup_window)
+    gate_latencies = []
+    publisher = AlertPublisher(f"{base_url}/notify", batch_size=args.batch_size,
+                               flush_interval=args.flush_ms / 1000.0,
+                               spill_path=Path(tempfile.mkdtemp()) / "bench_spill.jsonl")
+    publisher.metrics = PublisherMetrics(window=args.alerts)
+
+    await publisher.start()
+    tick = 0.01
+    per_tick = max(1, int(rate * tick))
+    alerts = iter(alerts)
+    started = time.perf_counter()
+    sent = 0
+    while True:
+        chunk = list(islice(alerts, per_tick))
+        if not chunk:
+            break
+        for payload in chunk:
+            t0 = time.perf_counter()
+            admitted = gate.admit(payload)
+            gate_latencies.append(time.perf_counter() - t0)
+            if admitted:
+                publisher.submit(payload)
+        sent += len(chunk)
+        # Pace to the target rate; yield so the publisher can flush
+        await asyncio.sleep(max(0.0, started + sent / rate - time.perf_counter()))
+    gate_elapsed = time.perf_counter() - started
+    await publisher.close()
+    publish_elapsed = time.perf_counter() - started
+
+    stats = publisher.stats()
+    return {
+        "gate": summarize(gate_latencies, gate_elapsed),
+        "publish": summarize(list(publisher.metrics.latencies), publish_elapsed),
+    }, {"gate": gate.stats(), "publisher": stats}
+
+
+async def run_read_stage(base_url, requests, concurrency):
+    event_latencies, list_latencies = [], []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(f"{base_url}/api/events", params={"limit": 1000}) as resp:
+            ids = [e["eventId"] for e in await resp.json()] or ["missing"]
+
+        async def worker(n):
+            for i in range(n):
+                t0 = time.perf_counter()
+                if i % 10 == 0:
+                    async with session.get(f"{base_url}/api/events", params={"limit": 50}) as resp:
+                        await resp.read()
+                    list_latencies.append(time.perf_counter() - t0)
+                else:
+                    async with session.get(f"{base_url}/api/events/{random.choice(ids)}") as resp:
+                        await resp.read()
+                    event_latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "events_get": summarize(event_latencies, elapsed),
+        "events_list": summarize(list_latencies, elapsed),
+    }
+
+
+async def main(args):
+    runner = None
+    base_url = args.url
+    if base_url is None:
+        runner = web.AppRunner(make_app(args.latency_ms / 1000.0, args.error_rate))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        if args.replay:
+            alerts = replayed_alerts(args.replay, args.alerts)
+        else:
+            alerts = synthetic_alerts(args.alerts, args.cameras)
+        stages, counters = await run_publish_stage(base_url, alerts, args.rate, args)
+        stages.update(await run_read_stage(base_url, args.reads, args.concurrency))
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+    return {
+        "benchmark": "alerts",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "target": "standin" if args.url is None else args.url,
+        "stages": stages,
+        "counters": counters,
+    }
+
+
+def print_report(report):
+    print(f"{'stage':<12}{'count':>8}{'thru/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, s in report["stages"].items():
+        print(f"{name:<12}{s['count']:>8}{s['throughput_per_s']:>12}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=10000)
+    parser.add_argument("--rate", type=float, default=2000.0, help="target alerts per second")
+    parser.add_argument("--cameras", type=int, default=64)
+    parser.add_argument("--replay", help="JSONL file of alert payloads to replay")
+    parser.add_argument("--url", help="base URL of a running backend (default: in-process stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in artificial latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stand-in injected failure rate")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--flush-ms", type=float, default=50.0)
+    parser.add_argument("--dedup-window", type=float, default=0.0,
+                        help="gate dedup window in seconds (0 measures raw load)")
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="report path (default: results/bench_alerts_<time>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print_report(report)
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"bench_alerts_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"📄 Report written to {output}")
@@ -0,0 +1,104 @@
+"""In-memory stand-in for the notify backend and the events API.
+
+Implements just enough of ``POST /notify``, ``POST /notify/batch``,
+``GET /api/events``, ``POST /api/events/lookup`` and
+``GET /api/events/{eventId}`` for load tests: accepted alerts become events
+that the events endpoints serve back. Optional artificial latency and error
+rate make retry paths show up in benchmarks.
+
+    python script/standin_backend.py --port 5000 --latency-ms 5 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+# Keep in sync with confidenceThresholds in notify/Backend/routes/notify.js
+CONFIDENCE_THRESHOLDS = {"fire": 0.7, "fall": 0.75, "fight": 0.85, "weapon": 0.6}
+
+
+class StandinBackend:
+    def __init__(self, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.events = {}
+        self.order = []
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def accept(self, alert):
+        if self.error_rate and random.random() < self.error_rate:
+            return {"status": 500, "success": False, "error": "injected failure"}
+        threshold = CONFIDENCE_THRESHOLDS.get(alert.get("type"), 0.7)
+        confidence = alert.get("confidence")
+        if confidence is not None and confidence < threshold:
+            return {"status": 200, "skipped": True, "message": "Confidence below threshold, no alert sent."}
+        event_id = alert.get("eventId") or f"evt_{uuid.uuid4().hex[:12]}"
+        if event_id not in self.events:
+            self.order.append(event_id)
+        self.events[event_id] = {
+            "eventId": event_id,
+            "eventType": alert.get("type"),
+            "timestamp": alert.get("timestamp") or datetime.now(timezone.utc).isoformat(),
+            "location": alert.get("location") or "Unknown",
+            "coordinates": alert.get("coordinates"),
+            "severity": "high" if (confidence or 0) >= 0.9 else "medium",
+            "status": "pending",
+            "notes": alert.get("reason") or "",
+            "snapshotUrl": None,
+        }
+        return {"status": 200, "success": True, "eventId": event_id}
+
+    async def notify(self, request):
+        await self._delay()
+        result = self.accept(await request.json())
+        return web.json_response(result, status=result["status"])
+
+    async def notify_batch(self, request):
+        await self._delay()
+        alerts = (await request.json()).get("alerts", [])
+        return web.json_response({"results": [self.accept(a) for a in alerts]})
+
+    async def list_events(self, request):
+        await self._delay()
+        limit = int(request.query.get("limit", 200))
+        ids = self.order[-limit:]
+        return web.json_response([self.events[i] for i in ids])
+
+    async def lookup_events(self, request):
+        await self._delay()
+        ids = (await request.json()).get("ids", [])
+        return web.json_response([self.events[i] for i in ids if i in self.events])
+
+    async def get_event(self, request):
+        await self._delay()
+        evt = self.events.get(request.match_info["event_id"])
+        if evt is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(evt)
+
+
+def make_app(latency=0.0, error_rate=0.0):
+    backend = StandinBackend(latency, error_rate)
+    app = web.Application(client_max_size=16 * 1024 ** 2)
+    app.router.add_post("/notify", backend.notify)
+    app.router.add_post("/notify/batch", backend.notify_batch)
+    app.router.add_get("/api/events", backend.list_events)
+    app.router.add_post("/api/events/lookup", backend.lookup_events)
+    app.router.add_get("/api/events/{event_id}", backend.get_event)
+    app["backend"] = backend
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency_ms / 1000.0, args.error_rate), port=args.port)
@@ -0,0 +1,301 @@
+"""Low-overhead metrics and sampling profiler for the dashboard and alert pipeline.
+
+Off unless ``WATCHTOWER_METRICS=1``. While off, ``inc``/``observe`` return
+after one flag check and ``time()`` hands back a shared no-op context, so the
+calls can stay in hot paths. While on, each process serves its own numbers
+in the Prometheus text format (when ``WATCHTOWER_METRICS_PORT`` or a default
+port is set):
+
+    GET /metrics                    counters and histograms
+    GET /profile                    collapsed stacks (flamegraph.pl / speedscope input)
+    GET /profile?action=start|stop|reset
+
+The sampling profiler is a daemon thread that records every thread's stack
+each ``PROFILE_INTERVAL`` seconds. It only runs after ``/profile?action=start``
+or with ``WATCHTOWER_PROFILE=1``.
+"""
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ENABLED = os.environ.get("WATCHTOWER_METRICS", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.environ.get("WATCHTOWER_METRICS_PORT", "0")) or None
+METRICS_HOST = os.environ.get("WATCHTOWER_METRICS_HOST", "127.0.0.1")
+PROFILE_ON_START = os.environ.get("WATCHTOWER_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_INTERVAL = 0.005
+PROFILE_MAX_DEPTH = 64
+
+# Seconds; covers cache hits through slow cross-region calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def enabled():
+    return ENABLED
+
+
+def set_enabled(flag):
+    global ENABLED
+    ENABLED = bool(flag)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {value}" for key, value in values]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+
+    def observe(self, value, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    def time(self, **labels):
+        """Context manager observing the elapsed seconds of its block."""
+        if not ENABLED:
+            return _NOOP_TIMER
+        return _Timer(self, labels)
+
+    def _samples(self):
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        lines = []
+        for key, counts, total in series:
+            running = 0
+            for edge, count in zip((*self.buckets, "+Inf"), counts):
+                running += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', edge)])} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {running}")
+        return lines
+
+
+def _get_or_create(cls, name, *args, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, *args, **kwargs)
+        return metric
+
+
+def counter(name, help_text, labelnames=()):
+    """Process-wide Counter called ``name``, created on first use."""
+    return _get_or_create(Counter, name, help_text, labelnames)
+
+
+def histogram(name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+    """Process-wide Histogram called ``name``, created on first use."""
+    return _get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = [line for metric in metrics for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+# --- Sampling profiler ---
+
+class SamplingProfiler:
+    def __init__(self, interval=PROFILE_INTERVAL, max_depth=PROFILE_MAX_DEPTH):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = StackCounter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        self.stacks.clear()
+        self.samples = 0
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """One ``frame;frame;frame count`` line per distinct stack, most frequent first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+_profiler = SamplingProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+# --- HTTP endpoint ---
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            body = render()
+        elif url.path == "/profile":
+            action = parse_qs(url.query).get("action", [""])[0]
+            if action in ("start", "stop", "reset"):
+                getattr(_profiler, action)()
+            state = "running" if _profiler.running else "stopped"
+            body = f"# profiler {state}, {_profiler.samples} samples\n" + _profiler.collapsed()
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, host=METRICS_HOST):
+    """Start the metrics endpoint on a daemon thread (once per process)."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
+
+
+def serve_from_env(default_port=None):
+    """Serve metrics if enabled, on WATCHTOWER_METRICS_PORT or ``default_port``."""
+    if PROFILE_ON_START:
+        _profiler.start()
+    port = METRICS_PORT or default_port
+    if not ENABLED or not port:
+        return None
+    try:
+        return serve(port)
+    except OSError:
+        return None  # port taken, e.g. by a second process with the same default